@@ -1,14 +1,35 @@
 """The Golf Dashboard integration for NOVA launch monitors."""
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+from pathlib import Path
+import sqlite3
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME, Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_NAME,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers.typing import ConfigType
 import voluptuous as vol
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
 
 from .const import (
     DOMAIN,
@@ -17,16 +38,82 @@ from .const import (
     CONF_SERIAL,
     CONF_INSTALL_DASHBOARDS,
     CONF_INSTALL_DASHBOARDS_AGAIN,
+    CONF_COMPACT_PUBLISH,
+    CONF_RETENTION_DAYS,
+    CONF_SHOT_WINDOWS,
+    CONF_EXCLUDE_OUTLIERS,
+    CLUB_CLASSES,
+    COMPACT_CHUNK_SIZE,
+    COMPACT_IDLE_TIME,
+    COMPACT_INTERVAL,
+    COMPACT_THROTTLE,
+    COMPACT_VACUUM_PAGES,
+    DATA_COMPACT_UNSUB,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_SHOT_WINDOWS,
+    DATA_RECOMPUTE_TASK,
+    DATA_VACUUM_TASK,
+    DATA_SHOT_STORE,
+    DATA_SUPERVISOR,
+    EVENT_RECOMPUTE_PROGRESS,
+    EXPORT_DEFAULT_FIELDS,
+    EXPORT_DIR,
+    RECOMPUTE_THROTTLE,
+    SHOT_STORE_FILENAME,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
 from .coordinator import GolfDashboardCoordinator
+from .derived import DERIVED_MODEL_VERSION
+from .archive import iter_history
+from .export import EXPORT_FORMATS, FORMAT_CSV, export_filename, write_export
 from .installer import async_install_dashboards
+from .recompute import recompute_chunk
+from .shot_import import import_file
+from .shot_store import ShotStore
+from .supervisor import ConnectionSupervisor
+from .websocket_api import QUERY_FIELDS, async_query_shots, async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SELECT, Platform.SENSOR]
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+EXPORT_SHOTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("session_id"): cv.string,
+        vol.Optional("club"): vol.In(CLUB_CLASSES),
+        vol.Optional("player"): cv.string,
+        vol.Optional("club_cluster"): cv.string,
+        vol.Optional("format", default=FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional("gzip", default=False): cv.boolean,
+        vol.Optional("fields"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+IMPORT_SHOTS_SCHEMA = vol.Schema(
+    {
+        vol.Required("path"): cv.string,
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("session_id"): cv.string,
+        vol.Optional("player"): cv.string,
+        vol.Optional("columns"): {cv.string: cv.string},
+    }
+)
+
+QUERY_SHOTS_SCHEMA = vol.Schema(QUERY_FIELDS)
+
+SET_PLAYER_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Required("player"): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Golf Dashboard integration and register services."""
@@ -37,12 +124,55 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.services.async_register(DOMAIN, "install_dashboards", _handle_install_dashboards)
     _LOGGER.info("Golf Dashboard: registered service %s.install_dashboards", DOMAIN)
 
+    async def _handle_export_shots(call: ServiceCall) -> ServiceResponse:
+        return await _async_export_shots(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        "export_shots",
+        _handle_export_shots,
+        schema=EXPORT_SHOTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_import_shots(call: ServiceCall) -> ServiceResponse:
+        return await _async_import_shots(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        "import_shots",
+        _handle_import_shots,
+        schema=IMPORT_SHOTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_query_shots(call: ServiceCall) -> ServiceResponse:
+        return await async_query_shots(hass, dict(call.data))
+
+    hass.services.async_register(
+        DOMAIN,
+        "query_shots",
+        _handle_query_shots,
+        schema=QUERY_SHOTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _handle_set_player(call: ServiceCall) -> None:
+        await _async_set_player(hass, call)
+
+    hass.services.async_register(
+        DOMAIN, "set_player", _handle_set_player, schema=SET_PLAYER_SCHEMA
+    )
+
+    async_register_websocket_commands(hass)
+
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Golf Dashboard from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    shot_store = await _async_get_shot_store(hass)
 
     coordinator = GolfDashboardCoordinator(
         hass,
@@ -52,9 +182,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         manufacturer=entry.data.get(CONF_MANUFACTURER),
         model=entry.data.get(CONF_MODEL),
         serial=entry.data.get(CONF_SERIAL),
+        entry_id=entry.entry_id,
+        compact_publish=entry.options.get(CONF_COMPACT_PUBLISH, False),
+        shot_store=shot_store,
+        supervisor=await _async_get_supervisor(hass),
+        shot_windows=_shot_window_sizes(entry),
+        exclude_outliers=entry.options.get(CONF_EXCLUDE_OUTLIERS, False),
     )
 
-    # Start the coordinator (connects to device)
+    # Start the coordinator (the supervisor connects to the device)
     await coordinator.async_start()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -81,13 +217,306 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             new_options[CONF_INSTALL_DASHBOARDS_AGAIN] = False
             hass.config_entries.async_update_entry(entry, options=new_options)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    async def _async_flush_on_stop(event: Event) -> None:
+        await coordinator.async_flush_store()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+    )
+
     return True
 
 
+def _shot_window_sizes(entry: ConfigEntry) -> tuple[int, ...]:
+    """Return the sorted "last N shots" windows chosen in the options flow."""
+    sizes = entry.options.get(CONF_SHOT_WINDOWS, DEFAULT_SHOT_WINDOWS)
+    return tuple(sorted({int(size) for size in sizes}))
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options that affect the coordinator change."""
+    coordinator: GolfDashboardCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.exclude_outliers = entry.options.get(CONF_EXCLUDE_OUTLIERS, False)
+    supervisor: ConnectionSupervisor = hass.data[DATA_SUPERVISOR]
+    supervisor.async_update_leaderboard_target(entry.entry_id)
+    if (
+        entry.options.get(CONF_INSTALL_DASHBOARDS_AGAIN, False)
+        or entry.options.get(CONF_COMPACT_PUBLISH, False) != coordinator.compact_publish
+        or _shot_window_sizes(entry) != coordinator.shot_window_sizes
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator: GolfDashboardCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_stop()
+        if not hass.data[DOMAIN] and (supervisor := hass.data.pop(DATA_SUPERVISOR, None)):
+            await supervisor.async_stop()
+        if not hass.data[DOMAIN] and (store := hass.data.pop(DATA_SHOT_STORE, None)):
+            if task := hass.data.pop(DATA_RECOMPUTE_TASK, None):
+                task.cancel()
+            if unsub := hass.data.pop(DATA_COMPACT_UNSUB, None):
+                unsub()
+            hass.data.pop(DATA_VACUUM_TASK, None)
+            await hass.async_add_executor_job(store.close)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted state when a config entry is deleted."""
+    store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+    stored = await store.async_load() or {}
+    for player in stored.get("players") or []:
+        await Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}.player_{slugify(player)}"
+        ).async_remove()
+    await store.async_remove()
+
+
+async def _async_get_supervisor(hass: HomeAssistant) -> ConnectionSupervisor:
+    """Return the connection supervisor shared by all entries, creating it on first use."""
+    supervisor: ConnectionSupervisor | None = hass.data.get(DATA_SUPERVISOR)
+    if supervisor is None:
+        supervisor = hass.data[DATA_SUPERVISOR] = ConnectionSupervisor(hass)
+        await supervisor.async_load()
+    return supervisor
+
+
+async def _async_get_shot_store(hass: HomeAssistant) -> ShotStore:
+    """Return the shared shot store, opening it on first use."""
+    store: ShotStore | None = hass.data.get(DATA_SHOT_STORE)
+    if store is None:
+        store = hass.data[DATA_SHOT_STORE] = ShotStore(
+            hass.config.path(DOMAIN, SHOT_STORE_FILENAME)
+        )
+    await hass.async_add_executor_job(store.open)
+    if DATA_VACUUM_TASK not in hass.data:
+        hass.data[DATA_VACUUM_TASK] = hass.async_create_task(
+            _async_enable_incremental_vacuum(hass, store)
+        )
+    # Every entry waits, so no coordinator ingests while the file is rewritten
+    await hass.data[DATA_VACUUM_TASK]
+    if DATA_RECOMPUTE_TASK not in hass.data:
+        hass.data[DATA_RECOMPUTE_TASK] = hass.async_create_background_task(
+            _async_recompute_outdated(hass, store), f"{DOMAIN} recompute stored shots"
+        )
+    if DATA_COMPACT_UNSUB not in hass.data:
+        lock = asyncio.Lock()
+
+        async def _async_compact_when_idle(_now: datetime) -> None:
+            if not lock.locked():
+                async with lock:
+                    await _async_compact(hass, store)
+
+        hass.data[DATA_COMPACT_UNSUB] = async_track_time_interval(
+            hass, _async_compact_when_idle, timedelta(seconds=COMPACT_INTERVAL)
+        )
+    return store
+
+
+async def _async_enable_incremental_vacuum(hass: HomeAssistant, store: ShotStore) -> None:
+    """Convert a store created without incremental auto-vacuum, before any shot arrives.
+
+    The conversion rewrites the file under the writer lock, so it runs once at
+    startup rather than in idle-time compaction, where a shot could queue behind it.
+    """
+    try:
+        enabled = await hass.async_add_executor_job(store.enable_incremental_vacuum)
+    except sqlite3.Error as err:
+        _LOGGER.warning("Golf Dashboard: could not enable incremental vacuum: %s", err)
+        return
+    if not enabled:
+        _LOGGER.warning(
+            "Golf Dashboard: not enough free disk space to enable incremental vacuum "
+            "on the shot store; freed space is reused but not returned"
+        )
+
+
+async def _async_recompute_outdated(hass: HomeAssistant, store: ShotStore) -> None:
+    """Recompute stored shots from older derived-model versions in throttled chunks.
+
+    Progress is logged and fired as ``golf_dashboard_recompute_progress`` events.
+    Rows are re-stamped as they are updated, so an interrupted job resumes where
+    it left off on the next start.
+    """
+    try:
+        total = await hass.async_add_executor_job(store.count_outdated, DERIVED_MODEL_VERSION)
+        if not total:
+            return
+        _LOGGER.info(
+            "Golf Dashboard: recomputing %s stored shot(s) for derived model v%s",
+            total,
+            DERIVED_MODEL_VERSION,
+        )
+        done = 0
+        last_id = 0
+        while True:
+            updated, last_id = await hass.async_add_executor_job(recompute_chunk, store, last_id)
+            if not updated:
+                break
+            done += updated
+            hass.bus.async_fire(
+                EVENT_RECOMPUTE_PROGRESS,
+                {"done": done, "total": total, "model_version": DERIVED_MODEL_VERSION},
+            )
+            await asyncio.sleep(RECOMPUTE_THROTTLE)
+        _LOGGER.info("Golf Dashboard: recomputed %s stored shot(s)", done)
+    except sqlite3.Error as err:
+        _LOGGER.error("Golf Dashboard: recomputing stored shots failed: %s", err)
+
+
+def _store_is_idle(hass: HomeAssistant) -> bool:
+    """Return True when no device has taken a shot recently."""
+    cutoff = dt_util.utcnow().timestamp() - COMPACT_IDLE_TIME
+    return all(
+        (coordinator.last_shot_at or 0) < cutoff
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+    )
+
+
+async def _async_compact(hass: HomeAssistant, store: ShotStore) -> None:
+    """Archive raw shots past each device's retention, then shrink the file.
+
+    Work is done in small throttled chunks and stops as soon as a device takes
+    a shot, so compaction never competes with ingest. Archived shots keep their
+    quantized raw inputs and stay in the rollups and per-player sketches.
+    """
+    try:
+        archived = 0
+        size_before = await hass.async_add_executor_job(store.size)
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            days = entry.options.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS)
+            if not days:
+                continue
+            cutoff = dt_util.utcnow().timestamp() - days * 86400
+            while _store_is_idle(hass):
+                moved = await hass.async_add_executor_job(
+                    store.archive, entry.entry_id, cutoff, COMPACT_CHUNK_SIZE
+                )
+                archived += moved
+                if moved < COMPACT_CHUNK_SIZE:
+                    break
+                await asyncio.sleep(COMPACT_THROTTLE)
+        while _store_is_idle(hass):
+            if not await hass.async_add_executor_job(store.compact, COMPACT_VACUUM_PAGES):
+                break
+            await asyncio.sleep(COMPACT_THROTTLE)
+        if archived:
+            size_after = await hass.async_add_executor_job(store.size)
+            _LOGGER.info(
+                "Golf Dashboard: archived %s shot(s) past retention; store %s -> %s KiB",
+                archived,
+                size_before // 1024,
+                size_after // 1024,
+            )
+    except sqlite3.Error as err:
+        _LOGGER.error("Golf Dashboard: shot store compaction failed: %s", err)
+
+
+async def _async_export_shots(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Stream a filtered range of stored shots to a file under /config/golf_dashboard/exports."""
+    store: ShotStore | None = hass.data.get(DATA_SHOT_STORE)
+    if store is None:
+        raise HomeAssistantError("No Golf Dashboard device is set up.")
+    if call.data.get("club_cluster") and not call.data.get("player"):
+        raise ServiceValidationError("A learned club filter needs a player; club ids are per player")
+    if call.data.get("session_id") and not call.data.get("entry_id"):
+        raise ServiceValidationError(
+            "A session filter needs a device; session ids are only unique per device"
+        )
+
+    # Make sure shots still waiting for their batch write are included.
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        await coordinator.async_flush_store()
+
+    start = call.data.get("start")
+    end = call.data.get("end")
+    fmt = call.data["format"]
+    compress = call.data["gzip"]
+    fields = call.data.get("fields") or list(EXPORT_DEFAULT_FIELDS)
+    path = Path(
+        hass.config.path(
+            DOMAIN, EXPORT_DIR, export_filename("shots", fmt, compress, dt_util.now())
+        )
+    )
+
+    def _export() -> int:
+        records = iter_history(
+            store,
+            device=call.data.get("entry_id"),
+            start_ts=dt_util.as_utc(start).timestamp() if start else None,
+            end_ts=dt_util.as_utc(end).timestamp() if end else None,
+            session_id=call.data.get("session_id"),
+            club=call.data.get("club"),
+            player=call.data.get("player"),
+            club_cluster=call.data.get("club_cluster"),
+        )
+        return write_export(records, path, fmt, fields, compress)
+
+    try:
+        rows = await hass.async_add_executor_job(_export)
+    except (OSError, sqlite3.Error, ValueError) as err:
+        raise HomeAssistantError(f"Shot export failed: {err}") from err
+
+    _LOGGER.info("Golf Dashboard: exported %s shot(s) to %s", rows, path)
+    return {"path": str(path), "rows": rows}
+
+
+async def _async_import_shots(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Import historical shots from a CSV/JSONL file into the shot store."""
+    store: ShotStore | None = hass.data.get(DATA_SHOT_STORE)
+    if store is None:
+        raise HomeAssistantError("No Golf Dashboard device is set up.")
+
+    path = Path(call.data["path"])
+    if not path.is_absolute():
+        path = Path(hass.config.path(str(path)))
+    if not hass.config.is_allowed_path(str(path)):
+        raise HomeAssistantError(f"Import path {path} is not in an allowed directory.")
+
+    coordinators: dict[str, GolfDashboardCoordinator] = hass.data.get(DOMAIN, {})
+    device = call.data.get("entry_id")
+    if device is None:
+        device = next(iter(coordinators)) if len(coordinators) == 1 else "import"
+
+    try:
+        result = await hass.async_add_executor_job(
+            partial(
+                import_file,
+                store,
+                device,
+                path,
+                column_overrides=call.data.get("columns"),
+                session_id=call.data.get("session_id"),
+                player=call.data.get("player"),
+                default_tz=dt_util.get_default_time_zone(),
+            )
+        )
+    except (OSError, sqlite3.Error, ValueError) as err:
+        raise HomeAssistantError(f"Shot import failed: {err}") from err
+
+    _LOGGER.info(
+        "Golf Dashboard: imported %s shot(s) from %s (%s skipped)",
+        result.imported,
+        path,
+        result.skipped,
+    )
+    return {"imported": result.imported, "skipped": result.skipped, "errors": result.errors}
+
+
+async def _async_set_player(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Attribute new shots on one device (or the only one) to a player."""
+    coordinators: dict[str, GolfDashboardCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("entry_id")
+    if entry_id is None:
+        if len(coordinators) != 1:
+            raise HomeAssistantError("Specify entry_id when more than one device is set up.")
+        entry_id = next(iter(coordinators))
+    if (coordinator := coordinators.get(entry_id)) is None:
+        raise HomeAssistantError(f"Unknown Golf Dashboard entry {entry_id}.")
+    await coordinator.async_set_player(call.data["player"])
@@ -0,0 +1,563 @@
+"""Streaming shot analytics for Golf Dashboard.
+
+Everything here is incremental: each shot updates a small, fixed amount of
+state so aggregates never require a history scan. Like ``derived.py`` this
+module is pure Python with no Home Assistant imports, so the state can be
+persisted as plain dicts and unit tested in isolation.
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+SECONDS_PER_HOUR = 3600
+
+
+@dataclass
+class MetricSummary:
+    """Count, mean, min, and max of one metric."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Fold one observation into the summary."""
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other: "MetricSummary") -> None:
+        """Fold another summary into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the arithmetic mean, or None when empty."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-friendly dict."""
+        return {"count": self.count, "total": self.total, "min": self.minimum, "max": self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricSummary":
+        """Restore a summary produced by :meth:`as_dict`."""
+        return cls(
+            count=int(data.get("count", 0)),
+            total=float(data.get("total", 0.0)),
+            minimum=data.get("min"),
+            maximum=data.get("max"),
+        )
+
+
+@dataclass
+class RunningStats:
+    """Mean, variance, min, and max of one metric via Welford's algorithm."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Fold one observation into the statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold another set of statistics into this one (Chan et al.)."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)  # type: ignore[type-var]
+        self.maximum = max(self.maximum, other.maximum)  # type: ignore[type-var]
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        """Return statistics over ``values`` (e.g. a column view), skipping NaN."""
+        stats = cls()
+        for value in values:
+            if value == value:
+                stats.add(value)
+        return stats
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Return the sample variance, or None with fewer than two observations."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Return the sample standard deviation."""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, stddev, min, and max for display."""
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "stddev": self.stddev,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-friendly dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Restore statistics produced by :meth:`as_dict`."""
+        return cls(
+            count=int(data.get("count", 0)),
+            mean=float(data.get("mean", 0.0)),
+            m2=float(data.get("m2", 0.0)),
+            minimum=data.get("min"),
+            maximum=data.get("max"),
+        )
+
+
+class WindowStats:
+    """Mean, variance, min, and max over the last ``size`` observations.
+
+    Adding a value is amortized O(1): the mean and squared deviations are
+    updated by adding the new value and removing the evicted one, and min/max
+    come from monotonic deques.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = max(1, size)
+        self._values: Deque[float] = deque()
+        self._mins: Deque[Tuple[int, float]] = deque()
+        self._maxs: Deque[Tuple[int, float]] = deque()
+        self._index = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full."""
+        if len(self._values) >= self.size:
+            self._remove(self._values.popleft())
+        self._values.append(value)
+        count = len(self._values)
+        delta = value - self.mean
+        self.mean += delta / count
+        self.m2 += delta * (value - self.mean)
+
+        index = self._index
+        self._index += 1
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((index, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((index, value))
+        oldest = index - count + 1
+        while self._mins[0][0] < oldest:
+            self._mins.popleft()
+        while self._maxs[0][0] < oldest:
+            self._maxs.popleft()
+
+    def _remove(self, value: float) -> None:
+        count = len(self._values)  # the evicted value is already gone
+        if not count:
+            self.mean = self.m2 = 0.0
+            return
+        old_mean = self.mean
+        self.mean = (old_mean * (count + 1) - value) / count
+        self.m2 = max(0.0, self.m2 - (value - old_mean) * (value - self.mean))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Return the sample standard deviation of the window."""
+        count = len(self._values)
+        return math.sqrt(self.m2 / (count - 1)) if count > 1 else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, stddev, min, and max for display."""
+        count = len(self._values)
+        return {
+            "count": count,
+            "mean": self.mean if count else None,
+            "stddev": self.stddev,
+            "min": self._mins[0][1] if count else None,
+            "max": self._maxs[0][1] if count else None,
+        }
+
+    def values(self) -> List[float]:
+        """Return the window contents, oldest first (used for persistence)."""
+        return list(self._values)
+
+
+class RollingStatistics:
+    """A :class:`WindowStats` per metric over the last ``size`` shots."""
+
+    def __init__(self, metrics: Iterable[str], size: int) -> None:
+        self.size = size
+        self.windows: Dict[str, WindowStats] = {name: WindowStats(size) for name in metrics}
+
+    def add(self, shot: Dict[str, Any]) -> None:
+        """Add one shot's metrics to their windows."""
+        for name, window in self.windows.items():
+            value = _as_number(shot.get(name))
+            if value is not None:
+                window.add(value)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the statistics of every metric, keyed by metric."""
+        return {name: window.summary() for name, window in self.windows.items()}
+
+    def as_dict(self) -> Dict[str, List[float]]:
+        """Serialize the window contents."""
+        return {name: window.values() for name, window in self.windows.items()}
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Replay window contents produced by :meth:`as_dict`."""
+        for name, values in data.items():
+            window = self.windows.get(name)
+            if window is not None:
+                for value in values:
+                    window.add(float(value))
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Return numeric values as floats and anything else as None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+A_OR_BETTER_RANKS = frozenset({"S+", "S", "A"})
+
+
+def _a_or_better(shot: Dict[str, Any]) -> Optional[float]:
+    """Return 100 for an A-or-better shot, 0 for other ranked shots, else None."""
+    rank = shot.get("shot_rank")
+    if not isinstance(rank, str):
+        return None
+    return 100.0 if rank in A_OR_BETTER_RANKS else 0.0
+
+
+# Aggregate key -> value of one shot; the window reports the mean of each
+SHOT_WINDOW_METRICS: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+    "avg_carry": lambda shot: _as_number(shot.get("carry_distance_yards")),
+    "avg_offline": lambda shot: _as_number(shot.get("offline_distance_yards")),
+    "a_or_better_rate": _a_or_better,
+    "avg_smash": lambda shot: _as_number(shot.get("smash_factor")),
+}
+
+
+class ShotWindows:
+    """Metric means over the last N shots, for several N at once.
+
+    All windows share one deque of the last ``max(sizes)`` shots' values. Each
+    window keeps a running sum and count per metric: a new shot is added and
+    the shot falling out of that window (``size`` back from the newest) is
+    subtracted, so a shot costs O(windows x metrics) regardless of N. A window's
+    sums are recomputed from the deque once every ``size`` shots, which keeps
+    floating-point drift bounded at amortized O(1).
+    """
+
+    def __init__(
+        self,
+        sizes: Iterable[int],
+        metrics: Optional[Dict[str, Callable[[Dict[str, Any]], Optional[float]]]] = None,
+    ) -> None:
+        self.sizes: Tuple[int, ...] = tuple(sorted({max(1, int(size)) for size in sizes}))
+        self.metrics = dict(metrics if metrics is not None else SHOT_WINDOW_METRICS)
+        self._shots: Deque[Tuple[Optional[float], ...]] = deque(
+            maxlen=self.sizes[-1] if self.sizes else 0
+        )
+        self._sums: Dict[int, List[float]] = {}
+        self._counts: Dict[int, List[int]] = {}
+        self._added = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every shot."""
+        self._shots.clear()
+        self._sums = {size: [0.0] * len(self.metrics) for size in self.sizes}
+        self._counts = {size: [0] * len(self.metrics) for size in self.sizes}
+        self._added = 0
+
+    def add(self, shot: Dict[str, Any]) -> None:
+        """Add one shot, evicting the shot that leaves each window."""
+        if not self.sizes:
+            return
+        values = tuple(extract(shot) for extract in self.metrics.values())
+        for size in self.sizes:
+            sums, counts = self._sums[size], self._counts[size]
+            if len(self._shots) >= size:
+                for index, value in enumerate(self._shots[-size]):
+                    if value is not None:
+                        sums[index] -= value
+                        counts[index] -= 1
+            for index, value in enumerate(values):
+                if value is not None:
+                    sums[index] += value
+                    counts[index] += 1
+        self._shots.append(values)
+        self._added += 1
+        for size in self.sizes:
+            if self._added % size == 0:
+                self._resync(size)
+
+    def _resync(self, size: int) -> None:
+        sums = [0.0] * len(self.metrics)
+        counts = [0] * len(self.metrics)
+        for values in islice(reversed(self._shots), size):
+            for metric, value in enumerate(values):
+                if value is not None:
+                    sums[metric] += value
+                    counts[metric] += 1
+        self._sums[size], self._counts[size] = sums, counts
+
+    def __len__(self) -> int:
+        return len(self._shots)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return ``shot_count`` and each metric's mean, keyed by ``last_<size>``."""
+        result: Dict[str, Dict[str, Any]] = {}
+        for size in self.sizes:
+            window: Dict[str, Any] = {"shot_count": min(size, len(self._shots))}
+            for index, key in enumerate(self.metrics):
+                count = self._counts[size][index]
+                window[key] = self._sums[size][index] / count if count else None
+            result[f"last_{size}"] = window
+        return result
+
+    def load(self, shots: Iterable[Dict[str, Any]]) -> None:
+        """Replace the windows with shots given oldest first."""
+        self.clear()
+        for shot in shots:
+            self.add(shot)
+
+
+class HourlyStatistics:
+    """Per-hour metric summaries waiting to be imported as long-term statistics."""
+
+    def __init__(self, metrics: Iterable[str]) -> None:
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self._buckets: Dict[int, Dict[str, MetricSummary]] = {}
+        self._counts: Dict[int, int] = {}
+
+    @staticmethod
+    def hour_start(timestamp: float) -> int:
+        """Return the UTC epoch second at the start of the timestamp's hour."""
+        return int(timestamp // SECONDS_PER_HOUR) * SECONDS_PER_HOUR
+
+    def add(self, timestamp: float, values: Dict[str, Any]) -> None:
+        """Add one shot's metrics to the bucket for its hour."""
+        hour = self.hour_start(timestamp)
+        bucket = self._buckets.setdefault(hour, {})
+        self._counts[hour] = self._counts.get(hour, 0) + 1
+        for metric in self.metrics:
+            value = _as_number(values.get(metric))
+            if value is not None:
+                bucket.setdefault(metric, MetricSummary()).add(value)
+
+    def pop_completed(
+        self, now: float
+    ) -> List[Tuple[int, int, Dict[str, MetricSummary]]]:
+        """Remove and return ``(hour_start, shot_count, summaries)`` for finished hours."""
+        current = self.hour_start(now)
+        completed = sorted(hour for hour in self._buckets if hour < current)
+        return [
+            (hour, self._counts.pop(hour, 0), self._buckets.pop(hour))
+            for hour in completed
+        ]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize pending buckets so they survive a restart."""
+        return {
+            str(hour): {
+                "count": self._counts.get(hour, 0),
+                "metrics": {name: summary.as_dict() for name, summary in bucket.items()},
+            }
+            for hour, bucket in self._buckets.items()
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Merge buckets produced by :meth:`as_dict`."""
+        for hour_key, payload in data.items():
+            hour = int(hour_key)
+            self._counts[hour] = self._counts.get(hour, 0) + int(payload.get("count", 0))
+            bucket = self._buckets.setdefault(hour, {})
+            for name, summary in (payload.get("metrics") or {}).items():
+                bucket.setdefault(name, MetricSummary()).merge(MetricSummary.from_dict(summary))
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    """Render an epoch timestamp as an ISO 8601 UTC string."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class Session:
+    """Aggregates of one session, each updated in O(1) per shot."""
+
+    def __init__(self, session_id: str, started_at: float, metrics: Iterable[str]) -> None:
+        self.id = session_id
+        self.started_at = started_at
+        self.last_shot_at = started_at
+        self.last_shot_number: Optional[int] = None
+        self.shot_count = 0
+        self.outlier_count = 0
+        self.metrics: Dict[str, RunningStats] = {name: RunningStats() for name in metrics}
+        self.rank_counts: Dict[str, int] = {}
+
+    def add(self, timestamp: float, shot: Dict[str, Any], aggregate: bool = True) -> None:
+        """Fold one shot into the session; ``aggregate=False`` only counts it."""
+        self.shot_count += 1
+        self.last_shot_at = timestamp
+        shot_number = shot.get("shot_number")
+        if isinstance(shot_number, int):
+            self.last_shot_number = shot_number
+        rank = shot.get("shot_rank")
+        if isinstance(rank, str):
+            self.rank_counts[rank] = self.rank_counts.get(rank, 0) + 1
+        if shot.get("outlier_reason"):
+            self.outlier_count += 1
+        if not aggregate:
+            return
+        for name, stats in self.metrics.items():
+            value = _as_number(shot.get(name))
+            if value is not None:
+                stats.add(value)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return a flat summary used for sensors and the session event."""
+        summary: Dict[str, Any] = {
+            "session_id": self.id,
+            "started_at": _iso(self.started_at),
+            "last_shot_at": _iso(self.last_shot_at),
+            "duration_seconds": round(self.last_shot_at - self.started_at, 1),
+            "shot_count": self.shot_count,
+            "outlier_count": self.outlier_count,
+        }
+        for name, metric in self.metrics.items():
+            summary[f"avg_{name}"] = metric.mean if metric.count else None
+        carry = self.metrics.get("carry_distance_yards")
+        summary["best_carry_yards"] = carry.maximum if carry else None
+        summary["rank_distribution"] = dict(sorted(self.rank_counts.items()))
+        return summary
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Return mean, stddev, min, and max of every metric, keyed by metric."""
+        return {name: stats.summary() for name, stats in self.metrics.items()}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize the session so it survives a restart."""
+        return {
+            "id": self.id,
+            "started_at": self.started_at,
+            "last_shot_at": self.last_shot_at,
+            "last_shot_number": self.last_shot_number,
+            "shot_count": self.shot_count,
+            "outlier_count": self.outlier_count,
+            "metrics": {name: metric.as_dict() for name, metric in self.metrics.items()},
+            "rank_counts": dict(self.rank_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], metrics: Iterable[str]) -> "Session":
+        """Restore a session produced by :meth:`as_dict`."""
+        session = cls(str(data["id"]), float(data["started_at"]), metrics)
+        session.last_shot_at = float(data.get("last_shot_at", session.started_at))
+        session.last_shot_number = data.get("last_shot_number")
+        session.shot_count = int(data.get("shot_count", 0))
+        session.outlier_count = int(data.get("outlier_count", 0))
+        for name, metric in (data.get("metrics") or {}).items():
+            if name in session.metrics:
+                session.metrics[name] = RunningStats.from_dict(metric)
+        session.rank_counts = {str(key): int(value) for key, value in (data.get("rank_counts") or {}).items()}
+        return session
+
+
+class SessionTracker:
+    """Split the shot stream into sessions on idle gaps and shot counter resets."""
+
+    def __init__(self, idle_gap: float, metrics: Iterable[str]) -> None:
+        self.idle_gap = idle_gap
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self.current: Optional[Session] = None
+
+    def add_shot(
+        self, timestamp: float, shot: Dict[str, Any], aggregate: bool = True
+    ) -> Optional[Session]:
+        """Add a shot, returning the previous session if this shot started a new one."""
+        closed: Optional[Session] = None
+        current = self.current
+        if current is not None and self._is_boundary(current, timestamp, shot.get("shot_number")):
+            closed = current
+            current = None
+        if current is None:
+            current = self.current = Session(str(int(timestamp)), timestamp, self.metrics)
+        current.add(timestamp, shot, aggregate)
+        return closed
+
+    def _is_boundary(self, current: Session, timestamp: float, shot_number: Any) -> bool:
+        if timestamp - current.last_shot_at > self.idle_gap:
+            return True
+        # The device restarts its shot counter for a new session.
+        return (
+            isinstance(shot_number, int)
+            and current.last_shot_number is not None
+            and shot_number < current.last_shot_number
+        )
+
+    def close_if_idle(self, now: float) -> Optional[Session]:
+        """Close and return the current session if it has been idle long enough."""
+        current = self.current
+        if current is None or now - current.last_shot_at < self.idle_gap:
+            return None
+        self.current = None
+        return current
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize the open session, if any."""
+        return {"current": self.current.as_dict() if self.current else None}
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore state produced by :meth:`as_dict`."""
+        current = data.get("current")
+        self.current = Session.from_dict(current, self.metrics) if current else None
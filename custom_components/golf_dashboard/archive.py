@@ -0,0 +1,44 @@
+"""Reading archived shots back as full records.
+
+The shot store archives shots past their retention period as quantized raw
+launch inputs only. :func:`iter_history` re-derives every other metric with
+the current model in batches, through the same path as recomputes, and chains
+the result with the raw rows that are still live. Pure Python; the integration
+runs it in the executor.
+"""
+from __future__ import annotations
+
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, Optional
+
+from .recompute import recompute_records
+from .shot_store import READ_CHUNK_SIZE, ShotStore
+
+
+def iter_archived_records(
+    store: ShotStore, chunk_size: int = READ_CHUNK_SIZE, **filters: Any
+) -> Iterator[Dict[str, Any]]:
+    """Yield archived shots with derived metrics recomputed ``chunk_size`` at a time."""
+    archived = store.iter_archived(chunk_size=chunk_size, **filters)
+    while True:
+        chunk = list(islice(archived, chunk_size))
+        if not chunk:
+            return
+        yield from recompute_records(chunk)
+
+
+def iter_history(
+    store: ShotStore,
+    include_archive: bool = True,
+    chunk_size: int = READ_CHUNK_SIZE,
+    device: Optional[str] = None,
+    **filters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Yield archived shots, then live shots, matching the same filters.
+
+    Archived shots of a device are always older than its live shots.
+    """
+    live = store.iter_shots(device=device, chunk_size=chunk_size, **filters)
+    if not include_archive:
+        return live
+    return chain(iter_archived_records(store, chunk_size, device=device, **filters), live)
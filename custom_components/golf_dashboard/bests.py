@@ -0,0 +1,228 @@
+"""Personal bests of one device per session, day, and all time.
+
+:class:`BestShots` keeps the single best shot record per metric and window,
+updated in O(1) per shot. :func:`seed_best_shots` rebuilds them at startup
+without scanning history. Rollup buckets give each bucket's min and max, so
+the best bucket is found from a handful of rollup rows and only that
+bucket's shots are read. For the straightest shot, a bucket's min/max only
+bound the result (a bucket with shots both left and right could hold a
+dead-straight one). Buckets are therefore visited best bound first until no
+remaining bucket can win by more than the sensor precision. Mishits and
+excluded outliers are never a best, neither live nor when seeding. Pure
+Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .archive import iter_archived_records
+from .leaderboard import RankedMetric, TopK
+from .outliers import MISHIT_NAMES
+from .shot_store import EXCLUDED_FIELD, GRANULARITIES, ShotStore
+
+WINDOW_SESSION = "session"
+WINDOW_DAY = "day"
+WINDOW_ALL_TIME = "all_time"
+BEST_WINDOWS = (WINDOW_SESSION, WINDOW_DAY, WINDOW_ALL_TIME)
+
+BEST_METRICS: Tuple[RankedMetric, ...] = (
+    RankedMetric("longest_carry", "carry_distance_yards"),
+    RankedMetric("highest_ball_speed", "ball_speed_meters_per_second"),
+    RankedMetric("best_quality", "shot_quality_score"),
+    RankedMetric("straightest", "offline_distance_yards", higher_is_better=False, absolute=True),
+)
+SEED_TOLERANCE = 0.05  # a best within this of every unread bucket's bound is final
+
+
+class BestShots:
+    """Best shot record per metric for the current session, current day, and all time."""
+
+    def __init__(self, metrics: Iterable[RankedMetric] = BEST_METRICS) -> None:
+        self.metrics = {metric.key: metric for metric in metrics}
+        self._bests: Dict[str, Dict[str, TopK]] = {
+            window: self._new_bests() for window in BEST_WINDOWS
+        }
+        self.session_id: Optional[str] = None
+        self.day: Optional[str] = None
+
+    def _new_bests(self) -> Dict[str, TopK]:
+        return {key: TopK(1, metric.higher_is_better) for key, metric in self.metrics.items()}
+
+    def _roll(self, session_id: Optional[str], day: Optional[str]) -> None:
+        if session_id != self.session_id:
+            self._bests[WINDOW_SESSION] = self._new_bests()
+            self.session_id = session_id
+        if day != self.day:
+            self._bests[WINDOW_DAY] = self._new_bests()
+            self.day = day
+
+    def add(self, record: Dict[str, Any], session_id: Optional[str], day: Optional[str]) -> bool:
+        """Offer a shot record; return True if it set any best."""
+        self._roll(session_id, day)
+        changed = False
+        for key, metric in self.metrics.items():
+            value = metric.value(record)
+            if value is None:
+                continue
+            for bests in self._bests.values():
+                changed |= bests[key].add(value, record)
+        return changed
+
+    def roll_day(self, day: str) -> bool:
+        """Start a new day; return True if the day's bests were cleared."""
+        if day == self.day:
+            return False
+        self._roll(self.session_id, day)
+        return True
+
+    def best(self, window: str, metric: str) -> Optional[Dict[str, Any]]:
+        """Return the best record of a window with its ranking ``value``."""
+        return self._bests[window][metric].best()
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return the best record per window and metric; missing bests are omitted."""
+        return {
+            window: {key: best.best() for key, best in bests.items() if len(best)}
+            for window, bests in self._bests.items()
+        }
+
+    def load(
+        self,
+        seeded: Dict[str, Dict[str, Dict[str, Any]]],
+        session_id: Optional[str],
+        day: Optional[str],
+    ) -> None:
+        """Replace every best with records from :func:`seed_best_shots`."""
+        self._bests = {window: self._new_bests() for window in BEST_WINDOWS}
+        self.session_id = session_id
+        self.day = day
+        for window, records in seeded.items():
+            for key, record in records.items():
+                metric = self.metrics.get(key)
+                value = metric.value(record) if metric else None
+                if value is not None and window in self._bests:
+                    self._bests[window][key].add(value, record)
+
+
+def _expression(metric: RankedMetric) -> str:
+    expression = f"json_extract(data, '$.{metric.field}')"
+    return f"ABS({expression})" if metric.absolute else expression
+
+
+def _rank(metric: RankedMetric, value: float) -> float:
+    return value if metric.higher_is_better else -value
+
+
+def _bound(metric: RankedMetric, summary: Dict[str, Any]) -> float:
+    """Return the best value any shot in a rollup bucket can have."""
+    minimum, maximum = summary["min"], summary["max"]
+    if metric.absolute:
+        return 0.0 if minimum <= 0 <= maximum else min(abs(minimum), abs(maximum))
+    return maximum if metric.higher_is_better else minimum
+
+
+def _best_record(
+    store: ShotStore,
+    device: str,
+    metric: RankedMetric,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    session_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return the best live or archived record of a device in a range or session."""
+    expression = _expression(metric)
+    clauses = [
+        "device = ?",
+        f"{expression} IS NOT NULL",
+        # Mishits and excluded outliers never rank, as in BestShots fed live
+        f"COALESCE(shot_name, '') NOT IN ({','.join('?' * len(MISHIT_NAMES))})",
+        f"COALESCE(json_extract(data, '$.{EXCLUDED_FIELD}'), 0) = 0",
+    ]
+    params: List[Any] = [device, *sorted(MISHIT_NAMES)]
+    for clause, value in (("ts >= ?", start_ts), ("ts < ?", end_ts), ("session_id = ?", session_id)):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    order = "DESC" if metric.higher_is_better else "ASC"
+    rows = store.select(
+        f"SELECT data FROM shots WHERE {' AND '.join(clauses)} "
+        f"ORDER BY {expression} {order}, ts LIMIT 1",
+        params,
+    )
+    if rows:
+        return json.loads(rows[0]["data"])
+
+    # The range may have been archived past retention; re-derive its shots.
+    best: Optional[Dict[str, Any]] = None
+    best_rank = float("-inf")
+    for record in iter_archived_records(
+        store, device=device, start_ts=start_ts, end_ts=end_ts, session_id=session_id
+    ):
+        if record.get("shot_name") in MISHIT_NAMES or record.get(EXCLUDED_FIELD):
+            continue
+        value = metric.value(record)
+        if value is not None and _rank(metric, value) > best_rank:
+            best, best_rank = record, _rank(metric, value)
+    return best
+
+
+def _best_from_rollups(
+    store: ShotStore,
+    device: str,
+    metric: RankedMetric,
+    granularity: str,
+    start_ts: Optional[float] = None,
+    tolerance: float = SEED_TOLERANCE,
+) -> Optional[Dict[str, Any]]:
+    """Find the best record via rollup buckets, reading only candidate buckets."""
+    size = GRANULARITIES[granularity]
+    buckets = [
+        (_rank(metric, _bound(metric, bucket[metric.field])), bucket["start"])
+        for bucket in store.rollups(granularity, start_ts, device=device, metrics=[metric.field])
+        if metric.field in bucket
+    ]
+    buckets.sort(key=lambda item: (-item[0], item[1]))
+    best: Optional[Dict[str, Any]] = None
+    best_rank = float("-inf")
+    for bound, bucket_start in buckets:
+        if bound <= best_rank + tolerance:
+            break  # no remaining bucket can beat the best found so far
+        record = _best_record(
+            store,
+            device,
+            metric,
+            max(bucket_start, start_ts) if start_ts is not None else bucket_start,
+            bucket_start + size,
+        )
+        value = metric.value(record) if record else None
+        if value is not None and _rank(metric, value) > best_rank:
+            best, best_rank = record, _rank(metric, value)
+    return best
+
+
+def seed_best_shots(
+    store: ShotStore,
+    device: str,
+    session_id: Optional[str],
+    day_start: float,
+    metrics: Iterable[RankedMetric] = BEST_METRICS,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Return the stored best record per window and metric of one device.
+
+    All-time bests come from daily rollups, the day's from hourly rollups
+    since ``day_start``, and the open session's from its indexed rows.
+    """
+    seeded: Dict[str, Dict[str, Dict[str, Any]]] = {window: {} for window in BEST_WINDOWS}
+    for metric in metrics:
+        found = {
+            WINDOW_ALL_TIME: _best_from_rollups(store, device, metric, "day"),
+            WINDOW_DAY: _best_from_rollups(store, device, metric, "hour", day_start),
+            WINDOW_SESSION: (
+                _best_record(store, device, metric, session_id=session_id) if session_id else None
+            ),
+        }
+        for window, record in found.items():
+            if record is not None:
+                seeded[window][metric.key] = record
+    return seeded
@@ -0,0 +1,211 @@
+"""Online club clustering for Golf Dashboard.
+
+Fixed ball-speed thresholds are a poor stand-in for a player's actual bag, so
+shots are grouped by an incremental clustering of (ball speed, launch, spin).
+Each shot is assigned to the nearest cluster in scaled feature space and moves
+that cluster's centre; a shot far from every cluster starts a new one. Memory
+is bounded: once ``max_clusters`` exist, room is made by folding the stalest
+provisional cluster (fewer than ``min_shots`` shots, typically a stray mishit)
+into its nearest neighbour, and only when every cluster is established are the
+two closest merged. Cluster ids are stable so per-club aggregates can be keyed
+on them; callers rewrite ids that a merge retired. Pure Python, no Home
+Assistant imports.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+MPS_TO_MPH = 2.236936
+
+MAX_CLUSTERS = 14  # a full bag
+SPAWN_DISTANCE = 2.0  # scaled distance beyond which a shot starts a new cluster
+MIN_LEARNING_RATE = 0.02  # keeps centres tracking slow drift after many shots
+MIN_CLUSTER_SHOTS = 5  # a cluster with fewer shots is provisional and pruned first
+
+# Typical within-club spread used to scale each feature
+FEATURE_SCALES: Tuple[float, float, float] = (5.0, 2.5, 800.0)  # mph, degrees, rpm
+
+Features = Tuple[float, float, float]
+
+
+def shot_features(shot: Dict[str, Any]) -> Optional[Features]:
+    """Return (ball speed mph, launch degrees, spin rpm), or None if any is missing."""
+    values = (
+        shot.get("ball_speed_meters_per_second"),
+        shot.get("vertical_launch_angle_degrees"),
+        shot.get("total_spin_rpm"),
+    )
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return None
+    speed, launch, spin = (float(value) for value in values)  # type: ignore[arg-type]
+    return speed * MPS_TO_MPH, launch, spin
+
+
+class Cluster:
+    """One learned club: a centre in feature space and the shots it has absorbed."""
+
+    def __init__(
+        self, cluster_id: str, center: Features, count: int = 1, last_seen: int = 0
+    ) -> None:
+        self.id = cluster_id
+        self.center = center
+        self.count = count
+        self.last_seen = last_seen  # clusterer shot counter at the last assigned shot
+
+    def distance(self, features: Features) -> float:
+        """Return the scaled Euclidean distance to a point."""
+        return math.sqrt(
+            sum(((a - b) / scale) ** 2 for a, b, scale in zip(self.center, features, FEATURE_SCALES))
+        )
+
+    def update(self, features: Features) -> None:
+        """Move the centre toward a new shot."""
+        self.count += 1
+        rate = max(1.0 / self.count, MIN_LEARNING_RATE)
+        self.center = tuple(  # type: ignore[assignment]
+            center + (value - center) * rate for center, value in zip(self.center, features)
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the centre in display units plus the shot count."""
+        speed, launch, spin = self.center
+        return {
+            "id": self.id,
+            "ball_speed_mph": round(speed, 1),
+            "launch_degrees": round(launch, 1),
+            "spin_rpm": round(spin),
+            "shots": self.count,
+        }
+
+
+class ClubClusterer:
+    """Incremental clustering of shots into at most ``max_clusters`` clubs."""
+
+    def __init__(
+        self,
+        max_clusters: int = MAX_CLUSTERS,
+        spawn_distance: float = SPAWN_DISTANCE,
+        min_shots: int = MIN_CLUSTER_SHOTS,
+    ) -> None:
+        self.max_clusters = max(1, max_clusters)
+        self.spawn_distance = spawn_distance
+        self.min_shots = min_shots
+        self.clusters: Dict[str, Cluster] = {}
+        self._next_id = 1
+        self._shots = 0
+
+    def assign(self, shot: Dict[str, Any]) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+        """Assign a shot to a cluster and learn from it.
+
+        Returns the cluster id (None when the shot lacks features) and, when two
+        clusters had to be merged to stay within bounds, ``(absorbed, kept)`` so
+        callers can fold aggregates keyed on the absorbed id into the kept one.
+        """
+        features = shot_features(shot)
+        if features is None:
+            return None, None
+        self._shots += 1
+        nearest = self.nearest(features)
+        if nearest is not None and nearest.distance(features) <= self.spawn_distance:
+            nearest.update(features)
+            nearest.last_seen = self._shots
+            return nearest.id, None
+
+        merged = None
+        if len(self.clusters) >= self.max_clusters:
+            merged = self._prune_provisional() or self._merge_closest()
+        cluster = Cluster(f"club_{self._next_id}", features, last_seen=self._shots)
+        self._next_id += 1
+        self.clusters[cluster.id] = cluster
+        return cluster.id, merged
+
+    def match(self, shot: Dict[str, Any]) -> Optional[str]:
+        """Return the cluster a shot falls into without learning from it.
+
+        None when the shot lacks features or would start a new cluster.
+        """
+        features = shot_features(shot)
+        nearest = self.nearest(features) if features is not None else None
+        if nearest is None or nearest.distance(features) > self.spawn_distance:  # type: ignore[arg-type]
+            return None
+        return nearest.id
+
+    def nearest(self, features: Features) -> Optional[Cluster]:
+        """Return the closest cluster to a point, without learning from it."""
+        return min(self.clusters.values(), key=lambda cluster: cluster.distance(features), default=None)
+
+    def _prune_provisional(self) -> Optional[Tuple[str, str]]:
+        """Fold the stalest provisional cluster into its nearest neighbour.
+
+        The neighbour keeps its centre, so a few stray shots never drag an
+        established club.
+        """
+        provisional = [c for c in self.clusters.values() if c.count < self.min_shots]
+        if not provisional or len(self.clusters) < 2:
+            return None
+        absorbed = min(provisional, key=lambda cluster: (cluster.last_seen, cluster.count))
+        kept = min(
+            (cluster for cluster in self.clusters.values() if cluster is not absorbed),
+            key=lambda cluster: (cluster.count < self.min_shots, cluster.distance(absorbed.center)),
+        )
+        kept.count += absorbed.count
+        kept.last_seen = max(kept.last_seen, absorbed.last_seen)
+        del self.clusters[absorbed.id]
+        return absorbed.id, kept.id
+
+    def _merge_closest(self) -> Optional[Tuple[str, str]]:
+        """Merge the closest pair of clusters into the one with more shots."""
+        clusters = list(self.clusters.values())
+        best: Optional[Tuple[float, Cluster, Cluster]] = None
+        for index, first in enumerate(clusters):
+            for second in clusters[index + 1:]:
+                distance = first.distance(second.center)
+                if best is None or distance < best[0]:
+                    best = (distance, first, second)
+        if best is None:
+            return None
+        _, first, second = best
+        kept, absorbed = (first, second) if first.count >= second.count else (second, first)
+        total = kept.count + absorbed.count
+        kept.center = tuple(  # type: ignore[assignment]
+            (a * kept.count + b * absorbed.count) / total
+            for a, b in zip(kept.center, absorbed.center)
+        )
+        kept.count = total
+        kept.last_seen = max(kept.last_seen, absorbed.last_seen)
+        del self.clusters[absorbed.id]
+        return absorbed.id, kept.id
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Return every cluster, fastest first."""
+        return [
+            cluster.describe()
+            for cluster in sorted(self.clusters.values(), key=lambda cluster: -cluster.center[0])
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize the clusters."""
+        return {
+            "next_id": self._next_id,
+            "shots": self._shots,
+            "clusters": [
+                {
+                    "id": cluster.id,
+                    "center": list(cluster.center),
+                    "count": cluster.count,
+                    "last_seen": cluster.last_seen,
+                }
+                for cluster in self.clusters.values()
+            ],
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore clusters produced by :meth:`as_dict`."""
+        for item in data.get("clusters", []):
+            center = tuple(float(value) for value in item["center"])
+            self.clusters[item["id"]] = Cluster(  # type: ignore[arg-type]
+                item["id"], center, int(item.get("count", 1)), int(item.get("last_seen", 0))
+            )
+        self._next_id = max(int(data.get("next_id", 1)), self._next_id)
+        self._shots = max(int(data.get("shots", 0)), self._shots)
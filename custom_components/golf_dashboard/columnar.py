@@ -0,0 +1,211 @@
+"""Fixed-width columnar session files for Golf Dashboard.
+
+When a session closes its shots are written to one ``.gdc`` file: an 8-byte
+magic, a small JSON header (row count, field names, session metadata), then
+one contiguous little-endian float64 array per field, 8-byte aligned. Missing
+values are NaN. :class:`ColumnarFile` maps the file read-only and hands out
+``memoryview`` columns without copying or parsing rows, so session statistics
+and charts read long history directly from the page cache. Pure Python, no
+Home Assistant imports.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .analytics import RunningStats
+from .shot_import import RAW_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"GDCOL\x00\x00\x01"
+FILE_SUFFIX = ".gdc"
+TYPECODE = "d"
+ITEM_SIZE = 8
+
+COLUMNAR_FIELDS: Tuple[str, ...] = (
+    "ts",
+    *RAW_FIELDS,
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "club_speed_meters_per_second",
+    "smash_factor",
+    "shot_quality_score",
+)
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+NAN = float("nan")
+
+
+def _float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return NAN
+
+
+def write_columnar(
+    path: Path,
+    records: Iterable[Dict[str, Any]],
+    fields: Sequence[str] = COLUMNAR_FIELDS,
+    meta: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write records as one typed column per field; returns the row count.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a partial file.
+    """
+    columns = {field: array(TYPECODE) for field in fields}
+    rows = 0
+    for record in records:
+        rows += 1
+        for field, column in columns.items():
+            column.append(_float(record.get(field)))
+    header = json.dumps(
+        {"rows": rows, "fields": list(fields), "meta": meta or {}}, separators=(",", ":")
+    ).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + _HEADER_LENGTH.size + len(header)) % ITEM_SIZE)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(_HEADER_LENGTH.pack(len(header)))
+        handle.write(header)
+        for column in columns.values():
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(handle)
+    os.replace(partial, path)
+    return rows
+
+
+class _NanAsNone(Sequence):
+    """Read-only view of a column that reports NaN as None, without copying."""
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        value = self._view[index]
+        return None if value != value else value
+
+
+class ColumnarFile:
+    """A memory-mapped, read-only columnar session file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._views: List[memoryview] = []
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._mmap[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a columnar session file")
+            (length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+            start = len(MAGIC) + _HEADER_LENGTH.size
+            header = json.loads(self._mmap[start : start + length].decode("utf-8"))
+            self.rows: int = header["rows"]
+            self.fields: List[str] = header["fields"]
+            self.meta: Dict[str, Any] = header.get("meta", {})
+            self._offset = start + length
+            if len(self._mmap) < self._offset + self.rows * len(self.fields) * ITEM_SIZE:
+                raise ValueError(f"{self.path} is truncated")
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def column(self, field: str) -> memoryview:
+        """Return a zero-copy float64 view of one column."""
+        index = self.fields.index(field)
+        begin = self._offset + index * self.rows * ITEM_SIZE
+        view = memoryview(self._mmap)[begin : begin + self.rows * ITEM_SIZE]
+        if sys.byteorder != "little":
+            swapped = array(TYPECODE, view.tobytes())  # big-endian hosts pay for a copy
+            swapped.byteswap()
+            view.release()
+            view = memoryview(swapped)
+        else:
+            view = view.cast(TYPECODE)
+        self._views.append(view)
+        return view
+
+    def statistics(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Return count/mean/stddev/min/max per field, straight from the mapped columns."""
+        return {
+            field: RunningStats.from_values(self.column(field)).summary()
+            for field in (fields or self.fields)
+            if field in self.fields and field != "ts"
+        }
+
+    def close(self) -> None:
+        """Release every column view and unmap the file."""
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def iter_session_files(directory: Path) -> Iterator[Path]:
+    """Yield the columnar session files in a directory, oldest session first.
+
+    Files are named after the session id, the session's start as UNIX seconds.
+    """
+    if not directory.is_dir():
+        return iter(())
+    return iter(sorted(directory.glob(f"*{FILE_SUFFIX}"), key=lambda path: (len(path.stem), path.stem)))
+
+
+def session_overviews(
+    directory: Path,
+    fields: Optional[Sequence[str]] = None,
+    limit: int = 20,
+    include_columns: bool = False,
+) -> List[Dict[str, Any]]:
+    """Summarize the ``limit`` most recent session files, newest first.
+
+    Statistics are computed from the mapped columns; ``include_columns`` also
+    returns the columns themselves (NaN as None) for charting. A file that
+    cannot be read is logged and skipped.
+    """
+    overviews: List[Dict[str, Any]] = []
+    for path in list(iter_session_files(directory))[::-1]:
+        if len(overviews) >= limit:
+            break
+        try:
+            session = ColumnarFile(path)
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as err:
+            _LOGGER.warning("Skipping unreadable session file %s: %s", path, err)
+            continue
+        with session:
+            overview: Dict[str, Any] = {
+                "session": session.meta,
+                "rows": session.rows,
+                "statistics": session.statistics(fields),
+            }
+            if include_columns:
+                overview["columns"] = {
+                    field: list(_NanAsNone(session.column(field)))
+                    for field in ("ts", *(fields or session.fields))
+                    if field in session.fields
+                }
+            overviews.append(overview)
+    return overviews
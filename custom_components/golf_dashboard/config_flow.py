@@ -15,6 +15,7 @@ from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME
 from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DEFAULT_PORT,
@@ -25,7 +26,16 @@ from .const import (
     CONF_SERIAL,
     CONF_INSTALL_DASHBOARDS,
     CONF_INSTALL_DASHBOARDS_AGAIN,
+    CONF_COMPACT_PUBLISH,
+    CONF_RETENTION_DAYS,
+    CONF_SHOT_WINDOWS,
+    CONF_EXCLUDE_OUTLIERS,
+    CONF_TARGET_YARDS,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_SHOT_WINDOWS,
+    SHOT_WINDOW_CHOICES,
 )
+from .leaderboard import DEFAULT_TARGET_YARDS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -281,7 +291,30 @@ class GolfDashboardOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Optional(
                     CONF_INSTALL_DASHBOARDS_AGAIN,
                     default=default_install,
-                ): bool
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_PUBLISH,
+                    default=options.get(CONF_COMPACT_PUBLISH, False),
+                ): bool,
+                vol.Optional(
+                    CONF_RETENTION_DAYS,
+                    default=options.get(CONF_RETENTION_DAYS, DEFAULT_RETENTION_DAYS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+                vol.Optional(
+                    CONF_SHOT_WINDOWS,
+                    default=[
+                        str(size)
+                        for size in options.get(CONF_SHOT_WINDOWS, DEFAULT_SHOT_WINDOWS)
+                    ],
+                ): cv.multi_select({str(size): f"Last {size} shots" for size in SHOT_WINDOW_CHOICES}),
+                vol.Optional(
+                    CONF_EXCLUDE_OUTLIERS,
+                    default=options.get(CONF_EXCLUDE_OUTLIERS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_TARGET_YARDS,
+                    default=options.get(CONF_TARGET_YARDS, DEFAULT_TARGET_YARDS),
+                ): vol.All(vol.Coerce(float), vol.Range(min=10, max=400)),
             }
         )
 
@@ -1,6 +1,7 @@
 """Constants for the Golf Dashboard integration."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -12,13 +13,33 @@ from homeassistant.const import (
     UnitOfSpeed,
     UnitOfTime,
     DEGREE,
+    PERCENTAGE,
     REVOLUTIONS_PER_MINUTE,
 )
 
 DOMAIN = "golf_dashboard"
 
 DEFAULT_PORT = 2920
-RECONNECT_INTERVAL = 10  # seconds
+RECONNECT_INTERVAL = 10  # seconds before the first retry; doubles per failure
+
+# Connection supervisor shared by all entries (multi-bay hub mode)
+DATA_SUPERVISOR = f"{DOMAIN}_supervisor"
+CONNECT_TIMEOUT = 10  # seconds
+RECONNECT_MAX_INTERVAL = 300  # cap on the reconnect backoff
+RECONNECT_STAGGER = 5  # seconds over which first connection attempts are spread
+RECONNECT_TICK = 2  # seconds between reconnect scheduler ticks
+MAX_CONNECTS_PER_TICK = 4  # connection attempts started per tick across all bays
+MESSAGE_WORKERS = 4  # message processing workers, each owning a shard of devices
+MESSAGE_QUEUE_SIZE = 100  # frames buffered per worker before readers wait
+
+# Facility leaderboard across all bays, owned by the supervisor
+SIGNAL_LEADERBOARD_UPDATED = f"{DOMAIN}_leaderboard_updated"
+LEADERBOARD_STORAGE_KEY = f"{DOMAIN}.leaderboard"
+
+# Persistence of the latest shot/session snapshot across restarts
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN
+STORAGE_SAVE_DELAY = 30  # seconds; coalesces writes so disk is not touched per shot
 
 # SSDP Discovery
 SSDP_ST = "urn:openlaunch:service:websocket:1"
@@ -28,6 +49,119 @@ CONF_PORT = "port"
 CONF_NAME = "name"
 CONF_INSTALL_DASHBOARDS = "install_dashboards"
 CONF_INSTALL_DASHBOARDS_AGAIN = "install_dashboards_again"
+CONF_COMPACT_PUBLISH = "compact_publish"
+CONF_RETENTION_DAYS = "retention_days"
+CONF_SHOT_WINDOWS = "shot_windows"
+CONF_EXCLUDE_OUTLIERS = "exclude_outliers"
+CONF_TARGET_YARDS = "target_yards"  # closest-to-target leaderboard distance
+
+# Compact publish mode: one bus event / one aggregate entity per shot
+EVENT_SHOT = f"{DOMAIN}_shot"
+COMPACT_STATUS_INTERVAL = 300  # seconds between status broadcasts in compact mode
+
+# "Last N shots" aggregate windows, chosen in the options flow
+SHOT_WINDOW_CHOICES = (5, 10, 20, 50, 100)
+DEFAULT_SHOT_WINDOWS = (5, 10, 20)
+
+# Recent shot history served over the websocket API
+HISTORY_SIZE = 1000  # shots kept in the in-memory ring buffer
+HISTORY_PAGE_MAX = 500
+SUBSCRIBE_QUEUE_SIZE = 20  # default per-subscriber backlog before dropping oldest
+SUBSCRIBE_QUEUE_MAX = 500
+
+# Shot store (SQLite, shared by all entries) and exports
+DATA_SHOT_STORE = f"{DOMAIN}_shot_store"
+SHOT_STORE_FILENAME = "shots.db"
+STORE_FLUSH_DELAY = 5  # seconds; shots are written in batches, not one transaction each
+STORE_FLUSH_BATCH = 50
+EXPORT_DIR = "exports"
+SESSIONS_DIR = "sessions"  # columnar files of closed sessions, one folder per device
+
+# Shot store retention and background compaction
+DEFAULT_RETENTION_DAYS = 0  # days of raw shots to keep; 0 keeps everything
+DATA_COMPACT_UNSUB = f"{DOMAIN}_compact_unsub"
+DATA_VACUUM_TASK = f"{DOMAIN}_vacuum_task"  # one-off incremental vacuum conversion
+COMPACT_INTERVAL = 3600  # seconds between compaction runs
+COMPACT_IDLE_TIME = 600  # seconds without a shot before compaction may run
+COMPACT_CHUNK_SIZE = 500  # raw rows deleted per transaction
+COMPACT_VACUUM_PAGES = 256  # free pages returned to the file system per step
+COMPACT_THROTTLE = 0.5  # seconds to pause between chunks
+
+# Background recompute of stored shots after a derived-model change
+DATA_RECOMPUTE_TASK = f"{DOMAIN}_recompute_task"
+EVENT_RECOMPUTE_PROGRESS = f"{DOMAIN}_recompute_progress"
+RECOMPUTE_THROTTLE = 1.0  # seconds to pause between chunks
+CLUB_CLASSES = ("wedge", "mid_iron", "long_iron_hybrid", "driver")
+EXPORT_DEFAULT_FIELDS = (
+    "time",
+    "session_id",
+    "club_class",
+    "shot_number",
+    "ball_speed_meters_per_second",
+    "vertical_launch_angle_degrees",
+    "horizontal_launch_angle_degrees",
+    "total_spin_rpm",
+    "spin_axis_degrees",
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "club_speed_meters_per_second",
+    "smash_factor",
+    "shot_name",
+    "shot_rank",
+    "shot_quality_score",
+)
+
+# Long-term statistics, imported hourly as external statistics
+STATISTICS_IMPORT_MINUTE = 5  # minute past the hour at which the last hour is pushed
+STATISTICS_SHOT_COUNT = ("shot_count", "Shot Count", None)
+STATISTICS_METRICS: dict[str, tuple[str, str, str | None]] = {
+    "carry_distance_yards": ("carry_distance", "Carry Distance", UnitOfLength.YARDS),
+    "ball_speed_meters_per_second": ("ball_speed", "Ball Speed", UnitOfSpeed.METERS_PER_SECOND),
+    "club_speed_meters_per_second": ("club_speed", "Club Speed", UnitOfSpeed.METERS_PER_SECOND),
+    "shot_quality_score": ("shot_quality", "Shot Quality", None),
+}
+
+# Session segmentation
+SESSION_IDLE_GAP = 1800  # seconds without a shot before the session is closed
+EVENT_SESSION_SUMMARY = f"{DOMAIN}_session_summary"
+SESSION_METRICS = (
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "ball_speed_meters_per_second",
+    "club_speed_meters_per_second",
+    "smash_factor",
+    "vertical_launch_angle_degrees",
+    "total_spin_rpm",
+    "shot_quality_score",
+)
+
+# Consistency statistics (mean/stddev/min/max) per session and over recent shots
+STATISTICS_WINDOW_SIZE = 20  # shots in the rolling window
+CONSISTENCY_METRICS: dict[str, tuple[str, str, str | None, SensorDeviceClass | None, int]] = {
+    # json_key: (key, label, unit, device class, precision)
+    "carry_distance_yards": ("carry", "Carry", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1),
+    "ball_speed_meters_per_second": (
+        "ball_speed", "Ball Speed", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.SPEED, 2
+    ),
+    "club_speed_meters_per_second": (
+        "club_speed", "Club Speed", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.SPEED, 2
+    ),
+    "smash_factor": ("smash_factor", "Smash Factor", None, None, 3),
+    "vertical_launch_angle_degrees": ("launch_angle", "Launch Angle", DEGREE, None, 2),
+    "total_spin_rpm": ("spin", "Spin", REVOLUTIONS_PER_MINUTE, None, 0),
+    "offline_distance_yards": ("offline", "Offline", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1),
+}
+
+# Quantile sketches per metric and learned club
+DISTRIBUTION_METRICS = (
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "ball_speed_meters_per_second",
+)
+DISTRIBUTION_SENSOR_METRICS = ("carry_distance_yards", "offline_distance_yards")
 
 # Device info from SSDP
 CONF_MANUFACTURER = "manufacturer"
@@ -40,9 +174,11 @@ class GolfDashboardSensorEntityDescription(SensorEntityDescription):
     """Describes a Golf Dashboard sensor entity."""
 
     json_key: str | None = None
-    message_type: str | None = None  # "shot" or "status"
+    message_type: str | None = None  # coordinator update type, e.g. "shot" or "status"
     precision: int | None = None  # Number of decimal places (None = no rounding)
     value_offset: int = 0  # Add this to the raw value (e.g., +1 for 0-indexed counts)
+    statistic: str | None = None  # Read this field when json_key holds a statistics dict
+    window: str | None = None  # Leaderboard, best-shot, or last-N window, e.g. "day" or "last_10"
 
 
 # Shot Data Sensors (from "type": "shot" messages)
@@ -473,3 +609,240 @@ STATUS_SENSORS: tuple[GolfDashboardSensorEntityDescription, ...] = (
 )
 
 ALL_SENSORS = SHOT_SENSORS + STATUS_SENSORS
+
+# Aggregate shot entity used by the compact publish mode
+SHOT_SUMMARY_SENSOR = GolfDashboardSensorEntityDescription(
+    key="shot_summary",
+    name="Shot Summary",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    icon="mdi:golf-tee",
+    json_key="_last_shot_timestamp",
+    message_type="shot",
+)
+
+# Running aggregates of the current session (from "type": "session" updates)
+SESSION_SENSORS: tuple[GolfDashboardSensorEntityDescription, ...] = (
+    GolfDashboardSensorEntityDescription(
+        key="session_shots",
+        name="Session Shots",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:counter",
+        json_key="shot_count",
+        message_type="session",
+    ),
+    GolfDashboardSensorEntityDescription(
+        key="session_average_carry",
+        name="Session Average Carry",
+        native_unit_of_measurement=UnitOfLength.YARDS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:golf",
+        json_key="avg_carry_distance_yards",
+        message_type="session",
+        precision=1,
+    ),
+    GolfDashboardSensorEntityDescription(
+        key="session_best_carry",
+        name="Session Best Carry",
+        native_unit_of_measurement=UnitOfLength.YARDS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:trophy-outline",
+        json_key="best_carry_yards",
+        message_type="session",
+        precision=1,
+    ),
+    GolfDashboardSensorEntityDescription(
+        key="session_average_ball_speed",
+        name="Session Average Ball Speed",
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        device_class=SensorDeviceClass.SPEED,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:speedometer",
+        json_key="avg_ball_speed_meters_per_second",
+        message_type="session",
+        precision=1,
+    ),
+    GolfDashboardSensorEntityDescription(
+        key="session_average_quality",
+        name="Session Average Quality",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        icon="mdi:star-outline",
+        json_key="avg_shot_quality_score",
+        message_type="session",
+        precision=0,
+    ),
+)
+
+# Summary of the last closed session, with the full summary as attributes
+LAST_SESSION_SENSOR = GolfDashboardSensorEntityDescription(
+    key="last_session",
+    name="Last Session",
+    icon="mdi:clipboard-text-clock-outline",
+    json_key="shot_count",
+    message_type="session_summary",
+)
+
+
+def _statistics_sensors(
+    scope: str, label: str
+) -> tuple[GolfDashboardSensorEntityDescription, ...]:
+    """Build one consistency sensor (state: stddev) per metric for a statistics scope."""
+    return tuple(
+        GolfDashboardSensorEntityDescription(
+            key=f"{scope}_{key}_consistency",
+            name=f"{label} {name} Consistency",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=precision,
+            icon="mdi:sigma",
+            json_key=json_key,
+            message_type=f"{scope}_statistics",
+            precision=precision,
+            statistic="stddev",
+        )
+        for json_key, (key, name, unit, device_class, precision) in CONSISTENCY_METRICS.items()
+    )
+
+
+# Standard deviation per metric; mean/min/max/count are exposed as attributes
+STATISTICS_SENSORS = _statistics_sensors("session", "Session") + _statistics_sensors(
+    "recent", "Recent"
+)
+
+# Percentiles of the last shot's learned club across all sessions
+DISTRIBUTION_SENSORS: tuple[GolfDashboardSensorEntityDescription, ...] = tuple(
+    GolfDashboardSensorEntityDescription(
+        key=f"club_{key}_{statistic}",
+        name=f"Club {name} {statistic.upper()}",
+        native_unit_of_measurement=UnitOfLength.YARDS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        icon="mdi:chart-bell-curve",
+        json_key=json_key,
+        message_type="distribution",
+        precision=1,
+        statistic=statistic,
+    )
+    for json_key, key, name in (
+        ("carry_distance_yards", "carry", "Carry"),
+        ("offline_distance_yards", "offline", "Offline"),
+    )
+    for statistic in ("p10", "p50", "p90")
+)
+
+# 2σ dispersion ellipse of the last shot's learned club; ellipse details as attributes
+DISPERSION_SENSOR = GolfDashboardSensorEntityDescription(
+    key="club_dispersion",
+    name="Club Dispersion",
+    native_unit_of_measurement="yd²",
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=0,
+    icon="mdi:ellipse-outline",
+    json_key="area_2sigma_sq_yards",
+    message_type="dispersion",
+    precision=0,
+)
+
+# Learned club (online cluster over speed/launch/spin) of the last shot
+CLUB_CLUSTER_SENSOR = GolfDashboardSensorEntityDescription(
+    key="club_cluster",
+    name="Club Cluster",
+    icon="mdi:golf",
+    json_key="club_cluster",
+    message_type="shot",
+)
+
+# Facility leaderboard: best shot across all bays per metric and window
+LEADERBOARD_WINDOWS = {"session": "Session", "day": "Today", "week": "This Week"}
+LEADERBOARD_SENSOR_METRICS: dict[str, tuple[str, str | None, SensorDeviceClass | None, int, str]] = {
+    # metric: (label, unit, device class, precision, icon)
+    "longest_carry": ("Longest Carry", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:trophy"),
+    "fastest_ball_speed": (
+        "Fastest Ball Speed", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.SPEED, 1, "mdi:speedometer"
+    ),
+    "best_quality": ("Best Quality", None, None, 0, "mdi:star"),
+    "closest_to_target": (
+        "Closest to Target", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:bullseye-arrow"
+    ),
+}
+LEADERBOARD_SENSORS: tuple[GolfDashboardSensorEntityDescription, ...] = tuple(
+    GolfDashboardSensorEntityDescription(
+        key=f"leaderboard_{window}_{metric}",
+        name=f"{window_label} {label}",
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        suggested_display_precision=precision,
+        icon=icon,
+        json_key=metric,
+        message_type="leaderboard",
+        precision=precision,
+        window=window,
+    )
+    for window, window_label in LEADERBOARD_WINDOWS.items()
+    for metric, (label, unit, device_class, precision, icon) in LEADERBOARD_SENSOR_METRICS.items()
+)
+
+# Personal bests of one device per session, day, and all time
+BEST_SHOT_WINDOWS = {"session": "Session", "day": "Today", "all_time": "All-Time"}
+BEST_SHOT_METRICS: dict[str, tuple[str, str | None, SensorDeviceClass | None, int, str]] = {
+    # metric: (label, unit, device class, precision, icon)
+    "longest_carry": ("Longest Carry", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:trophy"),
+    "highest_ball_speed": (
+        "Highest Ball Speed", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.SPEED, 1, "mdi:speedometer"
+    ),
+    "best_quality": ("Best Quality", None, None, 0, "mdi:star"),
+    "straightest": ("Straightest Shot", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:arrow-up-bold"),
+}
+BEST_SHOT_SENSORS: tuple[GolfDashboardSensorEntityDescription, ...] = tuple(
+    GolfDashboardSensorEntityDescription(
+        key=f"best_{window}_{metric}",
+        name=f"{window_label} {label}",
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        suggested_display_precision=precision,
+        icon=icon,
+        json_key=metric,
+        message_type="best_shots",
+        precision=precision,
+        window=window,
+    )
+    for window, window_label in BEST_SHOT_WINDOWS.items()
+    for metric, (label, unit, device_class, precision, icon) in BEST_SHOT_METRICS.items()
+)
+
+# Averages over the last N shots of one device, one set per configured window
+SHOT_WINDOW_SENSOR_METRICS: dict[str, tuple[str, str | None, SensorDeviceClass | None, int, str]] = {
+    # metric: (label, unit, device class, precision, icon)
+    "avg_carry": ("Average Carry", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:golf-tee"),
+    "avg_offline": ("Average Offline", UnitOfLength.YARDS, SensorDeviceClass.DISTANCE, 1, "mdi:arrow-left-right"),
+    "a_or_better_rate": ("A-or-Better Rate", PERCENTAGE, None, 0, "mdi:percent"),
+    "avg_smash": ("Average Smash Factor", None, None, 2, "mdi:flash"),
+}
+
+
+def shot_window_sensors(sizes: Iterable[int]) -> tuple[GolfDashboardSensorEntityDescription, ...]:
+    """Build the aggregate sensors of each "last N shots" window."""
+    return tuple(
+        GolfDashboardSensorEntityDescription(
+            key=f"last_{size}_{metric}",
+            name=f"Last {size} {label}",
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=precision,
+            icon=icon,
+            json_key=metric,
+            message_type="shot_windows",
+            precision=precision,
+            window=f"last_{size}",
+        )
+        for size in sorted(set(sizes))
+        for metric, (label, unit, device_class, precision, icon) in SHOT_WINDOW_SENSOR_METRICS.items()
+    )
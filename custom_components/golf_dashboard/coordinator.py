@@ -2,30 +2,70 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from datetime import datetime, timezone
 import json
 import logging
-from typing import Any
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any, AsyncIterator, Iterable
 
 import websockets
-from websockets.client import WebSocketClientProtocol
-from websockets.exceptions import (
-    ConnectionClosed,
-    ConnectionClosedError,
-    ConnectionClosedOK,
-)
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util, slugify
 
-from .const import DOMAIN, RECONNECT_INTERVAL
-from .derived import compute_derived_from_shot
+from .const import (
+    COMPACT_STATUS_INTERVAL,
+    CONNECT_TIMEOUT,
+    CONSISTENCY_METRICS,
+    DEFAULT_SHOT_WINDOWS,
+    DISTRIBUTION_METRICS,
+    DISTRIBUTION_SENSOR_METRICS,
+    DOMAIN,
+    EVENT_SESSION_SUMMARY,
+    EVENT_SHOT,
+    HISTORY_SIZE,
+    SESSION_IDLE_GAP,
+    SESSION_METRICS,
+    SESSIONS_DIR,
+    SHOT_SENSORS,
+    STORE_FLUSH_BATCH,
+    STORE_FLUSH_DELAY,
+    SUBSCRIBE_QUEUE_SIZE,
+    STATISTICS_METRICS,
+    STATISTICS_SHOT_COUNT,
+    STATISTICS_WINDOW_SIZE,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .analytics import HourlyStatistics, Session, SessionTracker
+from .bests import BestShots, seed_best_shots
+from .columnar import FILE_SUFFIX as COLUMNAR_SUFFIX, write_columnar
+from .derived import DERIVED_MODEL_VERSION, compute_derived_from_shot
+from .leaderboard import WINDOW_DAY, period_keys
+from .outliers import REASON_MISHIT
+from .players import DEFAULT_PLAYER, PLAYER_CACHE_SIZE, PlayerAnalytics, PlayerCache
+from .shot_store import EXCLUDED_FIELD, ShotStore
+from .shots import ShotQueue, shot_record
+from .supervisor import ConnectionSupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class GolfDashboardCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator to manage the NOVA WebSocket connection for Golf Dashboard."""
+    """Per-device view of a NOVA launch monitor for Golf Dashboard.
+
+    The shared :class:`ConnectionSupervisor` owns the WebSocket; the coordinator
+    processes the frames it hands over and holds the device's state.
+    """
 
     def __init__(
         self,
@@ -36,6 +76,12 @@ class GolfDashboardCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         manufacturer: str | None = None,
         model: str | None = None,
         serial: str | None = None,
+        entry_id: str | None = None,
+        compact_publish: bool = False,
+        shot_store: ShotStore | None = None,
+        supervisor: ConnectionSupervisor | None = None,
+        shot_windows: Iterable[int] = DEFAULT_SHOT_WINDOWS,
+        exclude_outliers: bool = False,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -49,16 +95,60 @@ class GolfDashboardCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.manufacturer = manufacturer or "Open Launch"
         self.model = model or "NOVA"
         self.serial = serial
+        self.entry_id = entry_id
+        self.compact_publish = compact_publish
+        # Keep mishits and outliers out of statistics, sketches, windows, and rollups
+        self.exclude_outliers = exclude_outliers
+        self.device_id = entry_id or name
 
-        self._websocket: WebSocketClientProtocol | None = None
-        self._listen_task: asyncio.Task | None = None
-        self._reconnect_task: asyncio.Task | None = None
-        self._running = False
+        # The supervisor owns the socket and reports connection changes
+        self._supervisor = supervisor
         self._connected = False
 
         # Store latest data by message type
         self._shot_data: dict[str, Any] = {}
         self._status_data: dict[str, Any] = {}
+        self._last_status_broadcast: float | None = None
+
+        # Session boundaries are detected from idle gaps and shot counter resets
+        self._sessions = SessionTracker(SESSION_IDLE_GAP, SESSION_METRICS)
+        self._last_session: dict[str, Any] = {}
+        self._unsub_session_idle: CALLBACK_TYPE | None = None
+
+        # Per-player analytics (learned clubs, statistics, sketches, dispersion).
+        # Only recently active players stay in memory; the rest are persisted
+        # to their own store and reloaded on demand.
+        self._players: list[str] = [DEFAULT_PLAYER]
+        self._player = DEFAULT_PLAYER
+        self._shot_window_sizes = tuple(shot_windows)
+        self._analytics = self._new_player_analytics()
+        self._player_cache = PlayerCache(PLAYER_CACHE_SIZE)
+        self._player_stores: dict[str, Store[dict[str, Any]]] = {}
+        self._player_saves_pending: set[str] = set()
+        self._distribution_data: dict[str, Any] = {}
+
+        # Personal bests per session, day, and all time, seeded from the shot store
+        self._best_shots = BestShots()
+
+        # Ring buffer of recent shot records, ordered by ascending sequence number
+        self._history: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+        self._shot_seq = 0
+        self._shot_queues: set[ShotQueue] = set()
+
+        # Records waiting to be written to the shot store in one batch
+        self._shot_store = shot_store
+        self._pending_records: list[dict[str, Any]] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+        # Latest shot/session snapshot persisted across restarts
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.device_id}"
+        )
+        self._save_pending = False
+
+        # Per-hour aggregates pushed to long-term statistics
+        self._hourly_stats = HourlyStatistics(STATISTICS_METRICS)
+        self._statistics_shot_sum = 0
 
     @property
     def connected(self) -> bool:
@@ -75,126 +165,458 @@ class GolfDashboardCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Return latest status data."""
         return self._status_data
 
+    @property
+    def history(self) -> deque[dict[str, Any]]:
+        """Return recent shot records, oldest first."""
+        return self._history
+
+    @property
+    def shot_store(self) -> ShotStore | None:
+        """Return the shared shot store, or None when it is unavailable."""
+        return self._shot_store
+
+    @property
+    def last_shot_at(self) -> float | None:
+        """Return the UNIX time of the last live shot, or None before the first."""
+        timestamp = self._shot_data.get("_last_shot_timestamp")
+        return timestamp.timestamp() if isinstance(timestamp, datetime) else None
+
+    @property
+    def session_data(self) -> dict[str, Any]:
+        """Return the summary of the current session, or {} between sessions."""
+        current = self._sessions.current
+        return current.summary() if current else {}
+
+    @property
+    def player(self) -> str:
+        """Return the player that new shots are attributed to."""
+        return self._player
+
+    @property
+    def players(self) -> list[str]:
+        """Return the roster of known players."""
+        return self._players
+
+    @property
+    def analytics(self) -> PlayerAnalytics:
+        """Return the active player's analytics."""
+        return self._analytics
+
+    @property
+    def session_statistics(self) -> dict[str, dict[str, Any]]:
+        """Return mean/stddev/min/max per metric for the active player's session shots."""
+        return self._analytics.session_statistics()
+
+    @property
+    def recent_statistics(self) -> dict[str, dict[str, Any]]:
+        """Return mean/stddev/min/max per metric over the active player's last shots."""
+        return self._analytics.recent.summary()
+
+    @property
+    def distribution_data(self) -> dict[str, Any]:
+        """Return carry/offline percentiles for the last shot's club."""
+        return self._distribution_data
+
+    @property
+    def dispersion_data(self) -> dict[str, Any]:
+        """Return the dispersion ellipses for the last shot's club."""
+        if self._shot_data.get("player", DEFAULT_PLAYER) != self._player:
+            return {}  # club ids are per player
+        return self._analytics.club_dispersion(self._shot_data.get("club_cluster"))
+
+    @property
+    def best_shots(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the best shot record per window and metric."""
+        return self._best_shots.summary()
+
+    @property
+    def shot_window_sizes(self) -> tuple[int, ...]:
+        """Return the configured "last N shots" window sizes."""
+        return self._analytics.windows.sizes
+
+    @property
+    def shot_windows(self) -> dict[str, dict[str, Any]]:
+        """Return shot count and averages per "last N shots" window."""
+        return self._analytics.windows.summary()
+
+    def club_cluster(self, cluster_id: str | None) -> dict[str, Any]:
+        """Return one of the active player's learned clubs, or {} if it is unknown."""
+        cluster = self._analytics.clusters.clusters.get(cluster_id or "")
+        return cluster.describe() if cluster else {}
+
+    def _new_player_analytics(self) -> PlayerAnalytics:
+        return PlayerAnalytics(
+            CONSISTENCY_METRICS,
+            STATISTICS_WINDOW_SIZE,
+            DISTRIBUTION_METRICS,
+            self._shot_window_sizes,
+        )
+
+    def _player_store(self, player: str) -> Store[dict[str, Any]]:
+        """Return the store holding one player's analytics."""
+        if player not in self._player_stores:
+            self._player_stores[player] = Store(
+                self.hass,
+                STORAGE_VERSION,
+                f"{STORAGE_KEY}.{self.device_id}.player_{slugify(player)}",
+            )
+        return self._player_stores[player]
+
+    async def async_player_analytics(self, player: str) -> PlayerAnalytics:
+        """Return a player's analytics, loading them from storage if evicted.
+
+        Loading may evict the least recently used inactive player, whose state
+        is saved before it is dropped.
+        """
+        if (cached := self._player_cache.get(player)) is not None:
+            return cached
+        analytics = self._new_player_analytics()
+        try:
+            stored = await self._player_store(player).async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed to load Golf Dashboard analytics for %s: %s", player, err)
+            stored = None
+        if stored:
+            analytics.load(stored)
+        await self._async_seed_shot_windows(player, analytics)
+        if (cached := self._player_cache.get(player)) is not None:
+            return cached  # loaded concurrently
+        for name, evicted in self._player_cache.put(player, analytics, pinned=self._player):
+            _LOGGER.debug("Evicting analytics of inactive player %s", name)
+            self.hass.async_create_task(self._async_save_player(name, evicted))
+        return analytics
+
+    async def _async_save_player(self, player: str, analytics: PlayerAnalytics) -> None:
+        """Write one player's analytics now."""
+        self._player_saves_pending.discard(player)
+        await self._player_store(player).async_save(analytics.as_dict())
+
+    @callback
+    def _async_schedule_player_save(self) -> None:
+        """Schedule a coalesced write of the active player's analytics."""
+        player, analytics = self._player, self._analytics
+        if player in self._player_saves_pending:
+            return
+        self._player_saves_pending.add(player)
+
+        @callback
+        def _data_to_save() -> dict[str, Any]:
+            self._player_saves_pending.discard(player)
+            return analytics.as_dict()
+
+        self._player_store(player).async_delay_save(_data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_set_player(self, player: str) -> None:
+        """Attribute new shots to ``player``, adding it to the roster if needed."""
+        player = player.strip()
+        if not player:
+            raise ValueError("Player name must not be empty")
+        analytics = await self.async_player_analytics(player)
+        if player not in self._players:
+            self._players.append(player)
+        self._player = player
+        self._analytics = analytics
+        self._distribution_data = {}
+        self._async_schedule_save()
+        self.async_set_updated_data(
+            {
+                "type": "player",
+                "data": {"player": player},
+                "aggregates": {
+                    "session_statistics": self.session_statistics,
+                    "recent_statistics": self.recent_statistics,
+                    "distribution": self.distribution_data,
+                    "dispersion": self.dispersion_data,
+                    "shot_windows": self.shot_windows,
+                },
+            }
+        )
+
+    @property
+    def last_session(self) -> dict[str, Any]:
+        """Return the summary of the most recently closed session."""
+        return self._last_session
+
     async def async_start(self) -> None:
-        """Start the coordinator and connect to device."""
-        self._running = True
-        await self._connect()
+        """Restore state and hand the device to the connection supervisor."""
+        await self._async_restore_state()
+        self._analytics = await self.async_player_analytics(self._player)
+        await self._async_seed_best_shots()
+        if self._sessions.current is not None:
+            # Close a session that went idle while Home Assistant was down.
+            self._async_session_idle(dt_util.utcnow())
+        if self._supervisor is not None:
+            self._supervisor.async_register(self)
 
     async def async_stop(self) -> None:
         """Stop the coordinator and disconnect."""
-        self._running = False
-        if self._reconnect_task:
-            self._reconnect_task.cancel()
-            try:
-                await self._reconnect_task
-            except asyncio.CancelledError:
-                pass
-            self._reconnect_task = None
-        if self._listen_task:
-            self._listen_task.cancel()
-            try:
-                await self._listen_task
-            except asyncio.CancelledError:
-                pass
-            self._listen_task = None
-        await self._disconnect()
-
-    async def _connect(self) -> bool:
-        """Connect to the device via WebSocket."""
-        uri = f"ws://{self.host}:{self.port}"
+        if self._unsub_session_idle:
+            self._unsub_session_idle()
+            self._unsub_session_idle = None
+        if self._supervisor is not None:
+            await self._supervisor.async_unregister(self)
+        for queue in self._shot_queues:
+            queue.close()
+        self._shot_queues.clear()
+        await self.async_flush_store()
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+        for player, analytics in self._player_cache.items():
+            if player in self._player_saves_pending:
+                await self._async_save_player(player, analytics)
+
+    async def _async_seed_best_shots(self) -> None:
+        """Rebuild personal bests from the shot store's rollups."""
+        if self._shot_store is None:
+            return
+        current = self._sessions.current
+        session_id = current.id if current else None
+        day = period_keys(dt_util.now())[WINDOW_DAY]
         try:
-            _LOGGER.debug("Connecting to %s", uri)
-            self._websocket = await asyncio.wait_for(
-                websockets.connect(uri),
-                timeout=10.0,
+            seeded = await self.hass.async_add_executor_job(
+                seed_best_shots,
+                self._shot_store,
+                self.device_id,
+                session_id,
+                dt_util.start_of_local_day().timestamp(),
             )
-            self._connected = True
-            _LOGGER.info("Connected to NOVA launch monitor at %s for Golf Dashboard", uri)
-            # Notify entities of connection state change
-            self.async_set_updated_data({"type": "connection", "data": {}})
+        except sqlite3.Error as err:
+            _LOGGER.warning("Failed to seed best shots for %s: %s", self.device_name, err)
+            return
+        self._best_shots.load(seeded, session_id, day)
 
-            # Start listening for messages
-            self._listen_task = asyncio.create_task(self._listen())
-            return True
-        except (OSError, asyncio.TimeoutError, ConnectionRefusedError) as err:
-            _LOGGER.warning("Failed to connect to %s: %s", uri, err)
-            self._connected = False
-            self._schedule_reconnect()
-            return False
+    async def _async_seed_shot_windows(self, player: str, analytics: PlayerAnalytics) -> None:
+        """Replay a player's most recent stored shots on this device into their windows."""
+        store = self._shot_store
+        windows = analytics.windows
+        if store is None or not windows.sizes:
+            return
+        await self.async_flush_store()
 
-    async def _disconnect(self) -> None:
-        """Disconnect from the device."""
-        was_connected = self._connected
-        self._connected = False
-        if self._websocket:
-            try:
-                await self._websocket.close()
-            except Exception:  # noqa: BLE001
-                pass
-            self._websocket = None
-        _LOGGER.debug("Disconnected from NOVA launch monitor")
-        # Notify entities of connection state change
-        if was_connected:
-            self.async_set_updated_data({"type": "connection", "data": {}})
-
-    def _schedule_reconnect(self) -> None:
-        """Schedule a reconnection attempt."""
-        if not self._running:
-            return
-        if self._reconnect_task and not self._reconnect_task.done():
-            return
-        self._reconnect_task = asyncio.create_task(self._reconnect_loop())
-
-    async def _reconnect_loop(self) -> None:
-        """Keep attempting to reconnect until successful or stopped."""
-        while self._running and not self._connected:
-            await asyncio.sleep(RECONNECT_INTERVAL)
-            if not self._running:
-                break
-            _LOGGER.debug("Attempting to reconnect...")
-            try:
-                uri = f"ws://{self.host}:{self.port}"
-                self._websocket = await asyncio.wait_for(
-                    websockets.connect(uri),
-                    timeout=10.0,
+        def _load() -> list[dict[str, Any]]:
+            rows = store.select(
+                "SELECT data FROM shots WHERE device = ? AND player = ? "
+                f"AND COALESCE(json_extract(data, '$.{EXCLUDED_FIELD}'), 0) = 0 "
+                "ORDER BY ts DESC LIMIT ?",
+                (self.device_id, player, windows.sizes[-1]),
+            )
+            return [json.loads(row["data"]) for row in reversed(rows)]
+
+        try:
+            records = await self.hass.async_add_executor_job(_load)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Failed to seed shot windows for %s: %s", player, err)
+            return
+        windows.load(records)
+
+    @callback
+    def async_roll_day(self) -> None:
+        """Clear the day's bests at local midnight."""
+        if self._best_shots.roll_day(period_keys(dt_util.now())[WINDOW_DAY]):
+            self.async_set_updated_data({"type": "best_shots", "data": self.best_shots})
+
+    async def _async_restore_state(self) -> None:
+        """Load the last persisted shot and session snapshot, if any."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed to load persisted Golf Dashboard state: %s", err)
+            return
+        if not stored:
+            return
+
+        shot_data = dict(stored.get("shot") or {})
+        timestamp = shot_data.get("_last_shot_timestamp")
+        if isinstance(timestamp, str):
+            shot_data["_last_shot_timestamp"] = dt_util.parse_datetime(timestamp)
+        self._shot_data = shot_data
+        self._sessions.load(stored.get("sessions") or {})
+        self._last_session = dict(stored.get("last_session") or {})
+        self._players = list(stored.get("players") or [DEFAULT_PLAYER])
+        self._player = stored.get("player") or DEFAULT_PLAYER
+        self._status_data = dict(stored.get("status") or {})
+        statistics = stored.get("statistics") or {}
+        self._hourly_stats.load(statistics.get("pending") or {})
+        self._statistics_shot_sum = int(statistics.get("shot_count_sum", 0))
+        _LOGGER.debug("Restored last shot and session state for %s", self.device_name)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a coalesced write of the latest state.
+
+        Only one save is queued per delay window; shots arriving while a save is
+        pending are folded into that write instead of postponing it.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        self._save_pending = False
+        shot_data = dict(self._shot_data)
+        timestamp = shot_data.get("_last_shot_timestamp")
+        if isinstance(timestamp, datetime):
+            shot_data["_last_shot_timestamp"] = timestamp.isoformat()
+        return {
+            "shot": shot_data,
+            "sessions": self._sessions.as_dict(),
+            "last_session": self._last_session,
+            "players": list(self._players),
+            "player": self._player,
+            "status": {
+                key: value
+                for key, value in self._status_data.items()
+                if key == "firmware_version"
+            },
+            "statistics": {
+                "pending": self._hourly_stats.as_dict(),
+                "shot_count_sum": self._statistics_shot_sum,
+            },
+        }
+
+    @callback
+    def async_import_statistics(self, now: datetime) -> None:
+        """Push completed hourly aggregates to long-term statistics in one batch."""
+        completed = self._hourly_stats.pop_completed(now.timestamp())
+        if not completed:
+            return
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded; dropping %s hour(s) of statistics", len(completed))
+            return
+
+        object_prefix = slugify(self.device_name)
+        shot_counts: list[StatisticData] = []
+        metrics: dict[str, list[StatisticData]] = {}
+        for hour, shot_count, summaries in completed:
+            start = dt_util.utc_from_timestamp(hour)
+            self._statistics_shot_sum += shot_count
+            shot_counts.append(
+                StatisticData(start=start, state=shot_count, sum=self._statistics_shot_sum)
+            )
+            for json_key, summary in summaries.items():
+                metrics.setdefault(json_key, []).append(
+                    StatisticData(
+                        start=start,
+                        mean=summary.mean,
+                        min=summary.minimum,
+                        max=summary.maximum,
+                    )
                 )
-                self._connected = True
-                _LOGGER.info("Reconnected to NOVA launch monitor at %s for Golf Dashboard", uri)
-                # Notify entities of connection state change
-                self.async_set_updated_data({"type": "connection", "data": {}})
-                # Start listening for messages
-                self._listen_task = asyncio.create_task(self._listen())
-                break
-            except (OSError, asyncio.TimeoutError, ConnectionRefusedError) as err:
-                _LOGGER.debug("Reconnect failed: %s, will retry in %s seconds", err, RECONNECT_INTERVAL)
-
-    async def _listen(self) -> None:
-        """Listen for incoming WebSocket messages."""
+
+        suffix, label, unit = STATISTICS_SHOT_COUNT
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{self.device_name} {label}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{object_prefix}_{suffix}",
+                unit_of_measurement=unit,
+            ),
+            shot_counts,
+        )
+        for json_key, rows in metrics.items():
+            suffix, label, unit = STATISTICS_METRICS[json_key]
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"{self.device_name} {label}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{object_prefix}_{suffix}",
+                    unit_of_measurement=unit,
+                ),
+                rows,
+            )
+        _LOGGER.debug("Imported %s hour(s) of shot statistics for %s", len(completed), self.device_name)
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_session_close(self, delay: float) -> None:
+        """(Re)arm the timer that closes the current session once it goes idle."""
+        if self._unsub_session_idle:
+            self._unsub_session_idle()
+        self._unsub_session_idle = async_call_later(
+            self.hass, max(delay, 0), self._async_session_idle
+        )
+
+    @callback
+    def _async_session_idle(self, now: datetime) -> None:
+        """Close the current session if no shot arrived within the idle gap."""
+        self._unsub_session_idle = None
+        current = self._sessions.current
+        if current is None:
+            return
+        closed = self._sessions.close_if_idle(now.timestamp())
+        if closed is None:
+            self._async_schedule_session_close(
+                current.last_shot_at + SESSION_IDLE_GAP - now.timestamp()
+            )
+            return
+        self._async_close_session(closed)
+
+    @callback
+    def _async_close_session(self, session: Session) -> None:
+        """Publish the summary of a finished session."""
+        summary = session.summary()
+        self._last_session = summary
+        _LOGGER.debug(
+            "Session %s closed after %s shot(s) on %s",
+            session.id,
+            session.shot_count,
+            self.device_name,
+        )
+        self.hass.bus.async_fire(
+            EVENT_SESSION_SUMMARY,
+            {"entry_id": self.entry_id, "device": self.device_name, **summary},
+        )
+        self._async_schedule_save()
+        self.async_set_updated_data({"type": "session_summary", "data": summary})
+        if self._supervisor is not None:
+            self._supervisor.async_end_session(self)
+        if self._shot_store is not None:
+            self.hass.async_create_task(self._async_write_session_file(summary))
+
+    @property
+    def session_files_dir(self) -> Path:
+        """Return the folder holding this device's columnar session files."""
+        return Path(self.hass.config.path(DOMAIN, SESSIONS_DIR, slugify(self.device_id)))
+
+    async def _async_write_session_file(self, summary: dict[str, Any]) -> None:
+        """Write a closed session's stored shots to a columnar file."""
+        store = self._shot_store
+        assert store is not None
+        await self.async_flush_store()
+        session_id = summary["session_id"]
+        path = self.session_files_dir / f"{session_id}{COLUMNAR_SUFFIX}"
+
+        def _write() -> int:
+            records = store.iter_shots(device=self.device_id, session_id=session_id)
+            return write_columnar(path, records, meta=summary)
+
         try:
-            while self._running and self._websocket:
-                try:
-                    message = await self._websocket.recv()
-                    await self._process_message(message)
-                except ConnectionClosedOK:
-                    _LOGGER.info("WebSocket connection closed normally")
-                    break
-                except ConnectionClosedError as err:
-                    _LOGGER.warning("WebSocket connection closed with error: %s", err)
-                    break
-                except ConnectionClosed:
-                    _LOGGER.warning("WebSocket connection closed")
-                    break
-                except asyncio.CancelledError:
-                    raise
-                except Exception as err:  # noqa: BLE001
-                    _LOGGER.error("Error receiving WebSocket message: %s", err)
-                    break
-        finally:
-            await self._disconnect()
-            self._schedule_reconnect()
+            rows = await self.hass.async_add_executor_job(_write)
+        except (OSError, sqlite3.Error) as err:
+            _LOGGER.warning("Failed to write session file %s: %s", path, err)
+            return
+        _LOGGER.debug("Wrote %s shot(s) of session %s to %s", rows, session_id, path)
+
+    @callback
+    def async_set_connected(self, connected: bool) -> None:
+        """Record a connection state change reported by the supervisor."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        # Notify entities of connection state change
+        self.async_set_updated_data({"type": "connection", "data": {}})
 
-    async def _process_message(self, message: str) -> None:
-        """Process incoming WebSocket message."""
+    async def async_process_message(self, message: str) -> None:
+        """Process one WebSocket frame handed over by the supervisor."""
         try:
             data = json.loads(message)
             msg_type = data.get("type", "unknown")
@@ -205,24 +627,219 @@ class GolfDashboardCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 # Add timestamp for "last shot" sensor
                 data["_last_shot_timestamp"] = datetime.now(timezone.utc)
                 derived_data = self._augment_with_derived_metrics(data)
+                derived_data["player"] = self._player
+                reason = self._analytics.check_outlier(derived_data)
+                excluded = self.exclude_outliers and reason is not None
+                derived_data["outlier_reason"] = reason
+                derived_data[EXCLUDED_FIELD] = excluded
                 self._shot_data = derived_data
-                self.async_set_updated_data({"type": "shot", "data": derived_data})
+                shot_ts = data["_last_shot_timestamp"].timestamp()
+                closed = self._sessions.add_shot(shot_ts, derived_data, aggregate=not excluded)
+                if closed is not None:
+                    self._async_close_session(closed)
+                self._async_schedule_session_close(SESSION_IDLE_GAP)
+                merged = self._analytics.add_shot(
+                    derived_data, self._sessions.current.id, aggregate=not excluded
+                )
+                if merged is not None:
+                    self._async_rename_cluster(self._player, *merged)
+                self._distribution_data = self._analytics.club_distribution(
+                    derived_data.get("club_cluster"), DISTRIBUTION_SENSOR_METRICS
+                )
+                self._async_schedule_player_save()
+                self._shot_seq += 1
+                record = shot_record(self._shot_seq, data["_last_shot_timestamp"], derived_data)
+                record["session_id"] = self._sessions.current.id
+                record["model_version"] = DERIVED_MODEL_VERSION
+                self._history.append(record)
+                # Mishits never rank; excluded outliers neither
+                ranked = not excluded and reason != REASON_MISHIT
+                bests_changed = ranked and self._best_shots.add(
+                    record,
+                    record["session_id"],
+                    period_keys(dt_util.as_local(data["_last_shot_timestamp"]))[WINDOW_DAY],
+                )
+                self._async_queue_store_write(record)
+                for queue in self._shot_queues:
+                    queue.put_nowait(record)
+                # Excluded shots still count toward the hour's shot total
+                self._hourly_stats.add(shot_ts, {} if excluded else derived_data)
+                if ranked and self._supervisor is not None:
+                    self._supervisor.async_add_shot(self, derived_data, record["session_id"])
+                self._async_schedule_save()
+                # One update per shot: entities pick their aggregate from it
+                aggregates = {
+                    "session": self.session_data,
+                    "session_statistics": self.session_statistics,
+                    "recent_statistics": self.recent_statistics,
+                    "distribution": self.distribution_data,
+                    "dispersion": self.dispersion_data,
+                    "shot_windows": self.shot_windows,
+                }
+                if bests_changed:
+                    aggregates["best_shots"] = self.best_shots
+                self.async_set_updated_data(
+                    {"type": "shot", "data": derived_data, "aggregates": aggregates}
+                )
+                if self.compact_publish:
+                    self.hass.bus.async_fire(
+                        EVENT_SHOT,
+                        {
+                            "entry_id": self.entry_id,
+                            "device": self.device_name,
+                            "shot": self.compact_shot_payload(),
+                        },
+                    )
             elif msg_type == "status":
+                firmware_changed = data.get("firmware_version") != self._status_data.get(
+                    "firmware_version"
+                )
                 self._status_data = data
-                self.async_set_updated_data({"type": "status", "data": data})
+                if self._should_broadcast_status(firmware_changed):
+                    self.async_set_updated_data({"type": "status", "data": data})
             else:
                 _LOGGER.warning("Unknown message type: %s", msg_type)
 
         except json.JSONDecodeError as err:
             _LOGGER.error("Failed to parse JSON message: %s", err)
 
+    def _should_broadcast_status(self, firmware_changed: bool) -> bool:
+        """Return True if a status frame should be pushed to entities.
+
+        In compact publish mode the periodic status frames (uptime ticks) are
+        throttled so they do not add a recorder row per frame.
+        """
+        if not self.compact_publish or firmware_changed:
+            return True
+        now = time.monotonic()
+        if (
+            self._last_status_broadcast is not None
+            and now - self._last_status_broadcast < COMPACT_STATUS_INTERVAL
+        ):
+            return False
+        self._last_status_broadcast = now
+        return True
+
+    def compact_shot_payload(self) -> dict[str, Any]:
+        """Return the latest shot as one flat, rounded payload keyed by sensor key."""
+        payload: dict[str, Any] = {}
+        for description in SHOT_SENSORS:
+            value = self._shot_data.get(description.json_key)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                value += description.value_offset
+                if description.precision is not None:
+                    value = round(value, description.precision)
+                    if description.precision == 0:
+                        value = int(value)
+            payload[description.key] = value
+        return payload
+
+    @callback
+    def _async_rename_cluster(self, player: str, old: str, new: str) -> None:
+        """Retag history and stored shots of a learned club merged into another."""
+        for record in self._history:
+            if record.get("player") == player and record.get("club_cluster") == old:
+                record["club_cluster"] = new
+        if self._shot_store is not None:
+            self.hass.async_create_task(self._async_rename_stored_cluster(player, old, new))
+
+    async def _async_rename_stored_cluster(self, player: str, old: str, new: str) -> None:
+        """Flush buffered shots, then retag the stored rows of a merged club."""
+        await self.async_flush_store()
+        if self._shot_store is None:
+            return
+        try:
+            await self.hass.async_add_executor_job(
+                self._shot_store.rename_cluster, self.device_id, player, old, new
+            )
+        except sqlite3.Error as err:
+            _LOGGER.error("Failed to retag shots of merged club %s: %s", old, err)
+
+    @callback
+    def _async_queue_store_write(self, record: dict[str, Any]) -> None:
+        """Buffer a record for the shot store, flushing in batches."""
+        if self._shot_store is None:
+            return
+        self._pending_records.append(record)
+        if len(self._pending_records) >= STORE_FLUSH_BATCH:
+            self.hass.async_create_task(self.async_flush_store())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, STORE_FLUSH_DELAY, self._async_flush_store_later
+            )
+
+    async def _async_flush_store_later(self, _now: datetime) -> None:
+        """Flush buffered records once the batching delay expires."""
+        self._unsub_flush = None
+        await self.async_flush_store()
+
+    async def async_flush_store(self) -> None:
+        """Write all buffered records to the shot store in one transaction."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._shot_store is None or not self._pending_records:
+            return
+        records, self._pending_records = self._pending_records, []
+        try:
+            await self.hass.async_add_executor_job(
+                self._shot_store.insert_many, self.device_id, records
+            )
+        except sqlite3.Error as err:
+            _LOGGER.error("Failed to write %s shot(s) to the shot store: %s", len(records), err)
+
+    @callback
+    def async_subscribe_shots(
+        self, fields: list[str] | None, maxsize: int
+    ) -> tuple[ShotQueue, CALLBACK_TYPE]:
+        """Register a bounded queue that receives every new shot record.
+
+        Returns the queue and a callback that removes it again.
+        """
+        queue = ShotQueue(maxsize, fields)
+        self._shot_queues.add(queue)
+
+        @callback
+        def _unsubscribe() -> None:
+            self._shot_queues.discard(queue)
+
+        return queue, _unsubscribe
+
+    async def stream(
+        self,
+        fields: list[str] | None = None,
+        maxsize: int = SUBSCRIBE_QUEUE_SIZE,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield each new shot record for consumers outside the entity model.
+
+        Usage from another integration or script::
+
+            async for shot in coordinator.stream(fields=["carry_distance_yards"]):
+                ...
+
+        Each stream has its own bounded, drop-oldest queue, so a slow consumer
+        never delays shot ingest, and unlike coordinator listeners it is not
+        woken by status or connection updates. The stream ends when the
+        coordinator stops.
+        """
+        queue, unsubscribe = self.async_subscribe_shots(fields, maxsize)
+        try:
+            async for record in queue:
+                yield record
+        finally:
+            unsubscribe()
+
     async def async_test_connection(self) -> bool:
         """Test connection to the device."""
         uri = f"ws://{self.host}:{self.port}"
         try:
             websocket = await asyncio.wait_for(
                 websockets.connect(uri),
-                timeout=10.0,
+                timeout=CONNECT_TIMEOUT,
             )
             await websocket.close()
             return True
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 GRAVITY = 9.81  # m/s^2
 MPS_TO_MPH = 2.236936
@@ -19,6 +19,11 @@ DRIVER_COR_LIMIT = 0.83
 MIN_EFFECTIVE_COR = 0.52
 THEORETICAL_CARRY_PER_MPS = 4.91
 
+# Version of the derived-metric model. Bump this whenever a formula below
+# changes; stored shots stamped with an older version are recomputed in the
+# background.
+DERIVED_MODEL_VERSION = 1
+
 
 @dataclass(frozen=True)
 class ImpactBand:
@@ -657,6 +662,10 @@ def compute_derived_from_shot(
     if recommendation:
         derived["club_recommendation"] = recommendation
 
+    # Rough club class used to segment stored shots
+    if ball_speed_mph is not None:
+        derived["club_class"] = _infer_club_class(ball_speed_mph)
+
     # Spin loft / attack angle
     derived.update(compute_spin_loft_and_aoa(ball_speed_mps, total_spin_rpm, vla_deg))
 
@@ -676,3 +685,32 @@ def compute_derived_from_shot(
         derived.update(_classify_shot(ball_speed_mps, vla_deg, hla_deg, spin_axis_deg))
 
     return derived
+
+
+def compute_derived_batch(
+    ball_speed_mps: Sequence[Optional[float]],
+    vla_deg: Sequence[Optional[float]],
+    hla_deg: Sequence[Optional[float]],
+    total_spin_rpm: Sequence[Optional[float]],
+    spin_axis_deg: Sequence[Optional[float]],
+) -> List[Dict[str, Any]]:
+    """Compute derived metrics for a batch of shots given as parallel columns.
+
+    This is the entry point for bulk work (imports, recomputes, archive reads).
+    The columns may be any sequences, including memoryviews over typed arrays;
+    the model stays dependency-free, so rows are evaluated one at a time with
+    the same functions as :func:`compute_derived_from_shot`.
+    """
+    count = len(ball_speed_mps)
+    if not (len(vla_deg) == len(hla_deg) == len(total_spin_rpm) == len(spin_axis_deg) == count):
+        raise ValueError("All input columns must have the same length")
+    return [
+        compute_derived_from_shot(
+            ball_speed_mps[index],
+            vla_deg[index],
+            hla_deg[index],
+            total_spin_rpm[index],
+            spin_axis_deg[index],
+        )
+        for index in range(count)
+    ]
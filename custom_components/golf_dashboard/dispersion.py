@@ -0,0 +1,251 @@
+"""Shot dispersion aggregates for Golf Dashboard.
+
+Per learned club (the ``club_cluster`` id from ``clusters.py``) the
+coordinator keeps a streaming 2×2 covariance of landing position (carry,
+offline), from which 1σ/2σ dispersion ellipses are derived, and a
+fixed-resolution landing histogram for heat maps. Segments follow cluster
+merges through :meth:`ClubDispersion.absorb`. Both are O(1) per shot,
+mergeable across sessions and bays, and serialize to small dicts. Pure Python,
+no Home Assistant imports.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ALL_CLUBS = "all"
+
+# Landing grid geometry, in yards
+GRID_CARRY_MIN = 0.0
+GRID_CARRY_STEP = 5.0
+GRID_CARRY_BINS = 70  # 0-350 yards
+GRID_OFFLINE_MIN = -60.0
+GRID_OFFLINE_STEP = 4.0
+GRID_OFFLINE_BINS = 30  # -60..60 yards
+
+
+class Dispersion:
+    """Streaming mean and covariance of (carry, offline) landing positions."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean_carry = 0.0
+        self.mean_offline = 0.0
+        self.m2_carry = 0.0
+        self.m2_offline = 0.0
+        self.co_moment = 0.0
+
+    def add(self, carry: float, offline: float) -> None:
+        """Fold one landing position into the covariance (bivariate Welford)."""
+        self.count += 1
+        delta_carry = carry - self.mean_carry
+        delta_offline = offline - self.mean_offline
+        self.mean_carry += delta_carry / self.count
+        self.mean_offline += delta_offline / self.count
+        self.m2_carry += delta_carry * (carry - self.mean_carry)
+        self.m2_offline += delta_offline * (offline - self.mean_offline)
+        self.co_moment += delta_carry * (offline - self.mean_offline)
+
+    def merge(self, other: "Dispersion") -> None:
+        """Fold another covariance into this one."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta_carry = other.mean_carry - self.mean_carry
+        delta_offline = other.mean_offline - self.mean_offline
+        weight = self.count * other.count / count
+        self.m2_carry += other.m2_carry + delta_carry * delta_carry * weight
+        self.m2_offline += other.m2_offline + delta_offline * delta_offline * weight
+        self.co_moment += other.co_moment + delta_carry * delta_offline * weight
+        self.mean_carry += delta_carry * other.count / count
+        self.mean_offline += delta_offline * other.count / count
+        self.count = count
+
+    def covariance(self) -> Optional[Tuple[float, float, float]]:
+        """Return the sample (var_carry, var_offline, cov), or None below two shots."""
+        if self.count < 2:
+            return None
+        scale = self.count - 1
+        return self.m2_carry / scale, self.m2_offline / scale, self.co_moment / scale
+
+    def ellipse(self, sigma: float = 1.0) -> Optional[Dict[str, float]]:
+        """Return the ``sigma`` dispersion ellipse centred on the mean landing point.
+
+        ``angle_degrees`` is the rotation of the major axis from the carry axis
+        toward positive offline.
+        """
+        covariance = self.covariance()
+        if covariance is None:
+            return None
+        var_carry, var_offline, cov = covariance
+        half_trace = (var_carry + var_offline) / 2
+        spread = math.hypot((var_carry - var_offline) / 2, cov)
+        major = max(half_trace + spread, 0.0)
+        minor = max(half_trace - spread, 0.0)
+        return {
+            "semi_major_yards": sigma * math.sqrt(major),
+            "semi_minor_yards": sigma * math.sqrt(minor),
+            "angle_degrees": math.degrees(0.5 * math.atan2(2 * cov, var_carry - var_offline)),
+        }
+
+    def summary(self, precision: int = 2) -> Dict[str, Any]:
+        """Return the centre and 1σ/2σ ellipses, rounded for display."""
+        def _rounded(ellipse: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+            if ellipse is None:
+                return None
+            return {key: round(value, precision) for key, value in ellipse.items()}
+
+        one_sigma = self.ellipse(1.0)
+        return {
+            "count": self.count,
+            "center_carry_yards": round(self.mean_carry, precision) if self.count else None,
+            "center_offline_yards": round(self.mean_offline, precision) if self.count else None,
+            "sigma1": _rounded(one_sigma),
+            "sigma2": _rounded(self.ellipse(2.0)),
+            "area_2sigma_sq_yards": (
+                round(math.pi * 4 * one_sigma["semi_major_yards"] * one_sigma["semi_minor_yards"], 1)
+                if one_sigma
+                else None
+            ),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-friendly dict."""
+        return {
+            "count": self.count,
+            "mean": [self.mean_carry, self.mean_offline],
+            "m2": [self.m2_carry, self.m2_offline, self.co_moment],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Dispersion":
+        """Restore a covariance produced by :meth:`as_dict`."""
+        dispersion = cls()
+        dispersion.count = int(data.get("count", 0))
+        dispersion.mean_carry, dispersion.mean_offline = (float(v) for v in data.get("mean", (0.0, 0.0)))
+        dispersion.m2_carry, dispersion.m2_offline, dispersion.co_moment = (
+            float(v) for v in data.get("m2", (0.0, 0.0, 0.0))
+        )
+        return dispersion
+
+
+class LandingGrid:
+    """Fixed-resolution 2D histogram of landing positions, stored sparsely.
+
+    Rows are carry bins and columns are offline bins; landings outside the
+    grid are counted in the nearest edge cell.
+    """
+
+    def __init__(self) -> None:
+        self.cells: Dict[Tuple[int, int], int] = {}
+
+    @staticmethod
+    def _bin(value: float, minimum: float, step: float, bins: int) -> int:
+        return min(max(int((value - minimum) // step), 0), bins - 1)
+
+    def add(self, carry: float, offline: float) -> None:
+        """Count one landing."""
+        cell = (
+            self._bin(carry, GRID_CARRY_MIN, GRID_CARRY_STEP, GRID_CARRY_BINS),
+            self._bin(offline, GRID_OFFLINE_MIN, GRID_OFFLINE_STEP, GRID_OFFLINE_BINS),
+        )
+        self.cells[cell] = self.cells.get(cell, 0) + 1
+
+    def merge(self, other: "LandingGrid") -> None:
+        """Add another grid's counts to this one."""
+        for cell, count in other.cells.items():
+            self.cells[cell] = self.cells.get(cell, 0) + count
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the grid geometry and non-empty cells as ``[row, col, count]``."""
+        return {
+            "carry_min": GRID_CARRY_MIN,
+            "carry_step": GRID_CARRY_STEP,
+            "rows": GRID_CARRY_BINS,
+            "offline_min": GRID_OFFLINE_MIN,
+            "offline_step": GRID_OFFLINE_STEP,
+            "cols": GRID_OFFLINE_BINS,
+            "cells": [[row, col, count] for (row, col), count in sorted(self.cells.items())],
+        }
+
+    def as_dict(self) -> List[List[int]]:
+        """Serialize the non-empty cells."""
+        return [[row, col, count] for (row, col), count in self.cells.items()]
+
+    @classmethod
+    def from_dict(cls, data: Iterable[Iterable[int]]) -> "LandingGrid":
+        """Restore a grid produced by :meth:`as_dict`."""
+        grid = cls()
+        for row, col, count in data:
+            grid.cells[(int(row), int(col))] = int(count)
+        return grid
+
+
+class ClubDispersion:
+    """A :class:`Dispersion` and :class:`LandingGrid` per club segment, plus ``all``."""
+
+    def __init__(self, segment_field: str = "club_class") -> None:
+        self.segment_field = segment_field
+        self.segments: Dict[str, Tuple[Dispersion, LandingGrid]] = {}
+
+    def _segment(self, segment: str) -> Tuple[Dispersion, LandingGrid]:
+        if segment not in self.segments:
+            self.segments[segment] = (Dispersion(), LandingGrid())
+        return self.segments[segment]
+
+    def add(self, shot: Dict[str, Any]) -> None:
+        """Add a shot's landing position to its club segment and to ``all``."""
+        carry = shot.get("carry_distance_yards")
+        offline = shot.get("offline_distance_yards")
+        if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (carry, offline)):
+            return
+        segments = [ALL_CLUBS]
+        if isinstance(shot.get(self.segment_field), str):
+            segments.append(shot[self.segment_field])
+        for segment in segments:
+            dispersion, grid = self._segment(segment)
+            dispersion.add(float(carry), float(offline))  # type: ignore[arg-type]
+            grid.add(float(carry), float(offline))  # type: ignore[arg-type]
+
+    def merge(self, other: "ClubDispersion", segments: Optional[Iterable[str]] = None) -> None:
+        """Fold another set (optionally only some segments) into this one."""
+        wanted = set(segments) if segments is not None else None
+        for segment, (dispersion, grid) in other.segments.items():
+            if wanted is not None and segment not in wanted:
+                continue
+            own_dispersion, own_grid = self._segment(segment)
+            own_dispersion.merge(dispersion)
+            own_grid.merge(grid)
+
+    def absorb(self, source: str, target: str) -> None:
+        """Fold segment ``source`` into ``target`` and drop it (e.g. after a cluster merge)."""
+        if source not in self.segments:
+            return
+        dispersion, grid = self.segments.pop(source)
+        own_dispersion, own_grid = self._segment(target)
+        own_dispersion.merge(dispersion)
+        own_grid.merge(grid)
+
+    def summary(self, segment: str, include_grid: bool = True) -> Dict[str, Any]:
+        """Return the ellipse summary (and optionally the grid) of one segment."""
+        if segment not in self.segments:
+            return {}
+        dispersion, grid = self.segments[segment]
+        summary = dispersion.summary()
+        if include_grid:
+            summary["grid"] = grid.summary()
+        return summary
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize every segment."""
+        return {
+            segment: {"dispersion": dispersion.as_dict(), "grid": grid.as_dict()}
+            for segment, (dispersion, grid) in self.segments.items()
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Merge segments produced by :meth:`as_dict`."""
+        for segment, payload in data.items():
+            own_dispersion, own_grid = self._segment(segment)
+            own_dispersion.merge(Dispersion.from_dict(payload.get("dispersion") or {}))
+            own_grid.merge(LandingGrid.from_dict(payload.get("grid") or []))
@@ -0,0 +1,87 @@
+"""Streaming shot export for Golf Dashboard.
+
+Writes shot records to CSV or JSON Lines, optionally gzip-compressed, one row
+at a time so memory use does not depend on the size of the exported range.
+Pure Python; the integration runs :func:`write_export` in the executor.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Optional, Sequence
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+EXPORT_FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+# Virtual column rendering the record timestamp as ISO 8601 (UTC)
+TIME_FIELD = "time"
+
+
+def export_filename(prefix: str, fmt: str, compress: bool, now: datetime) -> str:
+    """Return a timestamped file name for an export."""
+    suffix = f".{fmt}.gz" if compress else f".{fmt}"
+    return f"{prefix}_{now.strftime('%Y%m%d_%H%M%S')}{suffix}"
+
+
+def _open(path: Path, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _select(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return record
+    selected: Dict[str, Any] = {}
+    for field in fields:
+        if field == TIME_FIELD:
+            selected[field] = datetime.fromtimestamp(record["ts"], timezone.utc).isoformat()
+        else:
+            selected[field] = record.get(field)
+    return selected
+
+
+def write_export(
+    records: Iterable[Dict[str, Any]],
+    path: Path,
+    fmt: str = FORMAT_CSV,
+    fields: Optional[Sequence[str]] = None,
+    compress: bool = False,
+) -> int:
+    """Stream ``records`` into ``path`` and return the number of rows written.
+
+    CSV needs a fixed header, so ``fields`` is required for that format; JSON
+    Lines writes whole records when ``fields`` is None. The file is written to
+    a temporary name and renamed when complete, so a failed export never leaves
+    a truncated file behind.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == FORMAT_CSV and not fields:
+        raise ValueError("CSV export requires a list of fields")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    rows = 0
+    try:
+        with _open(partial, compress) as handle:
+            if fmt == FORMAT_CSV:
+                writer = csv.DictWriter(handle, fieldnames=list(fields or ()), extrasaction="ignore")
+                writer.writeheader()
+                for record in records:
+                    writer.writerow(_select(record, fields))
+                    rows += 1
+            else:
+                for record in records:
+                    handle.write(json.dumps(_select(record, fields), separators=(",", ":")))
+                    handle.write("\n")
+                    rows += 1
+        partial.replace(path)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    return rows
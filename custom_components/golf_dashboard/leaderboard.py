@@ -0,0 +1,309 @@
+"""Live top-K leaderboards over every bay.
+
+Each ranked metric keeps a bounded heap of its K best shots (:class:`TopK`),
+so adding a shot costs O(log K) and nothing ever rescans history. The
+:class:`Leaderboard` holds one heap per metric for the current day and week,
+which are reset when the period key changes. It also holds per-bay heaps for
+each bay's open session; these are merged when read and dropped when the
+session ends. Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LEADERBOARD_SIZE = 10  # shots kept per metric and window
+DEFAULT_TARGET_YARDS = 150.0  # carry of the closest-to-target green
+
+WINDOW_SESSION = "session"
+WINDOW_DAY = "day"
+WINDOW_WEEK = "week"
+WINDOWS = (WINDOW_SESSION, WINDOW_DAY, WINDOW_WEEK)
+
+# Shot fields copied into each leaderboard entry
+ENTRY_FIELDS = (
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "ball_speed_meters_per_second",
+    "shot_quality_score",
+    "shot_name",
+    "shot_rank",
+    "club_class",
+)
+
+
+def _number(shot: Dict[str, Any], name: str) -> Optional[float]:
+    value = shot.get(name)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True)
+class RankedMetric:
+    """How one leaderboard ranks shots."""
+
+    key: str
+    field: str
+    higher_is_better: bool = True
+    absolute: bool = False  # rank by distance from zero, e.g. offline
+    target: Optional[float] = None  # rank by landing distance from (target carry, 0 offline)
+
+    def value(self, shot: Dict[str, Any]) -> Optional[float]:
+        """Return the value this metric ranks ``shot`` by, or None if it has none."""
+        value = _number(shot, self.field)
+        if value is None:
+            return None
+        if self.target is not None:
+            offline = _number(shot, "offline_distance_yards")
+            return None if offline is None else math.hypot(value - self.target, offline)
+        return abs(value) if self.absolute else value
+
+
+LEADERBOARD_METRICS: Tuple[RankedMetric, ...] = (
+    RankedMetric("longest_carry", "carry_distance_yards"),
+    RankedMetric("fastest_ball_speed", "ball_speed_meters_per_second"),
+    RankedMetric("best_quality", "shot_quality_score"),
+    RankedMetric(
+        "closest_to_target",
+        "carry_distance_yards",
+        higher_is_better=False,
+        target=DEFAULT_TARGET_YARDS,
+    ),
+)
+
+
+def period_keys(when: datetime) -> Dict[str, str]:
+    """Return the day and ISO week keys of a (local) time."""
+    year, week, _weekday = when.isocalendar()
+    return {WINDOW_DAY: when.date().isoformat(), WINDOW_WEEK: f"{year}-W{week:02d}"}
+
+
+class TopK:
+    """The ``size`` best entries by value, kept in a min-heap of rank keys.
+
+    The heap root is the worst kept entry, so a new value is compared with it
+    in O(1) and inserted in O(log K). On ties the earlier entry ranks higher.
+    """
+
+    def __init__(self, size: int = LEADERBOARD_SIZE, higher_is_better: bool = True) -> None:
+        self.size = max(1, size)
+        self.higher_is_better = higher_is_better
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = 0
+
+    def _rank(self, value: float) -> float:
+        return value if self.higher_is_better else -value
+
+    def qualifies(self, value: float) -> bool:
+        """Return True if ``value`` would enter the board."""
+        return len(self._heap) < self.size or self._rank(value) > self._heap[0][0]
+
+    def add(self, value: float, entry: Dict[str, Any]) -> bool:
+        """Offer an entry; return True if it made the board."""
+        if not self.qualifies(value):
+            return False
+        self._seq += 1
+        item = (self._rank(value), -self._seq, {**entry, "value": value})
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        else:
+            heapq.heapreplace(self._heap, item)
+        return True
+
+    def ranked(self) -> List[Tuple[float, int, Dict[str, Any]]]:
+        """Return the heap items, best first."""
+        return sorted(self._heap, reverse=True)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return the kept entries, best first."""
+        return [entry for _rank, _seq, entry in self.ranked()]
+
+    def best(self) -> Optional[Dict[str, Any]]:
+        """Return the best entry, or None while empty."""
+        return max(self._heap)[2] if self._heap else None
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._heap = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def as_dict(self) -> List[Dict[str, Any]]:
+        """Serialize the entries, best first."""
+        return self.entries()
+
+    def load(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Restore entries produced by :meth:`as_dict`."""
+        self.clear()
+        for entry in entries:
+            if isinstance(entry.get("value"), (int, float)):
+                self.add(float(entry["value"]), entry)
+
+
+class Leaderboard:
+    """Top-K boards per metric for the current sessions, day, and week."""
+
+    def __init__(
+        self,
+        metrics: Iterable[RankedMetric] = LEADERBOARD_METRICS,
+        size: int = LEADERBOARD_SIZE,
+    ) -> None:
+        self.metrics = {metric.key: metric for metric in metrics}
+        self.size = size
+        self._periods: Dict[str, str] = {}
+        self._boards: Dict[str, Dict[str, TopK]] = {
+            window: self._new_boards() for window in (WINDOW_DAY, WINDOW_WEEK)
+        }
+        # device -> (open session id, boards of that session)
+        self._sessions: Dict[str, Tuple[Optional[str], Dict[str, TopK]]] = {}
+
+    def _new_boards(self) -> Dict[str, TopK]:
+        return {
+            key: TopK(self.size, metric.higher_is_better) for key, metric in self.metrics.items()
+        }
+
+    def set_target(self, target: float) -> bool:
+        """Move every closest-to-target metric to ``target`` yards.
+
+        Boards ranked against the old target are cleared, since their values
+        no longer compare; return True if any metric moved.
+        """
+        moved = [
+            key
+            for key, metric in self.metrics.items()
+            if metric.target is not None and metric.target != target
+        ]
+        for key in moved:
+            self.metrics[key] = replace(self.metrics[key], target=target)
+            for boards in self._boards.values():
+                boards[key].clear()
+            for _session_id, boards in self._sessions.values():
+                boards[key].clear()
+        return bool(moved)
+
+    def _roll(self, periods: Dict[str, str]) -> None:
+        """Start empty day/week boards when their period has changed."""
+        for window, boards in self._boards.items():
+            period = periods.get(window)
+            if period is not None and self._periods.get(window) != period:
+                self._periods[window] = period
+                for board in boards.values():
+                    board.clear()
+
+    def add(
+        self,
+        shot: Dict[str, Any],
+        device: str,
+        session_id: Optional[str],
+        periods: Dict[str, str],
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Offer a shot to every board; return True if any board changed.
+
+        ``periods`` holds the current day and week keys (:func:`period_keys`);
+        ``extra`` is merged into the entry (device name, player, time).
+        """
+        self._roll(periods)
+        current_session, session_boards = self._sessions.get(device, (None, {}))
+        if current_session != session_id or not session_boards:
+            session_boards = self._new_boards()
+            self._sessions[device] = (session_id, session_boards)
+
+        entry: Optional[Dict[str, Any]] = None
+        changed = False
+        for key, metric in self.metrics.items():
+            value = metric.value(shot)
+            if value is None:
+                continue
+            for boards in (session_boards, self._boards[WINDOW_DAY], self._boards[WINDOW_WEEK]):
+                if not boards[key].qualifies(value):
+                    continue
+                if entry is None:
+                    entry = {name: shot.get(name) for name in ENTRY_FIELDS if shot.get(name) is not None}
+                    entry.update(device=device, session_id=session_id, **(extra or {}))
+                changed |= boards[key].add(value, entry)
+        return changed
+
+    def end_session(self, device: str) -> bool:
+        """Drop a bay's session boards; return True if it had any."""
+        return self._sessions.pop(device, None) is not None
+
+    def board(
+        self, window: str, metric: str, periods: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return a board's entries, best first.
+
+        The session board merges the open sessions of every bay. Day and week
+        boards read as empty once ``periods`` has moved past them.
+        """
+        if window == WINDOW_SESSION:
+            items = [
+                item
+                for _session_id, boards in self._sessions.values()
+                for item in boards[metric].ranked()
+            ]
+            best = heapq.nlargest(self.size, items, key=lambda item: item[0])
+            return [entry for _rank, _seq, entry in best]
+        if periods is not None and self._periods.get(window) != periods.get(window):
+            return []
+        return self._boards[window][metric].entries()
+
+    def summary(
+        self, periods: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Return every board, keyed by window then metric."""
+        return {
+            window: {metric: self.board(window, metric, periods) for metric in self.metrics}
+            for window in WINDOWS
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize every board."""
+        return {
+            "periods": dict(self._periods),
+            "targets": {
+                key: metric.target
+                for key, metric in self.metrics.items()
+                if metric.target is not None
+            },
+            "boards": {
+                window: {key: board.as_dict() for key, board in boards.items()}
+                for window, boards in self._boards.items()
+            },
+            "sessions": {
+                device: {
+                    "session_id": session_id,
+                    "boards": {key: board.as_dict() for key, board in boards.items()},
+                }
+                for device, (session_id, boards) in self._sessions.items()
+            },
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore boards produced by :meth:`as_dict`.
+
+        Metrics take back the target their boards were ranked against; a
+        later :meth:`set_target` clears them if the target has changed.
+        """
+        for key, target in (data.get("targets") or {}).items():
+            metric = self.metrics.get(key)
+            if metric is not None and metric.target is not None and isinstance(target, (int, float)):
+                self.metrics[key] = replace(metric, target=float(target))
+        self._periods = dict(data.get("periods") or {})
+        for window, stored in (data.get("boards") or {}).items():
+            for key, entries in stored.items():
+                if window in self._boards and key in self._boards[window]:
+                    self._boards[window][key].load(entries)
+        self._sessions = {}
+        for device, stored in (data.get("sessions") or {}).items():
+            boards = self._new_boards()
+            for key, entries in (stored.get("boards") or {}).items():
+                if key in boards:
+                    boards[key].load(entries)
+            self._sessions[device] = (stored.get("session_id"), boards)
@@ -0,0 +1,164 @@
+"""Streaming outlier and mishit detection for Golf Dashboard.
+
+A shot is flagged when ``derived.py`` classifies it as a mishit (chunk, worm
+burner, or shank), or when one of its metrics is far from the recent shots of
+the same learned club. "Far" is the modified z-score of Iglewicz and Hoaglin,
+``0.6745 * |x - median| / MAD``, over the club's last :data:`OUTLIER_WINDOW`
+values. Median and MAD are robust: a few bad shots in the window barely move
+them, where they would drag a mean and standard deviation along.
+
+Each window is a sorted list of bounded length, so a shot costs
+O(:data:`OUTLIER_WINDOW`) work whatever the history length. Flagged shots
+still enter the window (mishits excepted), which lets the baseline follow a
+genuine change such as a new swing. Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+MISHIT_NAMES = frozenset({"Chunk", "Worm Burner", "Right Shank", "Left Shank"})
+REASON_MISHIT = "mishit"
+
+OUTLIER_METRICS: Tuple[str, ...] = ("carry_distance_yards", "ball_speed_meters_per_second")
+OUTLIER_WINDOW = 30  # recent values per club and metric
+OUTLIER_MIN_SHOTS = 10  # values needed before a club's shots can be flagged
+OUTLIER_THRESHOLD = 3.5  # modified z-score above which a value is an outlier
+MAD_SCALE = 0.6745  # makes the MAD comparable to a standard deviation for normal data
+
+
+class RobustWindow:
+    """Median and median absolute deviation of the last ``size`` values."""
+
+    def __init__(self, size: int = OUTLIER_WINDOW) -> None:
+        self.size = max(1, size)
+        self._values: Deque[float] = deque()
+        self._sorted: List[float] = []
+
+    def add(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full."""
+        if len(self._values) >= self.size:
+            del self._sorted[bisect_left(self._sorted, self._values.popleft())]
+        self._values.append(value)
+        insort(self._sorted, value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def median(self) -> Optional[float]:
+        """Return the median of the window, or None when empty."""
+        values, count = self._sorted, len(self._sorted)
+        if not count:
+            return None
+        middle = count // 2
+        return values[middle] if count % 2 else (values[middle - 1] + values[middle]) / 2
+
+    def mad(self) -> Optional[float]:
+        """Return the median absolute deviation from the median.
+
+        The deviations of a sorted window grow outward from the median, so the
+        smaller half of them is found by walking two pointers, without sorting.
+        """
+        median = self.median()
+        if median is None:
+            return None
+        values, count = self._sorted, len(self._sorted)
+        below = bisect_left(values, median) - 1
+        above = below + 1
+        deviations: List[float] = []
+        while len(deviations) <= count // 2:
+            if above >= count or (below >= 0 and median - values[below] <= values[above] - median):
+                deviations.append(median - values[below])
+                below -= 1
+            else:
+                deviations.append(values[above] - median)
+                above += 1
+        middle = count // 2
+        return deviations[middle] if count % 2 else (deviations[middle - 1] + deviations[middle]) / 2
+
+    def score(self, value: float) -> Optional[float]:
+        """Return the modified z-score of a value, or None when the window is flat."""
+        median, mad = self.median(), self.mad()
+        if median is None or not mad:
+            return None
+        return MAD_SCALE * abs(value - median) / mad
+
+    def values(self) -> List[float]:
+        """Return the window contents, oldest first (used for persistence)."""
+        return list(self._values)
+
+
+class OutlierDetector:
+    """Flag mishits and outlying shots against per-club robust windows."""
+
+    def __init__(
+        self,
+        metrics: Iterable[str] = OUTLIER_METRICS,
+        size: int = OUTLIER_WINDOW,
+        min_shots: int = OUTLIER_MIN_SHOTS,
+        threshold: float = OUTLIER_THRESHOLD,
+    ) -> None:
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self.size = size
+        self.min_shots = min_shots
+        self.threshold = threshold
+        self._windows: Dict[str, Dict[str, RobustWindow]] = {}
+
+    def _segment(self, segment: str) -> Dict[str, RobustWindow]:
+        windows = self._windows.get(segment)
+        if windows is None:
+            windows = self._windows[segment] = {
+                metric: RobustWindow(self.size) for metric in self.metrics
+            }
+        return windows
+
+    def check(self, segment: Optional[str], shot: Dict[str, Any]) -> Optional[str]:
+        """Flag a shot and learn from it.
+
+        Returns ``"mishit"``, the first metric whose value is an outlier for the
+        club ``segment``, or None. Shots without a club are only checked for
+        mishits.
+        """
+        if shot.get("shot_name") in MISHIT_NAMES:
+            return REASON_MISHIT
+        if segment is None:
+            return None
+        reason: Optional[str] = None
+        for metric, window in self._segment(segment).items():
+            value = _as_number(shot.get(metric))
+            if value is None:
+                continue
+            if reason is None and len(window) >= self.min_shots:
+                score = window.score(value)
+                if score is not None and score > self.threshold:
+                    reason = metric
+            window.add(value)
+        return reason
+
+    def absorb(self, source: str, target: str) -> None:
+        """Drop the windows of a club merged into ``target``, which keeps its own."""
+        self._windows.pop(source, None)
+
+    def as_dict(self) -> Dict[str, Dict[str, List[float]]]:
+        """Serialize the window contents per club and metric."""
+        return {
+            segment: {metric: window.values() for metric, window in windows.items()}
+            for segment, windows in self._windows.items()
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Replay window contents produced by :meth:`as_dict`."""
+        for segment, metrics in data.items():
+            windows = self._segment(segment)
+            for metric, values in (metrics or {}).items():
+                window = windows.get(metric)
+                if window is not None:
+                    for value in values:
+                        window.add(float(value))
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
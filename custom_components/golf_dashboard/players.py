@@ -0,0 +1,199 @@
+"""Per-player analytics state for Golf Dashboard.
+
+A bay is often shared, so the learned clubs, rolling and session statistics,
+"last N shots" windows, quantile sketches, and dispersion aggregates are kept
+per player in a
+:class:`PlayerAnalytics`. Only recently active players are held in memory: a
+:class:`PlayerCache` evicts the least recently used one, and the coordinator
+persists evicted state and reloads it lazily on the player's next shot.
+Pure Python, no Home Assistant imports.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .analytics import RollingStatistics, RunningStats, ShotWindows
+from .clusters import ClubClusterer
+from .dispersion import ClubDispersion
+from .outliers import OutlierDetector
+from .sketch import ClubDistributions
+
+DEFAULT_PLAYER = "Guest"
+PLAYER_CACHE_SIZE = 4  # players whose analytics stay in memory
+SEGMENT_FIELD = "club_cluster"
+
+
+class PlayerAnalytics:
+    """Every per-player aggregate, updated together for each shot."""
+
+    def __init__(
+        self,
+        consistency_metrics: Iterable[str],
+        window_size: int,
+        distribution_metrics: Iterable[str],
+        shot_windows: Iterable[int] = (),
+    ) -> None:
+        self.consistency_metrics = tuple(consistency_metrics)
+        self.distribution_metrics = tuple(distribution_metrics)
+        self.recent = RollingStatistics(self.consistency_metrics, window_size)
+        # Not persisted: the coordinator seeds them from the player's stored shots
+        self.windows = ShotWindows(shot_windows)
+        self.clusters = ClubClusterer()
+        self.distributions = ClubDistributions(self.distribution_metrics, segment_field=SEGMENT_FIELD)
+        self.dispersion = ClubDispersion(segment_field=SEGMENT_FIELD)
+        self.outliers = OutlierDetector()
+        # Aggregates of this player's shots in the current bay session
+        self.session_id: Optional[str] = None
+        self.session_stats: Dict[str, RunningStats] = {}
+        self.session_distributions = self._new_distributions()
+
+    def _new_distributions(self) -> ClubDistributions:
+        return ClubDistributions(self.distribution_metrics, segment_field=SEGMENT_FIELD)
+
+    def check_outlier(self, shot: Dict[str, Any]) -> Optional[str]:
+        """Return why a shot is a mishit or outlier for its learned club, or None."""
+        return self.outliers.check(self.clusters.match(shot), shot)
+
+    def add_shot(
+        self, shot: Dict[str, Any], session_id: Optional[str], aggregate: bool = True
+    ) -> Optional[Tuple[str, str]]:
+        """Tag a shot with its learned club and fold it into every aggregate.
+
+        With ``aggregate=False`` (an excluded outlier) the shot is only tagged
+        with the club it falls into; no cluster, statistic, or sketch learns from it.
+        Returns ``(absorbed, kept)`` when making room merged two clubs, so the
+        caller can retag stored shots of the absorbed one.
+        """
+        if session_id != self.session_id:
+            self._roll_session(session_id)
+        if not aggregate:
+            cluster_id = self.clusters.match(shot)
+            if cluster_id is not None:
+                shot[SEGMENT_FIELD] = cluster_id
+            return None
+        cluster_id, merged = self.clusters.assign(shot)
+        if cluster_id is not None:
+            shot[SEGMENT_FIELD] = cluster_id
+        if merged is not None:
+            absorbed, kept = merged
+            for aggregates in (
+                self.distributions, self.session_distributions, self.dispersion, self.outliers
+            ):
+                aggregates.absorb(absorbed, kept)
+
+        self.recent.add(shot)
+        for name in self.consistency_metrics:
+            value = shot.get(name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.session_stats.setdefault(name, RunningStats()).add(float(value))
+        self.session_distributions.add(shot)
+        self.dispersion.add(shot)
+        self.windows.add(shot)
+        return merged
+
+    def _roll_session(self, session_id: Optional[str]) -> None:
+        """Fold the previous session's sketches into the lifetime ones and start afresh."""
+        self.distributions.merge(self.session_distributions)
+        self.session_distributions = self._new_distributions()
+        self.session_stats = {}
+        self.session_id = session_id
+
+    def session_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Return mean/stddev/min/max per metric for this player's session shots."""
+        return {name: stats.summary() for name, stats in self.session_stats.items()}
+
+    def distribution_view(self, scope: str = "all") -> ClubDistributions:
+        """Return a merged copy of the session or all-time sketches."""
+        if scope == "session":
+            return ClubDistributions.merged([self.session_distributions])
+        return ClubDistributions.merged([self.distributions, self.session_distributions])
+
+    def club_distribution(self, club: Optional[str], metrics: Iterable[str]) -> Dict[str, Any]:
+        """Return all-time percentiles of one learned club."""
+        if not isinstance(club, str):
+            return {}
+        merged = ClubDistributions.merged(
+            [self.distributions, self.session_distributions], segments=[club]
+        )
+        return {SEGMENT_FIELD: club, **merged.summary(club, tuple(metrics))}
+
+    def club_dispersion(self, club: Optional[str]) -> Dict[str, Any]:
+        """Return the dispersion ellipses of one learned club."""
+        if not isinstance(club, str):
+            return {}
+        return {SEGMENT_FIELD: club, **self.dispersion.summary(club, include_grid=False)}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize every aggregate."""
+        return {
+            "recent": self.recent.as_dict(),
+            "clusters": self.clusters.as_dict(),
+            "distributions": self.distributions.as_dict(),
+            "dispersion": self.dispersion.as_dict(),
+            "session_id": self.session_id,
+            "session_stats": {name: stats.as_dict() for name, stats in self.session_stats.items()},
+            "session_distributions": self.session_distributions.as_dict(),
+            "outliers": self.outliers.as_dict(),
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Restore aggregates produced by :meth:`as_dict`."""
+        self.recent.load(data.get("recent") or {})
+        self.clusters.load(data.get("clusters") or {})
+        self.distributions.load(data.get("distributions") or {})
+        self.dispersion.load(data.get("dispersion") or {})
+        self.session_id = data.get("session_id")
+        self.session_stats = {
+            name: RunningStats.from_dict(stats)
+            for name, stats in (data.get("session_stats") or {}).items()
+        }
+        self.session_distributions.load(data.get("session_distributions") or {})
+        self.outliers.load(data.get("outliers") or {})
+
+
+class PlayerCache:
+    """Least-recently-used map of player name to in-memory analytics."""
+
+    def __init__(self, maxsize: int = PLAYER_CACHE_SIZE) -> None:
+        self.maxsize = max(1, maxsize)
+        self._items: "OrderedDict[str, PlayerAnalytics]" = OrderedDict()
+
+    def get(self, player: str) -> Optional[PlayerAnalytics]:
+        """Return a player's analytics and mark it as recently used."""
+        analytics = self._items.get(player)
+        if analytics is not None:
+            self._items.move_to_end(player)
+        return analytics
+
+    def put(
+        self, player: str, analytics: PlayerAnalytics, pinned: Optional[str] = None
+    ) -> List[Tuple[str, PlayerAnalytics]]:
+        """Insert a player and return the entries evicted to stay within ``maxsize``.
+
+        The ``pinned`` player (the active one) is never evicted.
+        """
+        self._items[player] = analytics
+        self._items.move_to_end(player)
+        evicted: List[Tuple[str, PlayerAnalytics]] = []
+        for name in list(self._items):
+            if len(self._items) <= self.maxsize:
+                break
+            if name in (player, pinned):
+                continue
+            evicted.append((name, self._items.pop(name)))
+        return evicted
+
+    def pop(self, player: str) -> Optional[PlayerAnalytics]:
+        """Remove a player from the cache."""
+        return self._items.pop(player, None)
+
+    def __contains__(self, player: object) -> bool:
+        return player in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def items(self) -> Iterator[Tuple[str, PlayerAnalytics]]:
+        """Iterate over cached players, least recently used first."""
+        return iter(list(self._items.items()))
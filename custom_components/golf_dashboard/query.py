@@ -0,0 +1,234 @@
+"""Filtered queries over the shot store.
+
+A :class:`ShotQuery` combines equality filters on indexed columns (device,
+player, club class, learned club, session, shot rank, shot name), a time range,
+and ranges on any metric. :func:`plan` picks how to answer it:
+
+* ``rollup`` — only aggregates were requested and every filter is a rollup
+  dimension on bucket-aligned times, so a few pre-aggregated rows are summed;
+* ``aggregate`` — aggregates computed in SQL over the indexed, filtered rows;
+* ``rows`` — matching shots, newest first, with an opaque ``[ts, id]`` cursor.
+
+Every plan leaves out excluded outliers, as the rollups do. Row and SQL
+aggregate queries read live shots only: archived shots keep just their raw
+inputs, so those plans report how many archived shots fall in the filtered
+range (``archived_shots``) instead of silently returning a different total
+than the rollups would. Learned club ids are per player, so a ``club_cluster``
+filter needs ``player``. Pure Python; the integration runs :func:`run_query`
+in the executor.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .shot_store import (
+    ALL_CLUBS,
+    EXCLUDED_FIELD,
+    GRANULARITIES,
+    ROLLUP_METRICS,
+    ShotStore,
+    rollup_summary,
+)
+
+PLAN_ROLLUP = "rollup"
+PLAN_AGGREGATE = "aggregate"
+PLAN_ROWS = "rows"
+
+DEFAULT_LIMIT = 100
+
+# Metric names become JSON paths, so only plain identifiers are accepted.
+_METRIC_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass
+class ShotQuery:
+    """Filters, projection, and paging for one shot store query."""
+
+    device: Optional[str] = None
+    player: Optional[str] = None
+    start_ts: Optional[float] = None
+    end_ts: Optional[float] = None
+    session_id: Optional[str] = None
+    club: Optional[str] = None  # club class
+    club_cluster: Optional[str] = None
+    shot_rank: Sequence[str] = ()
+    shot_name: Sequence[str] = ()
+    ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = field(default_factory=dict)
+    fields: Sequence[str] = ()
+    aggregate: Sequence[str] = ()  # metrics to summarize instead of returning rows
+    limit: int = DEFAULT_LIMIT
+    before: Optional[Tuple[float, int]] = None  # cursor from the previous page
+
+    def __post_init__(self) -> None:
+        if self.club_cluster is not None and self.player is None:
+            raise ValueError("A learned club filter needs a player; club ids are per player")
+        for name in (*self.ranges, *self.aggregate):
+            if not _METRIC_NAME.match(name):
+                raise ValueError(f"Invalid metric name {name!r}")
+
+
+def _aligned(ts: Optional[float], size: int) -> bool:
+    return ts is None or ts % size == 0
+
+
+def plan(query: ShotQuery) -> Tuple[str, Optional[str]]:
+    """Return ``(plan, granularity)``; granularity is set only for rollup plans."""
+    if not query.aggregate:
+        return PLAN_ROWS, None
+    if (
+        set(query.aggregate) <= set(ROLLUP_METRICS)
+        and query.session_id is None
+        and query.club_cluster is None
+        and not query.shot_rank
+        and not query.shot_name
+        and not query.ranges
+    ):
+        # Coarsest buckets whose boundaries match the requested range.
+        for granularity, size in sorted(GRANULARITIES.items(), key=lambda item: -item[1]):
+            if _aligned(query.start_ts, size) and _aligned(query.end_ts, size):
+                return PLAN_ROLLUP, granularity
+    return PLAN_AGGREGATE, None
+
+
+def _metric(name: str) -> str:
+    return f"json_extract(data, '$.{name}')"
+
+
+def _indexed_filters(query: ShotQuery) -> Tuple[List[str], List[Any]]:
+    """Return the clauses on columns shared by the shot and archive tables."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column, value in (
+        ("device", query.device),
+        ("player", query.player),
+        ("club_cluster", query.club_cluster),
+        ("club", query.club),
+        ("session_id", query.session_id),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if query.start_ts is not None:
+        clauses.append("ts >= ?")
+        params.append(query.start_ts)
+    if query.end_ts is not None:
+        clauses.append("ts < ?")
+        params.append(query.end_ts)
+    return clauses, params
+
+
+def _shot_filters(query: ShotQuery) -> Tuple[str, List[Any]]:
+    """Build the WHERE clause for shot rows; indexed columns come first."""
+    clauses, params = _indexed_filters(query)
+    # Excluded outliers stay out of every plan, as they stay out of the rollups
+    clauses.append(f"COALESCE({_metric(EXCLUDED_FIELD)}, 0) = 0")
+    for column, values in (("shot_rank", query.shot_rank), ("shot_name", query.shot_name)):
+        if values:
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+    for name, (low, high) in query.ranges.items():
+        if low is not None:
+            clauses.append(f"{_metric(name)} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{_metric(name)} <= ?")
+            params.append(high)
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _archived_shots(store: ShotStore, query: ShotQuery) -> int:
+    """Count archived, non-excluded shots matching the indexed filters.
+
+    Rank, shape, and metric ranges are derived, so with those filters the
+    count is an upper bound of the archived shots a plan leaves out.
+    """
+    clauses, params = _indexed_filters(query)
+    clauses.append(f"{EXCLUDED_FIELD} = 0")
+    rows = store.select(f"SELECT COUNT(*) FROM archive WHERE {' AND '.join(clauses)}", params)
+    return rows[0][0]
+
+
+def _query_rows(store: ShotStore, query: ShotQuery) -> Dict[str, Any]:
+    where, params = _shot_filters(query)
+    if query.before is not None:
+        ts, row_id = query.before
+        where += " AND (ts < ? OR (ts = ? AND id < ?))"
+        params += [ts, ts, row_id]
+    rows = store.select(
+        f"SELECT id, ts, data FROM shots{where} ORDER BY ts DESC, id DESC LIMIT ?",
+        [*params, query.limit + 1],
+    )
+    more = len(rows) > query.limit
+    rows = rows[: query.limit]
+    shots = []
+    for row in rows:
+        record = json.loads(row["data"])
+        if query.fields:
+            record = {name: record.get(name) for name in ("ts", *query.fields)}
+        shots.append(record)
+    cursor = [rows[-1]["ts"], rows[-1]["id"]] if more else None
+    return {"shots": shots, "next_cursor": cursor, "archived_shots": _archived_shots(store, query)}
+
+
+def _query_aggregate(store: ShotStore, query: ShotQuery) -> Dict[str, Any]:
+    where, params = _shot_filters(query)
+    selects = []
+    for name in query.aggregate:
+        value = _metric(name)
+        selects.append(
+            f"COUNT({value}), SUM({value}), SUM({value} * {value}), MIN({value}), MAX({value})"
+        )
+    row = store.select(f"SELECT COUNT(*), {', '.join(selects)} FROM shots{where}", params)[0]
+    statistics: Dict[str, Any] = {}
+    for index, name in enumerate(query.aggregate):
+        count, total, total_sq, minimum, maximum = row[1 + index * 5 : 6 + index * 5]
+        if count:
+            statistics[name] = rollup_summary(count, total, total_sq, minimum, maximum)
+    return {
+        "shots": row[0],
+        "statistics": statistics,
+        "archived_shots": _archived_shots(store, query),
+    }
+
+
+def _query_rollups(store: ShotStore, query: ShotQuery, granularity: str) -> Dict[str, Any]:
+    clauses = ["granularity = ?", "club = ?"]
+    params: List[Any] = [granularity, query.club or ALL_CLUBS]
+    for column, value in (("device", query.device), ("player", query.player)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    clauses.append(f"metric IN ({','.join('?' * len(query.aggregate))})")
+    params.extend(query.aggregate)
+    if query.start_ts is not None:
+        clauses.append("bucket >= ?")
+        params.append(query.start_ts)
+    if query.end_ts is not None:
+        clauses.append("bucket < ?")
+        params.append(query.end_ts)
+    rows = store.select(
+        "SELECT metric, SUM(count), SUM(total), SUM(total_sq), MIN(minimum), MAX(maximum) "
+        f"FROM rollups WHERE {' AND '.join(clauses)} GROUP BY metric",
+        params,
+    )
+    statistics = {row[0]: rollup_summary(*row[1:]) for row in rows}
+    return {
+        "shots": max((summary["count"] for summary in statistics.values()), default=0),
+        "statistics": statistics,
+    }
+
+
+def run_query(store: ShotStore, query: ShotQuery) -> Dict[str, Any]:
+    """Plan and run a query; the result names the plan that answered it."""
+    chosen, granularity = plan(query)
+    if chosen == PLAN_ROLLUP:
+        assert granularity is not None
+        result = _query_rollups(store, query, granularity)
+    elif chosen == PLAN_AGGREGATE:
+        result = _query_aggregate(store, query)
+    else:
+        result = _query_rows(store, query)
+    return {"plan": chosen, **result}
@@ -0,0 +1,53 @@
+"""Recompute stored shots after the derived-metric model changes.
+
+Stored shots are stamped with the ``DERIVED_MODEL_VERSION`` they were computed
+with. :func:`recompute_chunk` brings one chunk of outdated rows up to date; the
+integration calls it repeatedly from the executor with a pause in between, so
+the job is throttled, reports progress, and resumes after a restart simply by
+picking up the rows that are still outdated.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from .derived import DERIVED_MODEL_VERSION
+from .shot_import import RAW_FIELDS, derive_records
+from .shot_store import ShotStore
+
+RECOMPUTE_CHUNK_SIZE = 200
+
+
+def recompute_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return copies of ``records`` with derived metrics from the current model.
+
+    Records missing ball speed or launch angle cannot be recomputed; they are
+    only re-stamped so the job does not revisit them.
+    """
+    updated = [dict(record) for record in records]
+    recomputable = [
+        record
+        for record in updated
+        if record.get("ball_speed_meters_per_second") is not None
+        and record.get("vertical_launch_angle_degrees") is not None
+    ]
+    inputs = [{**record, **{name: record.get(name) for name in RAW_FIELDS}} for record in recomputable]
+    for record, fresh in zip(recomputable, derive_records(inputs)):
+        record.update(fresh)
+    for record in updated:
+        record["model_version"] = DERIVED_MODEL_VERSION
+    return updated
+
+
+def recompute_chunk(
+    store: ShotStore, after_id: int = 0, limit: int = RECOMPUTE_CHUNK_SIZE
+) -> Tuple[int, int]:
+    """Recompute one chunk of outdated rows.
+
+    Returns ``(rows_updated, last_id)``; zero rows means the job is complete.
+    """
+    rows = store.outdated(DERIVED_MODEL_VERSION, after_id, limit)
+    if not rows:
+        return 0, after_id
+    updated = recompute_records([record for _, record in rows])
+    store.update_many(zip((row_id for row_id, _ in rows), updated))
+    return len(rows), rows[-1][0]
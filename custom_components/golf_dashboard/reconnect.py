@@ -0,0 +1,97 @@
+"""Reconnect scheduling for many launch monitors.
+
+A :class:`ReconnectSchedule` tracks when each disconnected device should next
+be dialled. Delays grow exponentially per failed attempt up to a cap and are
+jittered, first attempts are spread over a stagger window, and :meth:`due`
+hands out at most a fixed number of devices per tick. Together this keeps a
+facility-wide network outage from turning into a synchronized reconnect storm.
+Pure Python, no Home Assistant imports; times are caller-supplied monotonic
+seconds.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional
+
+DEFAULT_BASE_DELAY = 10.0  # seconds before the first retry
+DEFAULT_MAX_DELAY = 300.0  # cap on the backoff
+DEFAULT_STAGGER = 5.0  # window over which first attempts are spread
+
+
+class ReconnectSchedule:
+    """Next attempt time and failure count per disconnected device.
+
+    A device is either scheduled (waiting for its next attempt), in flight
+    (returned by :meth:`due` and not yet reported back), or connected.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        stagger: float = DEFAULT_STAGGER,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.stagger = stagger
+        self._rng = rng or random.Random()
+        self._due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+
+    def add(self, device: str, now: float) -> None:
+        """Schedule a device's first attempt somewhere in the stagger window."""
+        self._failures[device] = 0
+        self._due[device] = now + self._rng.uniform(0.0, self.stagger)
+
+    def failed(self, device: str, now: float) -> float:
+        """Record a failed attempt or a dropped connection; return the delay.
+
+        The delay doubles per consecutive failure up to ``max_delay``. Half of
+        it is random, so devices that dropped together retry apart.
+        """
+        failures = self._failures.get(device, 0)
+        self._failures[device] = failures + 1
+        delay = min(self.max_delay, self.base_delay * 2 ** failures)
+        delay = delay / 2 + self._rng.uniform(0.0, delay / 2)
+        self._due[device] = now + delay
+        return delay
+
+    def succeeded(self, device: str) -> None:
+        """Record a successful connection and reset the device's backoff."""
+        self._failures[device] = 0
+        self._due.pop(device, None)
+
+    def remove(self, device: str) -> None:
+        """Forget a device entirely."""
+        self._due.pop(device, None)
+        self._failures.pop(device, None)
+
+    def due(self, now: float, limit: Optional[int] = None) -> List[str]:
+        """Return up to ``limit`` devices whose attempt is due, earliest first.
+
+        Returned devices are in flight until :meth:`failed` or
+        :meth:`succeeded` is called; the rest stay due for the next tick.
+        """
+        ready = sorted(
+            (when, device) for device, when in self._due.items() if when <= now
+        )
+        if limit is not None:
+            ready = ready[: max(0, limit)]
+        for _when, device in ready:
+            del self._due[device]
+        return [device for _when, device in ready]
+
+    def next_due(self) -> Optional[float]:
+        """Return the earliest scheduled attempt, or None if nothing waits."""
+        return min(self._due.values(), default=None)
+
+    def failures(self, device: str) -> int:
+        """Return the consecutive failed attempts of a device."""
+        return self._failures.get(device, 0)
+
+    def __contains__(self, device: object) -> bool:
+        return device in self._due
+
+    def __len__(self) -> int:
+        return len(self._due)
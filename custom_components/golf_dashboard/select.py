@@ -0,0 +1,99 @@
+"""Select platform for the Golf Dashboard integration."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import (
+    CONF_NAME,
+    CONF_MANUFACTURER,
+    CONF_MODEL,
+    CONF_SERIAL,
+    DOMAIN,
+)
+from .coordinator import GolfDashboardCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Golf Dashboard selects from a config entry."""
+    coordinator: GolfDashboardCoordinator = hass.data[DOMAIN][entry.entry_id]
+    name = entry.data[CONF_NAME]
+
+    async_add_entities([GolfDashboardPlayerSelect(coordinator, entry, name)])
+
+
+class GolfDashboardPlayerSelect(
+    CoordinatorEntity[GolfDashboardCoordinator], SelectEntity
+):
+    """Select choosing the player new shots are attributed to.
+
+    Options are the known players; new names are added with the
+    ``golf_dashboard.set_player`` service.
+    """
+
+    _attr_has_entity_name = True
+    _attr_name = "Player"
+    _attr_icon = "mdi:account-switch"
+
+    def __init__(
+        self,
+        coordinator: GolfDashboardCoordinator,
+        entry: ConfigEntry,
+        name: str,
+    ) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_player"
+        self._device_name = name
+        self._entry = entry
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info."""
+        fw_version = self.coordinator.status_data.get("firmware_version")
+
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry.entry_id)},
+            name=self._device_name,
+            manufacturer=self._entry.data.get(CONF_MANUFACTURER, "Open Launch"),
+            model=self._entry.data.get(CONF_MODEL, "NOVA"),
+            serial_number=self._entry.data.get(CONF_SERIAL),
+            sw_version=fw_version,
+        )
+
+    @property
+    def options(self) -> list[str]:
+        """Return the known players."""
+        return list(self.coordinator.players)
+
+    @property
+    def current_option(self) -> str:
+        """Return the active player."""
+        return self.coordinator.player
+
+    @property
+    def available(self) -> bool:
+        """Return True - the player can be chosen while disconnected."""
+        return True
+
+    async def async_select_option(self, option: str) -> None:
+        """Attribute new shots to the chosen player."""
+        await self.coordinator.async_set_player(option)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self.coordinator.data and self.coordinator.data.get("type") == "player":
+            self.async_write_ha_state()
@@ -8,22 +8,67 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ALL_SENSORS,
+    BEST_SHOT_SENSORS,
     CONF_NAME,
     CONF_MANUFACTURER,
     CONF_MODEL,
     CONF_SERIAL,
+    CLUB_CLUSTER_SENSOR,
+    DATA_SUPERVISOR,
+    DISPERSION_SENSOR,
+    DISTRIBUTION_SENSORS,
     DOMAIN,
+    LAST_SESSION_SENSOR,
+    LEADERBOARD_SENSORS,
+    SESSION_SENSORS,
+    SHOT_SUMMARY_SENSOR,
+    SIGNAL_LEADERBOARD_UPDATED,
+    STATISTICS_SENSORS,
     GolfDashboardSensorEntityDescription,
+    shot_window_sensors,
 )
 from .coordinator import GolfDashboardCoordinator
+from .supervisor import ConnectionSupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
+# Coordinator property holding the latest data for each message type
+_CACHED_DATA = {
+    "shot": "shot_data",
+    "status": "status_data",
+    "session": "session_data",
+    "session_summary": "last_session",
+    "session_statistics": "session_statistics",
+    "recent_statistics": "recent_statistics",
+    "distribution": "distribution_data",
+    "dispersion": "dispersion_data",
+}
+
+# Aggregates that can become empty (e.g. after a player change); their sensors
+# clear instead of keeping the previous value
+_AGGREGATE_TYPES = frozenset(
+    {"session_statistics", "recent_statistics", "distribution", "dispersion"}
+)
+
+
+def _update_data(update: dict[str, Any] | None, message_type: str | None) -> dict[str, Any] | None:
+    """Return what a coordinator update carries for ``message_type``, if anything.
+
+    A shot or player change is published as one update; the aggregates it
+    refreshed ride along under ``aggregates``, keyed by message type.
+    """
+    if not update or message_type is None:
+        return None
+    if update.get("type") == message_type:
+        return update.get("data", {})
+    return (update.get("aggregates") or {}).get(message_type)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,11 +81,52 @@ async def async_setup_entry(
 
     entities = [
         GolfDashboardSensor(coordinator, description, entry, name)
-        for description in ALL_SENSORS
+        for description in (*ALL_SENSORS, *SESSION_SENSORS)
     ]
-
+    entities.append(GolfDashboardLastSessionSensor(coordinator, LAST_SESSION_SENSOR, entry, name))
+    entities.extend(
+        GolfDashboardStatisticsSensor(coordinator, description, entry, name)
+        for description in STATISTICS_SENSORS
+    )
+    entities.extend(
+        GolfDashboardDistributionSensor(coordinator, description, entry, name)
+        for description in DISTRIBUTION_SENSORS
+    )
+    entities.append(GolfDashboardDispersionSensor(coordinator, DISPERSION_SENSOR, entry, name))
+    entities.append(GolfDashboardClubClusterSensor(coordinator, CLUB_CLUSTER_SENSOR, entry, name))
+    entities.extend(
+        GolfDashboardBestShotSensor(coordinator, description, entry, name)
+        for description in BEST_SHOT_SENSORS
+    )
+    entities.extend(
+        GolfDashboardShotWindowSensor(coordinator, description, entry, name)
+        for description in shot_window_sensors(coordinator.shot_window_sizes)
+    )
+    if coordinator.compact_publish:
+        entities.append(
+            GolfDashboardShotSummarySensor(coordinator, SHOT_SUMMARY_SENSOR, entry, name)
+        )
     async_add_entities(entities)
 
+    # Facility-wide leaderboards live on one loaded entry at a time; the
+    # supervisor calls back into whichever entry currently holds them
+    supervisor: ConnectionSupervisor = hass.data[DATA_SUPERVISOR]
+
+    @callback
+    def _async_add_leaderboard_sensors() -> None:
+        async_add_entities(
+            [
+                GolfDashboardLeaderboardSensor(supervisor, description)
+                for description in LEADERBOARD_SENSORS
+            ]
+        )
+
+    entry.async_on_unload(
+        supervisor.async_register_leaderboard_platform(
+            entry.entry_id, _async_add_leaderboard_sensors
+        )
+    )
+
 
 class GolfDashboardSensor(
     CoordinatorEntity[GolfDashboardCoordinator], SensorEntity
@@ -103,24 +189,29 @@ class GolfDashboardSensor(
 
         return value
 
+    def _extract_value(self, data: dict[str, Any]) -> Any:
+        """Return this sensor's raw value from a coordinator data dict."""
+        description = self.entity_description
+        value = data.get(description.json_key)
+        if description.statistic is not None:
+            return value.get(description.statistic) if isinstance(value, dict) else None
+        return value
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if not self.coordinator.data:
-            return
-
-        update_info = self.coordinator.data
-        msg_type = update_info.get("type")
-        data = update_info.get("data", {})
-
         description = self.entity_description
+        data = _update_data(self.coordinator.data, description.message_type)
 
-        # Only update if this sensor matches the message type
-        if description.message_type == msg_type and description.json_key:
-            value = data.get(description.json_key)
+        # Only update if this update carries the sensor's message type
+        if data is not None and description.json_key:
+            value = self._extract_value(data)
             if value is not None:
                 self._attr_native_value = self._apply_transforms(value)
                 self.async_write_ha_state()
+            elif description.message_type in _AGGREGATE_TYPES:
+                self._attr_native_value = None
+                self.async_write_ha_state()
 
     @property
     def native_value(self) -> Any:
@@ -128,13 +219,208 @@ class GolfDashboardSensor(
         # On first load, check if we have cached data
         if self._attr_native_value is None:
             description = self.entity_description
-            if description.message_type == "shot" and description.json_key:
-                value = self.coordinator.shot_data.get(description.json_key)
-                if value is not None:
-                    self._attr_native_value = self._apply_transforms(value)
-            elif description.message_type == "status" and description.json_key:
-                value = self.coordinator.status_data.get(description.json_key)
+            cached = _CACHED_DATA.get(description.message_type or "")
+            if cached and description.json_key:
+                value = self._extract_value(getattr(self.coordinator, cached))
                 if value is not None:
                     self._attr_native_value = self._apply_transforms(value)
 
         return self._attr_native_value
+
+
+class GolfDashboardShotSummarySensor(GolfDashboardSensor):
+    """One entity carrying the whole shot as a compact attribute payload.
+
+    Used by the compact publish mode so a shot costs a single recorder row; the
+    per-metric sensors can then be excluded from the recorder.
+    """
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the latest shot keyed by sensor key."""
+        return self.coordinator.compact_shot_payload()
+
+
+class GolfDashboardLastSessionSensor(GolfDashboardSensor):
+    """Shot count of the last closed session, with its full summary as attributes."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the summary of the last closed session."""
+        return self.coordinator.last_session
+
+
+class GolfDashboardStatisticsSensor(GolfDashboardSensor):
+    """Standard deviation of one metric, with count/mean/min/max as attributes."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the full statistics of this sensor's metric."""
+        description = self.entity_description
+        cached = _CACHED_DATA[description.message_type or ""]
+        stats = getattr(self.coordinator, cached).get(description.json_key) or {}
+        precision = description.precision
+        return {
+            key: round(value, precision) if isinstance(value, float) and precision is not None else value
+            for key, value in stats.items()
+            if key != description.statistic
+        }
+
+
+class GolfDashboardDistributionSensor(GolfDashboardStatisticsSensor):
+    """One percentile of a metric for the learned club of the last shot."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the other percentiles and the club they describe."""
+        return {
+            "club_cluster": self.coordinator.distribution_data.get("club_cluster"),
+            **super().extra_state_attributes,
+        }
+
+
+class GolfDashboardDispersionSensor(GolfDashboardSensor):
+    """2σ dispersion area of the last shot's club, with the ellipses as attributes."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the landing centre and 1σ/2σ ellipses."""
+        return {
+            key: value
+            for key, value in self.coordinator.dispersion_data.items()
+            if key != self.entity_description.json_key
+        }
+
+
+class GolfDashboardClubClusterSensor(GolfDashboardSensor):
+    """Learned club of the last shot, with the club's centre as attributes."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the centre (speed, launch, spin) and shot count of the club."""
+        return self.coordinator.club_cluster(self._attr_native_value)
+
+
+class GolfDashboardBestShotSensor(GolfDashboardSensor):
+    """Personal best of one metric and window, with the full shot as attributes."""
+
+    def _best(self) -> dict[str, Any]:
+        description = self.entity_description
+        windows = self.coordinator.best_shots
+        return windows.get(description.window or "", {}).get(description.json_key or "") or {}
+
+    @property
+    def native_value(self) -> Any:
+        """Return the best value; None after the window was reset."""
+        value = self._best().get("value")
+        return self._apply_transforms(value) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the snapshot of the best shot."""
+        return {key: value for key, value in self._best().items() if key != "value"}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the bests change."""
+        if _update_data(self.coordinator.data, "best_shots") is not None:
+            self.async_write_ha_state()
+
+
+class GolfDashboardShotWindowSensor(GolfDashboardSensor):
+    """Average of one metric over the last N shots, with the shot count as attribute."""
+
+    def _window(self) -> dict[str, Any]:
+        return self.coordinator.shot_windows.get(self.entity_description.window or "", {})
+
+    @property
+    def native_value(self) -> Any:
+        """Return the window average; None until a shot carries the metric."""
+        value = self._window().get(self.entity_description.json_key or "")
+        return self._apply_transforms(value) if value is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return how many shots the window currently holds."""
+        return {"shot_count": self._window().get("shot_count", 0)}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the windows change."""
+        if _update_data(self.coordinator.data, "shot_windows") is not None:
+            self.async_write_ha_state()
+
+
+class GolfDashboardLeaderboardSensor(SensorEntity):
+    """Best value of one facility leaderboard, with the top shots as attributes.
+
+    Belongs to a separate "Golf Dashboard Facility" device and is refreshed by
+    the supervisor's leaderboard signal instead of a coordinator.
+    """
+
+    entity_description: GolfDashboardSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"leaders"})
+
+    def __init__(
+        self,
+        supervisor: ConnectionSupervisor,
+        description: GolfDashboardSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._supervisor = supervisor
+        self._attr_unique_id = f"{DOMAIN}_facility_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "facility")},
+            name="Golf Dashboard Facility",
+            manufacturer="Open Launch",
+            model="Leaderboard",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh whenever a leaderboard changes."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_LEADERBOARD_UPDATED, self.async_write_ha_state
+            )
+        )
+
+    def _board(self) -> list[dict[str, Any]]:
+        description = self.entity_description
+        return self._supervisor.leaderboard.board(
+            description.window or "day",
+            description.json_key or "",
+            self._supervisor.leaderboard_periods(),
+        )
+
+    def _round(self, value: Any) -> Any:
+        precision = self.entity_description.precision
+        if isinstance(value, float) and precision is not None:
+            return round(value, precision)
+        return value
+
+    @property
+    def native_value(self) -> Any:
+        """Return the leading value, or None while the board is empty."""
+        board = self._board()
+        return self._round(board[0]["value"]) if board else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the ranked shots on this board."""
+        return {
+            "leaders": [
+                {
+                    "rank": rank,
+                    **{
+                        key: round(value, 2) if isinstance(value, float) else value
+                        for key, value in entry.items()
+                    },
+                    "value": self._round(entry["value"]),
+                }
+                for rank, entry in enumerate(self._board(), start=1)
+            ]
+        }
@@ -0,0 +1,322 @@
+"""Bulk import of historical launch data for Golf Dashboard.
+
+Reads CSV or JSON Lines files (our own exports or exports from other launch
+monitors), maps columns onto the NOVA raw inputs by name, recomputes every
+derived metric in batches with :func:`derived.compute_derived_batch`, and
+inserts each batch into the shot store in one transaction. Everything here
+blocks, so the integration runs :func:`import_file` in the executor.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, tzinfo
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from .derived import DERIVED_MODEL_VERSION, MPS_TO_MPH, compute_derived_batch
+from .shot_store import ShotStore
+from .shots import record_fields
+
+IMPORT_CHUNK_SIZE = 1000
+
+RAW_FIELDS: Tuple[str, ...] = (
+    "ball_speed_meters_per_second",
+    "vertical_launch_angle_degrees",
+    "horizontal_launch_angle_degrees",
+    "total_spin_rpm",
+    "spin_axis_degrees",
+)
+
+KPH_PER_MPS = 3.6
+
+# Normalized column names (lowercase, alphanumerics only) -> canonical field.
+# Ball speed columns without an explicit unit are assumed to be mph, which is
+# what most consumer launch monitor exports use.
+COLUMN_ALIASES: Dict[str, str] = {
+    "ballspeedmeterspersecond": "ball_speed_meters_per_second",
+    "ballspeedms": "ball_speed_meters_per_second",
+    "ballspeedmps": "ball_speed_meters_per_second",
+    "ballspeed": "ball_speed_mph",
+    "ballspeedmph": "ball_speed_mph",
+    "ballspeedkmh": "ball_speed_kph",
+    "ballspeedkph": "ball_speed_kph",
+    "verticallaunchangledegrees": "vertical_launch_angle_degrees",
+    "verticallaunchangle": "vertical_launch_angle_degrees",
+    "launchangle": "vertical_launch_angle_degrees",
+    "launchangledeg": "vertical_launch_angle_degrees",
+    "vla": "vertical_launch_angle_degrees",
+    "horizontallaunchangledegrees": "horizontal_launch_angle_degrees",
+    "horizontallaunchangle": "horizontal_launch_angle_degrees",
+    "launchdirection": "horizontal_launch_angle_degrees",
+    "launchdirectiondeg": "horizontal_launch_angle_degrees",
+    "hla": "horizontal_launch_angle_degrees",
+    "totalspinrpm": "total_spin_rpm",
+    "totalspin": "total_spin_rpm",
+    "spinrate": "total_spin_rpm",
+    "spinraterpm": "total_spin_rpm",
+    "spin": "total_spin_rpm",
+    "spinaxisdegrees": "spin_axis_degrees",
+    "spinaxis": "spin_axis_degrees",
+    "spinaxisdeg": "spin_axis_degrees",
+    "time": "time",
+    "ts": "time",
+    "timestamp": "time",
+    "date": "time",
+    "datetime": "time",
+    "sessionid": "session_id",
+    "session": "session_id",
+    "shotnumber": "shot_number",
+    "club": "club",
+    "clubtype": "club",
+}
+
+_DATETIME_FORMATS = (
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y %I:%M:%S %p",
+    "%Y-%m-%d %H:%M:%S",
+)
+_DIRECTION = re.compile(r"^\s*([LR])\s*([0-9.]+)\s*$", re.IGNORECASE)
+
+
+@dataclass
+class ImportResult:
+    """Counts reported back to the caller of an import."""
+
+    imported: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def normalize_column(name: str) -> str:
+    """Return the lookup key for a column header."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def build_column_map(
+    headers: List[str], overrides: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """Map source headers to canonical fields using aliases and explicit overrides."""
+    mapping: Dict[str, str] = {}
+    for header in headers:
+        canonical = COLUMN_ALIASES.get(normalize_column(header))
+        if canonical and canonical not in mapping.values():
+            mapping[header] = canonical
+    for source, target in (overrides or {}).items():
+        mapping = {key: value for key, value in mapping.items() if value != target}
+        mapping[source] = target
+    return mapping
+
+
+def _parse_number(value: Any) -> Optional[float]:
+    """Parse numbers, including ``L5.2``/``R3.1`` direction notation (left negative)."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return None
+    if match := _DIRECTION.match(text):
+        magnitude = float(match.group(2))
+        return -magnitude if match.group(1).upper() == "L" else magnitude
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _parse_time(value: Any, default_tz: tzinfo) -> Optional[float]:
+    """Parse an epoch number or a date/time string into epoch seconds."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parsed: Optional[datetime] = None
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        for fmt in _DATETIME_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=default_tz)
+    return parsed.timestamp()
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def _file_format(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    return "jsonl" if suffixes and suffixes[-1] in (".jsonl", ".json", ".ndjson") else "csv"
+
+
+def iter_source_rows(path: Path) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield ``(row number, row, error)`` from a CSV or JSON Lines file (optionally gzipped).
+
+    A row that cannot be parsed comes back as ``None`` with the reason, and
+    reading goes on with the next row. Text that cannot be decoded ends the
+    file, since the rows after it cannot be located.
+    """
+    number = 0
+    with _open_text(path) as handle:
+        try:
+            if _file_format(path) == "jsonl":
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    number += 1
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as err:
+                        yield number, None, f"invalid JSON ({err.msg})"
+                        continue
+                    if isinstance(row, dict):
+                        yield number, row, None
+                    else:
+                        yield number, None, "not a JSON object"
+            else:
+                reader = csv.DictReader(handle)
+                while True:
+                    try:
+                        row = next(reader)
+                    except StopIteration:
+                        break
+                    except csv.Error as err:
+                        number += 1
+                        yield number, None, f"invalid CSV ({err})"
+                        continue
+                    number += 1
+                    yield number, row, None
+        except UnicodeDecodeError:
+            yield number + 1, None, "text is not UTF-8; the rest of the file was not read"
+
+
+def to_canonical(
+    row: Dict[str, Any], column_map: Dict[str, str], default_tz: tzinfo
+) -> Optional[Dict[str, Any]]:
+    """Convert a source row to raw NOVA inputs; None when ball speed or launch is missing."""
+    values: Dict[str, Any] = {}
+    for source, target in column_map.items():
+        if source in row:
+            values[target] = row[source]
+
+    speed = _parse_number(values.get("ball_speed_meters_per_second"))
+    if speed is None and (mph := _parse_number(values.get("ball_speed_mph"))) is not None:
+        speed = mph / MPS_TO_MPH
+    if speed is None and (kph := _parse_number(values.get("ball_speed_kph"))) is not None:
+        speed = kph / KPH_PER_MPS
+    vla = _parse_number(values.get("vertical_launch_angle_degrees"))
+    if speed is None or vla is None:
+        return None
+
+    canonical: Dict[str, Any] = {
+        "ball_speed_meters_per_second": speed,
+        "vertical_launch_angle_degrees": vla,
+        "horizontal_launch_angle_degrees": _parse_number(values.get("horizontal_launch_angle_degrees")),
+        "total_spin_rpm": _parse_number(values.get("total_spin_rpm")),
+        "spin_axis_degrees": _parse_number(values.get("spin_axis_degrees")),
+        "ts": _parse_time(values.get("time"), default_tz),
+    }
+    if values.get("session_id") not in (None, ""):
+        canonical["session_id"] = str(values["session_id"])
+    if (shot_number := _parse_number(values.get("shot_number"))) is not None:
+        canonical["shot_number"] = int(shot_number)
+    if values.get("club") not in (None, ""):
+        canonical["source_club"] = str(values["club"])
+    return canonical
+
+
+def derive_records(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Recompute derived metrics for canonical rows in one batch and build records."""
+    if not rows:
+        return []
+    derived_rows = compute_derived_batch(*([row[name] for row in rows] for name in RAW_FIELDS))
+    records = []
+    for row, derived in zip(rows, derived_rows):
+        payload = dict(row)
+        payload.update(derived)
+        record = record_fields(payload)
+        record["ts"] = row["ts"]
+        record["model_version"] = DERIVED_MODEL_VERSION
+        records.append(record)
+    return records
+
+
+def import_file(
+    store: ShotStore,
+    device: str,
+    path: Path,
+    column_overrides: Optional[Dict[str, str]] = None,
+    session_id: Optional[str] = None,
+    default_tz: tzinfo = timezone.utc,
+    now: Optional[float] = None,
+    player: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """Import a file into the shot store in chunks of ``chunk_size`` rows.
+
+    Rows without a timestamp get ``now``; rows without a session get the
+    ``session_id`` argument, or an ``import-YYYYMMDD`` id from their date.
+    Every row is attributed to ``player`` when one is given. Rows that cannot
+    be parsed are skipped and reported in ``errors`` like rows with missing
+    values, so the counts always match what was committed.
+    """
+    result = ImportResult()
+    fallback_ts = now if now is not None else datetime.now(timezone.utc).timestamp()
+    column_map: Optional[Dict[str, str]] = None
+    batch: List[Dict[str, Any]] = []
+
+    def _flush() -> None:
+        if batch:
+            result.imported += store.insert_many(device, derive_records(batch))
+            batch.clear()
+
+    def _skip(line_number: int, reason: str) -> None:
+        result.skipped += 1
+        if len(result.errors) < 10:
+            result.errors.append(f"row {line_number}: {reason}")
+
+    for line_number, row, error in iter_source_rows(path):
+        if row is None:
+            _skip(line_number, error or "unreadable")
+            continue
+        if column_map is None:
+            column_map = build_column_map(
+                [name for name in row if isinstance(name, str)], column_overrides
+            )
+        canonical = to_canonical(row, column_map, default_tz)
+        if canonical is None:
+            _skip(line_number, "missing ball speed or launch angle")
+            continue
+        if canonical["ts"] is None:
+            canonical["ts"] = fallback_ts
+        if "session_id" not in canonical:
+            canonical["session_id"] = session_id or "import-" + datetime.fromtimestamp(
+                canonical["ts"], default_tz
+            ).strftime("%Y%m%d")
+        if player is not None:
+            canonical["player"] = player
+        batch.append(canonical)
+        if len(batch) >= chunk_size:
+            _flush()
+    _flush()
+    return result
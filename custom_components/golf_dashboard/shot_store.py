@@ -0,0 +1,729 @@
+"""SQLite-backed shot store for Golf Dashboard.
+
+Every shot record is appended here so history outlives the in-memory ring
+buffer. The store is shared by all config entries (rows carry the entry id in
+``device``) and is pure Python on top of ``sqlite3``. All methods block, so the
+integration calls them from the executor; a lock serializes writers while
+readers use their own connections thanks to WAL mode.
+
+Alongside the raw rows the store keeps ``rollups``: count, sum, sum of squares,
+min, and max per metric for every (hour or day, device, player, club class)
+bucket, plus an ``all`` club bucket. Rollups keep the fixed club class rather
+than the learned club: learned ids are per player and are merged and renamed
+as a player's clubs settle, which would force rebuilding long-lived buckets,
+while the class means the same thing for every player and device. They are updated in the same transaction
+as the insert, so trend queries read a handful of buckets instead of scanning
+history. Because every shot is already rolled up, raw rows past a retention
+period are moved to the ``archive`` table without losing trends; archiving and
+incremental vacuum run in small chunks so a compaction pass never holds the
+writer lock for long.
+
+Archived shots keep only the raw launch inputs, quantized to sensor precision
+and packed into a 16-byte blob (see :data:`ARCHIVE_FIELDS`), next to
+metadata columns that include the learned club and outlier flags. Derived
+metrics are recomputed on read (``archive.py``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+READ_CHUNK_SIZE = 500
+
+# Rolled-up metrics and bucket sizes (UTC-aligned), in seconds
+ROLLUP_METRICS: Tuple[str, ...] = (
+    "carry_distance_yards",
+    "total_distance_yards",
+    "offline_distance_yards",
+    "ball_speed_meters_per_second",
+    "club_speed_meters_per_second",
+    "smash_factor",
+    "shot_quality_score",
+)
+GRANULARITIES: Dict[str, int] = {"hour": 3600, "day": 86400}
+ALL_CLUBS = "all"
+EXCLUDED_FIELD = "outlier_excluded"  # flagged shots kept as rows but left out of rollups
+
+# Archived fields: (name, scale); values are stored as round(value * scale)
+ARCHIVE_FIELDS: Tuple[Tuple[str, int], ...] = (
+    ("ball_speed_meters_per_second", 100),  # 0.01 m/s
+    ("vertical_launch_angle_degrees", 10),  # 0.1 degree
+    ("horizontal_launch_angle_degrees", 10),
+    ("total_spin_rpm", 1),  # 1 rpm
+    ("spin_axis_degrees", 10),
+    ("shot_number", 1),
+)
+ARCHIVE_FORMAT = 1
+# format version, presence bitmask, then one integer per ARCHIVE_FIELDS entry
+_ARCHIVE_STRUCT = struct.Struct("<BBHhhHhI")
+_ARCHIVE_LIMITS: Tuple[Tuple[int, int], ...] = (
+    (0, 0xFFFF),
+    (-0x8000, 0x7FFF),
+    (-0x8000, 0x7FFF),
+    (0, 0xFFFF),
+    (-0x8000, 0x7FFF),
+    (0, 0xFFFFFFFF),
+)
+
+RollupKey = Tuple[str, float, str, str, str, str]  # granularity, bucket, device, player, club, metric
+
+_MIGRATIONS: Tuple[Tuple[str, ...], ...] = (
+    (
+        """
+        CREATE TABLE IF NOT EXISTS shots (
+            id INTEGER PRIMARY KEY,
+            device TEXT NOT NULL,
+            ts REAL NOT NULL,
+            session_id TEXT,
+            club TEXT,
+            shot_rank TEXT,
+            shot_name TEXT,
+            data TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS shots_device_ts ON shots (device, ts)",
+        "CREATE INDEX IF NOT EXISTS shots_session ON shots (session_id)",
+        "CREATE INDEX IF NOT EXISTS shots_club_ts ON shots (club, ts)",
+    ),
+    (
+        # Rows written before model versioning count as outdated (version 0).
+        "ALTER TABLE shots ADD COLUMN model_version INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS shots_model_version ON shots (model_version, id)",
+    ),
+    (
+        # Rows written before player profiles have no player (NULL).
+        "ALTER TABLE shots ADD COLUMN player TEXT",
+        "CREATE INDEX IF NOT EXISTS shots_player_ts ON shots (player, ts)",
+    ),
+    (
+        # Existing rows are rolled up by open() right after this migration.
+        """
+        CREATE TABLE IF NOT EXISTS rollups (
+            granularity TEXT NOT NULL,
+            bucket REAL NOT NULL,
+            device TEXT NOT NULL,
+            player TEXT NOT NULL,
+            club TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            total_sq REAL NOT NULL,
+            minimum REAL NOT NULL,
+            maximum REAL NOT NULL,
+            PRIMARY KEY (granularity, club, metric, bucket, device, player)
+        ) WITHOUT ROWID
+        """,
+    ),
+    (
+        """
+        CREATE TABLE IF NOT EXISTS archive (
+            id INTEGER PRIMARY KEY,
+            device TEXT NOT NULL,
+            ts REAL NOT NULL,
+            session_id TEXT,
+            club TEXT,
+            player TEXT,
+            model_version INTEGER NOT NULL,
+            data BLOB NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS archive_device_ts ON archive (device, ts)",
+        "CREATE INDEX IF NOT EXISTS archive_player_ts ON archive (player, ts)",
+    ),
+    (
+        # Indexes for the query API (query.py).
+        "ALTER TABLE shots ADD COLUMN club_cluster TEXT",
+        "UPDATE shots SET club_cluster = json_extract(data, '$.club_cluster')",
+        "CREATE INDEX IF NOT EXISTS shots_player_cluster_ts ON shots (player, club_cluster, ts)",
+        "CREATE INDEX IF NOT EXISTS shots_rank_ts ON shots (shot_rank, ts)",
+        "CREATE INDEX IF NOT EXISTS shots_name_ts ON shots (shot_name, ts)",
+        "CREATE INDEX IF NOT EXISTS shots_ts ON shots (ts)",
+    ),
+    (
+        # Shots archived before this carry no learned club or outlier flags.
+        "ALTER TABLE archive ADD COLUMN club_cluster TEXT",
+        "ALTER TABLE archive ADD COLUMN outlier_reason TEXT",
+        f"ALTER TABLE archive ADD COLUMN {EXCLUDED_FIELD} INTEGER NOT NULL DEFAULT 0",
+    ),
+)
+ROLLUPS_MIGRATION = 4
+AUTO_VACUUM_INCREMENTAL = 2
+
+_UPSERT_ROLLUP = (
+    "INSERT INTO rollups "
+    "(granularity, bucket, device, player, club, metric, count, total, total_sq, minimum, maximum) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (granularity, club, metric, bucket, device, player) DO UPDATE SET "
+    "count = count + excluded.count, total = total + excluded.total, "
+    "total_sq = total_sq + excluded.total_sq, "
+    "minimum = MIN(minimum, excluded.minimum), maximum = MAX(maximum, excluded.maximum)"
+)
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+class ShotStore:
+    """Append-mostly store of shot records."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, new_file: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if new_file:
+            # Only free before the first page is written; older files are
+            # converted later by enable_incremental_vacuum().
+            conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open(self) -> None:
+        """Open the database and apply pending schema migrations."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            new_file = not os.path.exists(self.path) or not os.path.getsize(self.path)
+            conn = self._connect(new_file)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+                with conn:
+                    for statement in statements:
+                        conn.execute(statement)
+                    if target == ROLLUPS_MIGRATION:
+                        _rebuild_rollups(conn)
+                    conn.execute(f"PRAGMA user_version={target}")
+            self._conn = conn
+
+    def close(self) -> None:
+        """Close the writer connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the writer connection, opening the store if needed."""
+        if self._conn is None:
+            self.open()
+        assert self._conn is not None
+        return self._conn
+
+    def insert_many(self, device: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert shot records for one device and roll them up in a single transaction."""
+        records = list(records)
+        rows = [self._row(device, record) for record in records]
+        if not rows:
+            return 0
+        conn = self.conn
+        with self._lock, conn:
+            conn.executemany(
+                "INSERT INTO shots "
+                "(session_id, club, shot_rank, shot_name, player, club_cluster, model_version, data, "
+                "device, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            _add_rollups(conn, ((device, record) for record in records))
+        return len(rows)
+
+    @staticmethod
+    def _columns(record: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Return the indexed columns derived from a record, ending with its JSON."""
+        return (
+            record.get("session_id"),
+            record.get("club_class"),
+            record.get("shot_rank"),
+            record.get("shot_name"),
+            record.get("player"),
+            record.get("club_cluster"),
+            record.get("model_version", 0),
+            json.dumps(record, separators=(",", ":")),
+        )
+
+    def _row(self, device: str, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (*self._columns(record), device, record["ts"])
+
+    def outdated(
+        self, model_version: int, after_id: int = 0, limit: int = READ_CHUNK_SIZE
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return up to ``limit`` ``(id, record)`` pairs stamped with an older model version."""
+        conn = self.conn
+        with self._lock:
+            rows = conn.execute(
+                "SELECT id, data FROM shots WHERE model_version < ? AND id > ? ORDER BY id LIMIT ?",
+                (model_version, after_id, limit),
+            ).fetchall()
+        return [(row["id"], json.loads(row["data"])) for row in rows]
+
+    def count_outdated(self, model_version: int) -> int:
+        """Return how many stored shots use an older model version."""
+        conn = self.conn
+        with self._lock:
+            return conn.execute(
+                "SELECT COUNT(*) FROM shots WHERE model_version < ?", (model_version,)
+            ).fetchone()[0]
+
+    def update_many(self, rows: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """Replace the records of existing rows and rebuild the rollups of their days."""
+        rows = list(rows)
+        params = [(*self._columns(record), row_id) for row_id, record in rows]
+        if not params:
+            return 0
+        conn = self.conn
+        with self._lock, conn:
+            conn.executemany(
+                "UPDATE shots SET session_id = ?, club = ?, shot_rank = ?, shot_name = ?, "
+                "player = ?, club_cluster = ?, model_version = ?, data = ? WHERE id = ?",
+                params,
+            )
+            # Min/max cannot be retracted, so rebuild the touched days instead.
+            placeholders = ",".join("?" * len(rows))
+            days = conn.execute(
+                f"SELECT DISTINCT device, CAST(ts / 86400 AS INTEGER) * 86400.0 AS day "
+                f"FROM shots WHERE id IN ({placeholders})",
+                [row_id for row_id, _ in rows],
+            ).fetchall()
+            for device, day in days:
+                _rebuild_rollups(conn, device, day, day + GRANULARITIES["day"])
+        return len(params)
+
+    def rename_cluster(self, device: str, player: str, old: str, new: str) -> int:
+        """Retag a player's shots of a learned club merged into another one.
+
+        Archived rows are retagged too. Rollups are keyed by club class, not
+        cluster, so they stay valid. Returns the number of live rows changed.
+        """
+        conn = self.conn
+        with self._lock, conn:
+            conn.execute(
+                "UPDATE archive SET club_cluster = ? WHERE device = ? AND player = ? AND club_cluster = ?",
+                (new, device, player, old),
+            )
+            return conn.execute(
+                "UPDATE shots SET club_cluster = ?, data = json_set(data, '$.club_cluster', ?) "
+                "WHERE device = ? AND player = ? AND club_cluster = ?",
+                (new, new, device, player, old),
+            ).rowcount
+
+    def iter_shots(
+        self,
+        device: Optional[str] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        session_id: Optional[str] = None,
+        club: Optional[str] = None,
+        player: Optional[str] = None,
+        club_cluster: Optional[str] = None,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield matching records in time order, reading ``chunk_size`` rows at a time.
+
+        A dedicated read connection is used so long reads never hold the writer
+        lock; memory stays bounded by the chunk size.
+        """
+        where, params = _where_clause(
+            device=device,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            session_id=session_id,
+            club=club,
+            player=player,
+            club_cluster=club_cluster,
+        )
+        self.conn  # make sure migrations ran before reading
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f"SELECT data FROM shots{where} ORDER BY ts, id", params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield json.loads(row["data"])
+        finally:
+            conn.close()
+
+    def rollups(
+        self,
+        granularity: str = "day",
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        device: Optional[str] = None,
+        player: Optional[str] = None,
+        club: str = ALL_CLUBS,
+        metrics: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return per-bucket statistics from the rollup table, oldest bucket first.
+
+        Each item is ``{"start": ts, "count": n, <metric>: {count, mean,
+        stddev, min, max}}``. Buckets of several devices or players are merged;
+        the cost depends on the number of buckets in range, not on history.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}")
+        clauses = ["granularity = ?", "club = ?"]
+        params: List[Any] = [granularity, club]
+        for column, value in (("device", device), ("player", player)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if metrics:
+            clauses.append(f"metric IN ({','.join('?' * len(metrics))})")
+            params.extend(metrics)
+        if start_ts is not None:
+            clauses.append("bucket >= ?")
+            params.append(_bucket(start_ts, GRANULARITIES[granularity]))
+        if end_ts is not None:
+            clauses.append("bucket < ?")
+            params.append(end_ts)
+        self.conn  # make sure migrations ran before reading
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT bucket, metric, SUM(count) AS count, SUM(total) AS total, "
+                "SUM(total_sq) AS total_sq, MIN(minimum) AS minimum, MAX(maximum) AS maximum "
+                f"FROM rollups WHERE {' AND '.join(clauses)} GROUP BY bucket, metric ORDER BY bucket",
+                params,
+            ).fetchall()
+        finally:
+            conn.close()
+        buckets: Dict[float, Dict[str, Any]] = {}
+        for row in rows:
+            bucket = buckets.setdefault(row["bucket"], {"start": row["bucket"], "count": 0})
+            bucket[row["metric"]] = rollup_summary(
+                row["count"], row["total"], row["total_sq"], row["minimum"], row["maximum"]
+            )
+            bucket["count"] = max(bucket["count"], row["count"])
+        return list(buckets.values())
+
+    def archive(self, device: str, before_ts: float, limit: int = READ_CHUNK_SIZE) -> int:
+        """Move up to ``limit`` of a device's raw shots older than ``before_ts`` to the archive.
+
+        The cutoff is rounded down to a UTC day so a day's rollups never mix
+        archived and raw rows. Returns the number of rows moved; call again
+        until it returns 0.
+        """
+        cutoff = _bucket(before_ts, GRANULARITIES["day"])
+        conn = self.conn
+        with self._lock, conn:
+            rows = conn.execute(
+                "SELECT id, ts, session_id, club, player, club_cluster, model_version, data "
+                "FROM shots WHERE device = ? AND ts < ? ORDER BY ts LIMIT ?",
+                (device, cutoff, limit),
+            ).fetchall()
+            if not rows:
+                return 0
+            params = []
+            for row in rows:
+                record = json.loads(row["data"])
+                params.append(
+                    (
+                        device,
+                        row["ts"],
+                        row["session_id"],
+                        row["club"],
+                        row["player"],
+                        row["club_cluster"],
+                        record.get("outlier_reason"),
+                        bool(record.get(EXCLUDED_FIELD)),
+                        row["model_version"],
+                        encode_archived(record),
+                    )
+                )
+            conn.executemany(
+                "INSERT INTO archive (device, ts, session_id, club, player, club_cluster, "
+                f"outlier_reason, {EXCLUDED_FIELD}, model_version, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                params,
+            )
+            conn.executemany("DELETE FROM shots WHERE id = ?", [(row["id"],) for row in rows])
+        return len(rows)
+
+    def iter_archived(
+        self,
+        device: Optional[str] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        session_id: Optional[str] = None,
+        club: Optional[str] = None,
+        player: Optional[str] = None,
+        club_cluster: Optional[str] = None,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield archived shots in time order as raw inputs plus metadata.
+
+        Derived metrics are not stored; callers recompute them in batches. The
+        learned club and outlier flags are kept as metadata, since they depend
+        on the player's state when the shot arrived and cannot be re-derived.
+        """
+        where, params = _where_clause(
+            device=device,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            session_id=session_id,
+            club=club,
+            player=player,
+            club_cluster=club_cluster,
+        )
+        self.conn  # make sure migrations ran before reading
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"SELECT ts, session_id, player, club_cluster, outlier_reason, {EXCLUDED_FIELD}, data "
+                f"FROM archive{where} ORDER BY ts, id",
+                params,
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    record = decode_archived(row["data"])
+                    record.update(
+                        ts=row["ts"],
+                        session_id=row["session_id"],
+                        player=row["player"],
+                        club_cluster=row["club_cluster"],
+                        outlier_reason=row["outlier_reason"],
+                    )
+                    record[EXCLUDED_FIELD] = bool(row[EXCLUDED_FIELD])
+                    yield record
+        finally:
+            conn.close()
+
+    def count_archived(self, device: Optional[str] = None) -> int:
+        """Return the number of archived shots, optionally for one device."""
+        where, params = _where_clause(device=device)
+        conn = self.conn
+        with self._lock:
+            return conn.execute(f"SELECT COUNT(*) FROM archive{where}", params).fetchone()[0]
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Switch a store created without incremental auto-vacuum over to it.
+
+        This is a one-off ``VACUUM`` that rewrites the whole file while holding
+        the writer lock and needs about the database size in free disk space,
+        so the integration runs it once at startup, before any shot is
+        ingested, and never in :meth:`open` or idle-time compaction. Returns
+        True when incremental vacuum is enabled, False when the rewrite was
+        skipped for lack of disk space.
+        """
+        conn = self.conn
+        with self._lock:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+                return True
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            size = pages * conn.execute("PRAGMA page_size").fetchone()[0]
+            if shutil.disk_usage(os.path.dirname(self.path) or ".").free < 2 * size:
+                return False
+            conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+            conn.execute("VACUUM")
+            return True
+
+    def compact(self, pages: int) -> int:
+        """Return up to ``pages`` free pages to the file system and checkpoint the WAL.
+
+        Returns the number of free pages left, so callers can repeat until 0.
+        """
+        conn = self.conn
+        with self._lock:
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def size(self) -> int:
+        """Return the database size in bytes, excluding the WAL."""
+        conn = self.conn
+        with self._lock:
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            return pages * conn.execute("PRAGMA page_size").fetchone()[0]
+
+    def select(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run a read-only statement on a dedicated read connection."""
+        self.conn  # make sure migrations ran before reading
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def page_before(
+        self,
+        device: str,
+        before: Optional[Tuple[float, int]] = None,
+        limit: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[List[Any]]]:
+        """Return up to ``limit`` of a device's live shots older than a ``(ts, id)`` cursor.
+
+        The page is in ascending time order, together with the ``[ts, id]``
+        cursor of the next (older) page, or None when the page reaches the
+        oldest live shot. Without ``before`` the newest shots are returned.
+        """
+        where, params = "device = ?", [device]
+        if before is not None:
+            ts, row_id = before
+            where += " AND (ts < ? OR (ts = ? AND id < ?))"
+            params += [ts, ts, row_id]
+        rows = self.select(
+            f"SELECT id, ts, data FROM shots WHERE {where} ORDER BY ts DESC, id DESC LIMIT ?",
+            [*params, limit + 1],
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = [rows[-1]["ts"], rows[-1]["id"]] if more else None
+        return [json.loads(row["data"]) for row in reversed(rows)], cursor
+
+    def count(self, device: Optional[str] = None) -> int:
+        """Return the number of stored shots, optionally for one device."""
+        where, params = _where_clause(device=device)
+        conn = self.conn
+        with self._lock:
+            return conn.execute(f"SELECT COUNT(*) FROM shots{where}", params).fetchone()[0]
+
+
+def _where_clause(
+    device: Optional[str] = None,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    session_id: Optional[str] = None,
+    club: Optional[str] = None,
+    player: Optional[str] = None,
+    club_cluster: Optional[str] = None,
+) -> Tuple[str, List[Any]]:
+    """Build a WHERE clause from optional equality and time-range filters."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    for column, value in (
+        ("device", device),
+        ("session_id", session_id),
+        ("club", club),
+        ("player", player),
+        ("club_cluster", club_cluster),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if start_ts is not None:
+        clauses.append("ts >= ?")
+        params.append(start_ts)
+    if end_ts is not None:
+        clauses.append("ts < ?")
+        params.append(end_ts)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _bucket(ts: float, size: int) -> float:
+    """Return the start of the UTC-aligned bucket containing ``ts``."""
+    return float(int(ts // size) * size)
+
+
+def _add_rollups(conn: sqlite3.Connection, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+    """Fold ``(device, record)`` pairs into the rollup table (caller owns the transaction)."""
+    totals: Dict[RollupKey, List[float]] = {}
+    for device, record in records:
+        ts = record.get("ts")
+        if not isinstance(ts, (int, float)) or record.get(EXCLUDED_FIELD):
+            continue
+        clubs = [ALL_CLUBS]
+        if isinstance(record.get("club_class"), str):
+            clubs.append(record["club_class"])
+        player = record.get("player") or ""
+        for metric in ROLLUP_METRICS:
+            value = record.get(metric)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            value = float(value)
+            for granularity, size in GRANULARITIES.items():
+                bucket = _bucket(ts, size)
+                for club in clubs:
+                    key = (granularity, bucket, device, player, club, metric)
+                    acc = totals.get(key)
+                    if acc is None:
+                        totals[key] = [1, value, value * value, value, value]
+                    else:
+                        acc[0] += 1
+                        acc[1] += value
+                        acc[2] += value * value
+                        acc[3] = min(acc[3], value)
+                        acc[4] = max(acc[4], value)
+    if totals:
+        conn.executemany(_UPSERT_ROLLUP, [(*key, *acc) for key, acc in totals.items()])
+
+
+def _rebuild_rollups(
+    conn: sqlite3.Connection,
+    device: Optional[str] = None,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+) -> None:
+    """Recompute the rollups of whole days from raw shots (caller owns the transaction).
+
+    ``start_ts``/``end_ts`` must be day-aligned so no bucket is half rebuilt.
+    """
+    where, params = _where_clause(device=device, start_ts=start_ts, end_ts=end_ts)
+    clauses = ["device = ?"] if device is not None else []
+    clauses += ["bucket >= ?"] if start_ts is not None else []
+    clauses += ["bucket < ?"] if end_ts is not None else []
+    conn.execute(
+        "DELETE FROM rollups" + (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    )
+    cursor = conn.execute(f"SELECT device, data FROM shots{where} ORDER BY id", params)
+    while True:
+        rows = cursor.fetchmany(READ_CHUNK_SIZE)
+        if not rows:
+            break
+        _add_rollups(conn, ((row[0], json.loads(row[1])) for row in rows))
+
+
+def encode_archived(record: Dict[str, Any]) -> bytes:
+    """Pack a record's raw inputs into a fixed 16-byte blob.
+
+    Values are scaled to integers per :data:`ARCHIVE_FIELDS` and clamped to the
+    field's range; missing values are flagged in the presence bitmask.
+    """
+    present = 0
+    values: List[int] = []
+    for index, ((name, scale), (low, high)) in enumerate(zip(ARCHIVE_FIELDS, _ARCHIVE_LIMITS)):
+        value = record.get(name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            present |= 1 << index
+            values.append(min(max(round(value * scale), low), high))
+        else:
+            values.append(0)
+    return _ARCHIVE_STRUCT.pack(ARCHIVE_FORMAT, present, *values)
+
+
+def decode_archived(blob: bytes) -> Dict[str, Any]:
+    """Unpack a blob produced by :func:`encode_archived` into raw input fields."""
+    version, present, *values = _ARCHIVE_STRUCT.unpack(blob)
+    if version != ARCHIVE_FORMAT:
+        raise ValueError(f"Unsupported archive format {version}")
+    record: Dict[str, Any] = {}
+    for index, ((name, scale), value) in enumerate(zip(ARCHIVE_FIELDS, values)):
+        if present & (1 << index):
+            record[name] = value if scale == 1 else value / scale
+    return record
+
+
+def rollup_summary(
+    count: int, total: float, total_sq: float, minimum: float, maximum: float
+) -> Dict[str, Any]:
+    """Return count, mean, sample stddev, min, and max from rolled-up sums."""
+    mean = total / count
+    variance = (total_sq - total * mean) / (count - 1) if count > 1 else 0.0
+    return {
+        "count": count,
+        "mean": mean,
+        "stddev": max(variance, 0.0) ** 0.5,
+        "min": minimum,
+        "max": maximum,
+    }
@@ -0,0 +1,149 @@
+"""Shot record helpers for Golf Dashboard.
+
+A shot record is the flat, JSON-friendly form of one augmented shot payload as
+kept in the coordinator's history and handed to API consumers. Pure Python, no
+Home Assistant imports.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+RECORD_PRECISION = 3  # decimal places kept for float fields
+
+# Fields every record carries regardless of projection
+KEY_FIELDS: Tuple[str, ...] = ("seq", "ts")
+
+
+def shot_record(seq: int, timestamp: datetime, shot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a record from an augmented shot payload.
+
+    Internal ``_``-prefixed keys and non-scalar values are dropped and floats are
+    rounded to :data:`RECORD_PRECISION` places to keep payloads small.
+    """
+    record: Dict[str, Any] = {"seq": seq, "ts": round(timestamp.timestamp(), 3)}
+    record.update(record_fields(shot_data))
+    return record
+
+
+def record_fields(shot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the scalar, non-internal fields of a shot payload, floats rounded."""
+    fields: Dict[str, Any] = {}
+    for key, value in shot_data.items():
+        if key.startswith("_") or key == "type":
+            continue
+        if isinstance(value, float):
+            fields[key] = round(value, RECORD_PRECISION)
+        elif value is None or isinstance(value, (bool, int, str)):
+            fields[key] = value
+    return fields
+
+
+def project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Return only the requested fields (plus key fields) of a record."""
+    if not fields:
+        return dict(record)
+    projected = {key: record[key] for key in KEY_FIELDS if key in record}
+    for field in fields:
+        projected[field] = record.get(field)
+    return projected
+
+
+def page(
+    records: Sequence[Dict[str, Any]],
+    before: Optional[int] = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Return up to ``limit`` records older than the ``before`` cursor.
+
+    ``records`` must be ordered by ascending ``seq``. The page is returned in
+    ascending order together with the cursor for the next (older) page, or None
+    when the page reaches the oldest record.
+    """
+    end = len(records)
+    if before is not None:
+        # Binary search for the first record with seq >= before.
+        low, high = 0, len(records)
+        while low < high:
+            mid = (low + high) // 2
+            if records[mid]["seq"] < before:
+                low = mid + 1
+            else:
+                high = mid
+        end = low
+    start = max(0, end - limit)
+    selected = [records[index] for index in range(start, end)]
+    next_cursor = selected[0]["seq"] if start > 0 and selected else None
+    return selected, next_cursor
+
+
+def encode_columnar(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """Encode rows as one list per field, sharing a single set of keys."""
+    columns: Dict[str, List[Any]] = {field: [] for field in fields}
+    for row in rows:
+        for field in fields:
+            columns[field].append(row.get(field))
+    return columns
+
+
+class ShotQueue:
+    """Bounded per-consumer queue of shot records with a drop-oldest policy.
+
+    Producers never block: when the queue is full the oldest pending record is
+    discarded, so a slow consumer only ever loses its own backlog. The queue is
+    also an async iterator that ends once it is closed and drained.
+    """
+
+    def __init__(self, maxsize: int, fields: Optional[Sequence[str]] = None) -> None:
+        self.maxsize = max(1, maxsize)
+        self.fields: Optional[Tuple[str, ...]] = tuple(fields) if fields else None
+        self.dropped = 0
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self.closed = False
+
+    def put_nowait(self, record: Dict[str, Any]) -> None:
+        """Queue a projected copy of a record, dropping the oldest when full."""
+        if self.closed:
+            return
+        if len(self._items) >= self.maxsize:
+            self._items.popleft()
+            self.dropped += 1
+        self._items.append(project(record, self.fields))
+        self._wake()
+
+    def close(self) -> None:
+        """Stop accepting records and wake the consumer so it can finish."""
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for and return the next record.
+
+        Raises StopAsyncIteration once the queue is closed and empty.
+        """
+        while not self._items:
+            if self.closed:
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._items.popleft()
+
+    def __aiter__(self) -> "ShotQueue":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        return await self.get()
+
+    def __len__(self) -> int:
+        return len(self._items)
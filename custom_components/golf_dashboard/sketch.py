@@ -0,0 +1,234 @@
+"""Mergeable quantile sketches for Golf Dashboard.
+
+A :class:`QuantileSketch` is a merging t-digest: values are buffered and
+periodically folded into at most ~``compression`` weighted centroids, with
+smaller centroids near the tails so p10/p90 stay accurate. Sketches of the
+same metric merge without access to the raw shots, which is how session,
+lifetime, and multi-bay views are combined. Pure Python, no Home Assistant
+imports.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_COMPRESSION = 100
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.1, 0.5, 0.9)
+ALL_CLUBS = "all"
+
+
+def quantile_label(quantile: float) -> str:
+    """Return the display key for a quantile, e.g. ``p90`` for 0.9."""
+    return f"p{round(quantile * 100):g}"
+
+
+class QuantileSketch:
+    """Fixed-memory, mergeable approximation of a distribution (t-digest)."""
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION) -> None:
+        self.compression = compression
+        self.count = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self._centroids: List[Tuple[float, float]] = []  # (mean, weight), sorted by mean
+        self._buffer: List[Tuple[float, float]] = []
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add one observation."""
+        self._buffer.append((value, weight))
+        self.count += weight
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if len(self._buffer) >= self.compression * 2:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one."""
+        if not other.count:
+            return
+        self._buffer.extend(other._centroids)
+        self._buffer.extend(other._buffer)
+        self.count += other.count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)  # type: ignore[type-var]
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)  # type: ignore[type-var]
+        self._compress()
+
+    def _k(self, q: float) -> float:
+        """Scale function k1: centroids are small near q=0 and q=1."""
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        k = min(k, self.compression / 4)  # k1 peaks at q=1
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = self.count
+        merged: List[Tuple[float, float]] = []
+        mean, weight = items[0]
+        seen = 0.0
+        limit = total * self._k_inverse(self._k(0.0) + 1)
+        for item_mean, item_weight in items[1:]:
+            if seen + weight + item_weight <= limit:
+                weight += item_weight
+                mean += (item_mean - mean) * item_weight / weight
+            else:
+                merged.append((mean, weight))
+                seen += weight
+                limit = total * self._k_inverse(self._k(min(seen / total, 1.0)) + 1)
+                mean, weight = item_mean, item_weight
+        merged.append((mean, weight))
+        self._centroids = merged
+
+    def __len__(self) -> int:
+        """Return the number of centroids retained after compression."""
+        self._compress()
+        return len(self._centroids)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the estimated value at quantile ``q`` (0..1), or None when empty."""
+        self._compress()
+        centroids = self._centroids
+        if not centroids:
+            return None
+        assert self.minimum is not None and self.maximum is not None
+        if len(centroids) == 1:
+            return centroids[0][0]
+        target = min(max(q, 0.0), 1.0) * self.count
+        # Cumulative weight at each centroid's center.
+        cumulative = 0.0
+        previous_center = 0.0
+        previous_mean = self.minimum
+        for mean, weight in centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span else 0.0
+                return previous_mean + (mean - previous_mean) * fraction
+            cumulative += weight
+            previous_center, previous_mean = center, mean
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span else 1.0
+        return previous_mean + (self.maximum - previous_mean) * fraction
+
+    def quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Return ``{"count": n, "p10": ..., ...}`` for the requested quantiles."""
+        result: Dict[str, Any] = {"count": int(self.count)}
+        for q in quantiles:
+            result[quantile_label(q)] = self.quantile(q)
+        return result
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-friendly dict."""
+        self._compress()
+        return {
+            "compression": self.compression,
+            "min": self.minimum,
+            "max": self.maximum,
+            "centroids": [[round(mean, 4), weight] for mean, weight in self._centroids],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Restore a sketch produced by :meth:`as_dict`."""
+        sketch = cls(int(data.get("compression", DEFAULT_COMPRESSION)))
+        sketch._centroids = [(float(mean), float(weight)) for mean, weight in data.get("centroids", [])]
+        sketch.count = sum(weight for _, weight in sketch._centroids)
+        sketch.minimum = data.get("min")
+        sketch.maximum = data.get("max")
+        return sketch
+
+
+class ClubDistributions:
+    """One :class:`QuantileSketch` per metric per club segment, plus an ``all`` segment.
+
+    Shots are segmented by ``segment_field`` (the threshold ``club_class`` or a
+    learned ``club_cluster``).
+    """
+
+    def __init__(
+        self,
+        metrics: Iterable[str],
+        compression: int = DEFAULT_COMPRESSION,
+        segment_field: str = "club_class",
+    ) -> None:
+        self.metrics = tuple(metrics)
+        self.compression = compression
+        self.segment_field = segment_field
+        self.segments: Dict[str, Dict[str, QuantileSketch]] = {}
+
+    def _sketch(self, segment: str, metric: str) -> QuantileSketch:
+        sketches = self.segments.setdefault(segment, {})
+        if metric not in sketches:
+            sketches[metric] = QuantileSketch(self.compression)
+        return sketches[metric]
+
+    def add(self, shot: Dict[str, Any]) -> None:
+        """Add one shot to its club segment and to the ``all`` segment."""
+        club = shot.get(self.segment_field)
+        for metric in self.metrics:
+            value = shot.get(metric)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            self._sketch(ALL_CLUBS, metric).add(float(value))
+            if isinstance(club, str):
+                self._sketch(club, metric).add(float(value))
+
+    def merge(self, other: "ClubDistributions", segments: Optional[Iterable[str]] = None) -> None:
+        """Fold another set of distributions (optionally only some segments) into this one."""
+        wanted = set(segments) if segments is not None else None
+        for segment, sketches in other.segments.items():
+            if wanted is not None and segment not in wanted:
+                continue
+            for metric, sketch in sketches.items():
+                self._sketch(segment, metric).merge(sketch)
+
+    def absorb(self, source: str, target: str) -> None:
+        """Fold segment ``source`` into ``target`` and drop it (e.g. after a cluster merge)."""
+        sketches = self.segments.pop(source, {})
+        for metric, sketch in sketches.items():
+            self._sketch(target, metric).merge(sketch)
+
+    @classmethod
+    def merged(
+        cls,
+        sources: Iterable["ClubDistributions"],
+        segments: Optional[Iterable[str]] = None,
+    ) -> "ClubDistributions":
+        """Return a new set combining ``sources``; the sources are left untouched."""
+        sources = list(sources)
+        combined = cls(sources[0].metrics if sources else (), DEFAULT_COMPRESSION)
+        wanted = list(segments) if segments is not None else None
+        for source in sources:
+            combined.merge(source, wanted)
+        return combined
+
+    def summary(
+        self,
+        segment: str,
+        metrics: Optional[Iterable[str]] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return quantiles per metric for one segment."""
+        sketches = self.segments.get(segment, {})
+        return {
+            metric: sketches[metric].quantiles(quantiles)
+            for metric in (metrics or self.metrics)
+            if metric in sketches
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialize every sketch."""
+        return {
+            segment: {metric: sketch.as_dict() for metric, sketch in sketches.items()}
+            for segment, sketches in self.segments.items()
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Merge sketches produced by :meth:`as_dict`."""
+        for segment, sketches in data.items():
+            for metric, sketch in sketches.items():
+                self._sketch(segment, metric).merge(QuantileSketch.from_dict(sketch))
@@ -0,0 +1,389 @@
+"""Connection supervisor shared by every Golf Dashboard device.
+
+One :class:`ConnectionSupervisor` per Home Assistant instance owns the
+WebSocket connections of all launch monitors, so a facility with many bays
+runs one reconnect timer, one statistics timer, and a fixed pool of message
+workers instead of a reconnect loop and timers per device.
+
+* Reconnects are driven by a :class:`~.reconnect.ReconnectSchedule`: jittered
+  exponential backoff per device, first attempts spread over a stagger window,
+  and at most ``MAX_CONNECTS_PER_TICK`` attempts started per tick.
+* Each open socket has one reader task that only queues frames. Frames are
+  processed by ``MESSAGE_WORKERS`` workers; every device is pinned to one
+  worker, so its frames are handled in order.
+* The coordinators stay the per-device view: they hold the state, push entity
+  updates, and persist data, but never touch the socket.
+* The facility :class:`~.leaderboard.Leaderboard` lives here. Coordinators
+  offer each shot to it, and its sensors are refreshed through a dispatcher
+  signal whenever a board changes. The sensors are added by one loaded entry
+  and move to another when that entry unloads.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import websockets
+from websockets.client import WebSocketClientProtocol
+from websockets.exceptions import ConnectionClosed, ConnectionClosedOK, WebSocketException
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_change, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_TARGET_YARDS,
+    CONNECT_TIMEOUT,
+    DOMAIN,
+    LEADERBOARD_STORAGE_KEY,
+    MAX_CONNECTS_PER_TICK,
+    MESSAGE_QUEUE_SIZE,
+    MESSAGE_WORKERS,
+    RECONNECT_INTERVAL,
+    RECONNECT_MAX_INTERVAL,
+    RECONNECT_STAGGER,
+    RECONNECT_TICK,
+    SIGNAL_LEADERBOARD_UPDATED,
+    STATISTICS_IMPORT_MINUTE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .leaderboard import DEFAULT_TARGET_YARDS, Leaderboard, period_keys
+from .reconnect import ReconnectSchedule
+
+if TYPE_CHECKING:
+    from .coordinator import GolfDashboardCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionSupervisor:
+    """Own the connections, timers, and message workers of all devices."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the supervisor; nothing runs until a device registers."""
+        self.hass = hass
+        self._coordinators: dict[str, GolfDashboardCoordinator] = {}
+        self._schedule = ReconnectSchedule(
+            RECONNECT_INTERVAL, RECONNECT_MAX_INTERVAL, RECONNECT_STAGGER
+        )
+        self._sockets: dict[str, WebSocketClientProtocol] = {}
+        self._readers: dict[str, asyncio.Task] = {}
+        self._connecting: dict[str, asyncio.Task] = {}
+
+        # Every device is pinned to one worker so its frames stay in order
+        self._queues: list[asyncio.Queue[tuple[str, str]]] = []
+        self._workers: list[asyncio.Task] = []
+        self._shards: dict[str, int] = {}
+        self._next_shard = 0
+
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._unsub_statistics: CALLBACK_TYPE | None = None
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+
+        # Facility leaderboard; its sensors belong to one loaded entry at a time
+        self.leaderboard = Leaderboard()
+        self._leaderboard_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, LEADERBOARD_STORAGE_KEY
+        )
+        self._leaderboard_save_pending = False
+        self._leaderboard_owner: str | None = None
+        self._leaderboard_platforms: dict[str, Callable[[], None]] = {}
+
+    @property
+    def devices(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._coordinators)
+
+    @property
+    def connected(self) -> int:
+        """Return the number of devices with an open connection."""
+        return len(self._sockets)
+
+    @callback
+    def async_register(self, coordinator: GolfDashboardCoordinator) -> None:
+        """Start supervising a device; its first attempt is staggered."""
+        device = coordinator.device_id
+        self._coordinators[device] = coordinator
+        self._shards[device] = self._next_shard % MESSAGE_WORKERS
+        self._next_shard += 1
+        self._async_start()
+        self._schedule.add(device, time.monotonic())
+        self._async_tick()
+
+    async def async_unregister(self, coordinator: GolfDashboardCoordinator) -> None:
+        """Stop supervising a device and close its connection."""
+        device = coordinator.device_id
+        if self._coordinators.get(device) is not coordinator:
+            return
+        del self._coordinators[device]
+        self._shards.pop(device, None)
+        self._schedule.remove(device)
+        if self.leaderboard.end_session(device):
+            self._async_leaderboard_changed()
+        self._async_release_leaderboard(coordinator.entry_id)
+        tasks = [
+            task
+            for task in (self._connecting.pop(device, None), self._readers.pop(device, None))
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self._async_close(device)
+        if not self._coordinators:
+            await self.async_stop()
+
+    @callback
+    def _async_start(self) -> None:
+        """Start the shared timers and workers when the first device registers."""
+        if self._unsub_tick is not None:
+            return
+        self._queues = [asyncio.Queue(MESSAGE_QUEUE_SIZE) for _ in range(MESSAGE_WORKERS)]
+        self._workers = [
+            self.hass.async_create_background_task(
+                self._async_work(queue), f"{DOMAIN} message worker {index}"
+            )
+            for index, queue in enumerate(self._queues)
+        ]
+        self._unsub_tick = async_track_time_interval(
+            self.hass, self._async_tick, timedelta(seconds=RECONNECT_TICK)
+        )
+        self._unsub_statistics = async_track_time_change(
+            self.hass,
+            self._async_import_statistics,
+            minute=STATISTICS_IMPORT_MINUTE,
+            second=0,
+        )
+        # Day and week boards and daily bests roll over at local midnight
+        self._unsub_midnight = async_track_time_change(
+            self.hass, self._async_midnight, hour=0, minute=0, second=0
+        )
+
+    async def async_stop(self) -> None:
+        """Close every connection and stop the timers and workers."""
+        if self._unsub_tick:
+            self._unsub_tick()
+            self._unsub_tick = None
+        if self._unsub_statistics:
+            self._unsub_statistics()
+            self._unsub_statistics = None
+        if self._unsub_midnight:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+        tasks = [*self._connecting.values(), *self._readers.values(), *self._workers]
+        self._connecting.clear()
+        self._readers.clear()
+        self._workers = []
+        self._queues = []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for device in list(self._sockets):
+            await self._async_close(device)
+        if self._leaderboard_save_pending:
+            await self._leaderboard_store.async_save(self._leaderboard_to_save())
+
+    @callback
+    def _async_tick(self, _now: datetime | None = None) -> None:
+        """Start the connection attempts that are due, a few per tick."""
+        for device in self._schedule.due(time.monotonic(), MAX_CONNECTS_PER_TICK):
+            if device in self._coordinators and device not in self._connecting:
+                self._connecting[device] = self.hass.async_create_background_task(
+                    self._async_connect(device), f"{DOMAIN} connect {device}"
+                )
+
+    async def _async_connect(self, device: str) -> None:
+        """Make one connection attempt and reschedule the device if it fails."""
+        coordinator = self._coordinators[device]
+        uri = f"ws://{coordinator.host}:{coordinator.port}"
+        try:
+            _LOGGER.debug("Connecting to %s", uri)
+            websocket = await asyncio.wait_for(websockets.connect(uri), timeout=CONNECT_TIMEOUT)
+        # WebSocketException covers rejected handshakes and invalid URIs
+        except (OSError, asyncio.TimeoutError, WebSocketException) as err:
+            delay = self._schedule.failed(device, time.monotonic())
+            log = _LOGGER.warning if self._schedule.failures(device) == 1 else _LOGGER.debug
+            log("Failed to connect to %s: %s; retrying in %.0f seconds", uri, err, delay)
+            return
+        finally:
+            self._connecting.pop(device, None)
+
+        self._schedule.succeeded(device)
+        self._sockets[device] = websocket
+        _LOGGER.info("Connected to NOVA launch monitor at %s for Golf Dashboard", uri)
+        coordinator.async_set_connected(True)
+        self._readers[device] = self.hass.async_create_background_task(
+            self._async_read(device, websocket), f"{DOMAIN} read {device}"
+        )
+
+    async def _async_read(self, device: str, websocket: WebSocketClientProtocol) -> None:
+        """Queue every frame of one socket for its worker until it closes."""
+        try:
+            while True:
+                message = await websocket.recv()
+                if isinstance(message, bytes):
+                    message = message.decode()
+                await self._queues[self._shards[device]].put((device, message))
+        except ConnectionClosedOK:
+            _LOGGER.info("WebSocket connection to %s closed normally", device)
+        except ConnectionClosed as err:
+            _LOGGER.warning("WebSocket connection to %s closed with error: %s", device, err)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.error("Error receiving WebSocket message from %s: %s", device, err)
+        self._readers.pop(device, None)
+        await self._async_close(device)
+        if device in self._coordinators:
+            self._schedule.failed(device, time.monotonic())
+
+    async def _async_close(self, device: str) -> None:
+        """Close a device's socket and tell its coordinator."""
+        websocket = self._sockets.pop(device, None)
+        if websocket is None:
+            return
+        try:
+            await websocket.close()
+        except Exception:  # noqa: BLE001
+            pass
+        _LOGGER.debug("Disconnected from NOVA launch monitor %s", device)
+        if (coordinator := self._coordinators.get(device)) is not None:
+            coordinator.async_set_connected(False)
+
+    async def _async_work(self, queue: asyncio.Queue[tuple[str, str]]) -> None:
+        """Process queued frames of this worker's devices in arrival order."""
+        while True:
+            device, message = await queue.get()
+            try:
+                if (coordinator := self._coordinators.get(device)) is not None:
+                    await coordinator.async_process_message(message)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error processing message from %s", device)
+            finally:
+                queue.task_done()
+
+    @callback
+    def _async_import_statistics(self, now: datetime) -> None:
+        """Push every device's completed hours to long-term statistics."""
+        for coordinator in list(self._coordinators.values()):
+            coordinator.async_import_statistics(now)
+
+    async def async_load(self) -> None:
+        """Restore the leaderboard persisted before the last restart."""
+        try:
+            stored = await self._leaderboard_store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed to load the Golf Dashboard leaderboard: %s", err)
+            return
+        if stored:
+            self.leaderboard.load(stored)
+
+    @staticmethod
+    def leaderboard_periods() -> dict[str, str]:
+        """Return the current local day and week keys."""
+        return period_keys(dt_util.now())
+
+    @callback
+    def async_add_shot(
+        self, coordinator: GolfDashboardCoordinator, shot: dict[str, Any], session_id: str | None
+    ) -> None:
+        """Offer a device's shot to the facility leaderboard."""
+        timestamp = shot.get("_last_shot_timestamp")
+        when = dt_util.as_local(timestamp) if isinstance(timestamp, datetime) else dt_util.now()
+        extra = {
+            "bay": coordinator.device_name,
+            "player": shot.get("player"),
+            "time": when.isoformat(),
+        }
+        if self.leaderboard.add(
+            shot, coordinator.device_id, session_id, period_keys(when), extra
+        ):
+            self._async_leaderboard_changed()
+
+    @callback
+    def async_end_session(self, coordinator: GolfDashboardCoordinator) -> None:
+        """Drop a device's closed session from the session boards."""
+        if self.leaderboard.end_session(coordinator.device_id):
+            self._async_leaderboard_changed()
+
+    @callback
+    def _async_leaderboard_changed(self) -> None:
+        """Refresh the leaderboard sensors and schedule a coalesced save."""
+        async_dispatcher_send(self.hass, SIGNAL_LEADERBOARD_UPDATED)
+        if self._leaderboard_save_pending:
+            return
+        self._leaderboard_save_pending = True
+        self._leaderboard_store.async_delay_save(self._leaderboard_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _leaderboard_to_save(self) -> dict[str, Any]:
+        self._leaderboard_save_pending = False
+        return self.leaderboard.as_dict()
+
+    @callback
+    def _async_midnight(self, _now: datetime) -> None:
+        """Start a new day for the leaderboard sensors and every device's bests."""
+        async_dispatcher_send(self.hass, SIGNAL_LEADERBOARD_UPDATED)
+        for coordinator in list(self._coordinators.values()):
+            coordinator.async_roll_day()
+
+    @callback
+    def async_register_leaderboard_platform(
+        self, entry_id: str, add_sensors: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Register how an entry adds the leaderboard sensors; return an unregister callback.
+
+        The first entry registered owns the sensors. When the owner unloads,
+        they move to another loaded entry, so they never wait for a reload.
+        """
+        self._leaderboard_platforms[entry_id] = add_sensors
+        if self._leaderboard_owner is None:
+            self._async_home_leaderboard(entry_id)
+
+        @callback
+        def _unregister() -> None:
+            self._async_release_leaderboard(entry_id)
+
+        return _unregister
+
+    @callback
+    def _async_home_leaderboard(self, entry_id: str) -> None:
+        """Make an entry the owner, apply its target, and add the sensors there."""
+        self._leaderboard_owner = entry_id
+        self.async_update_leaderboard_target(entry_id)
+        self._leaderboard_platforms[entry_id]()
+
+    @callback
+    def _async_release_leaderboard(self, entry_id: str | None) -> None:
+        """Drop an entry's platform and re-home the sensors it owned.
+
+        Runs after the entry's platforms have unloaded, so the old sensors are
+        gone before another entry adds them under the same unique ids.
+        """
+        if entry_id is None:
+            return
+        self._leaderboard_platforms.pop(entry_id, None)
+        if self._leaderboard_owner != entry_id:
+            return
+        self._leaderboard_owner = None
+        if self._leaderboard_platforms:
+            self._async_home_leaderboard(next(iter(self._leaderboard_platforms)))
+
+    @callback
+    def async_update_leaderboard_target(self, entry_id: str) -> None:
+        """Apply the owner entry's closest-to-target distance to the leaderboard."""
+        if entry_id != self._leaderboard_owner:
+            return
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        target = entry.options.get(CONF_TARGET_YARDS, DEFAULT_TARGET_YARDS) if entry else None
+        if target is not None and self.leaderboard.set_target(float(target)):
+            self._async_leaderboard_changed()
@@ -0,0 +1,506 @@
+"""WebSocket API for the Golf Dashboard integration."""
+from __future__ import annotations
+
+from functools import partial
+import sqlite3
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_SHOT_STORE,
+    DATA_SUPERVISOR,
+    DOMAIN,
+    HISTORY_PAGE_MAX,
+    SUBSCRIBE_QUEUE_MAX,
+    SUBSCRIBE_QUEUE_SIZE,
+)
+from .columnar import session_overviews
+from .coordinator import GolfDashboardCoordinator
+from .dispersion import ClubDispersion
+from .leaderboard import WINDOWS
+from .players import PlayerAnalytics
+from .query import ShotQuery, run_query
+from .shot_store import GRANULARITIES, ShotStore
+from .shots import KEY_FIELDS, encode_columnar, page, project
+from .sketch import ALL_CLUBS, DEFAULT_QUANTILES, ClubDistributions
+from .supervisor import ConnectionSupervisor
+
+
+# Filters shared by the golf_dashboard/query command and the query_shots service
+QUERY_FIELDS: dict[Any, Any] = {
+    vol.Optional("entry_id"): str,
+    vol.Optional("player"): str,
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("session_id"): str,
+    vol.Optional("club"): str,
+    vol.Optional("club_cluster"): str,
+    vol.Optional("shot_rank"): vol.All(cv.ensure_list, [str]),
+    vol.Optional("shot_name"): vol.All(cv.ensure_list, [str]),
+    vol.Optional("ranges"): {
+        str: {vol.Optional("min"): vol.Coerce(float), vol.Optional("max"): vol.Coerce(float)}
+    },
+    vol.Optional("fields"): vol.All(cv.ensure_list, [str]),
+    vol.Optional("aggregate"): vol.All(cv.ensure_list, [str]),
+    vol.Optional("limit", default=100): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=HISTORY_PAGE_MAX)
+    ),
+    vol.Optional("cursor"): vol.ExactSequence([vol.Coerce(float), int]),
+}
+
+
+async def async_query_shots(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    """Run a shot store query described by ``QUERY_FIELDS`` data.
+
+    Invalid queries raise :class:`ServiceValidationError`; a missing store or a
+    failed read raises :class:`HomeAssistantError`.
+    """
+    store: ShotStore | None = hass.data.get(DATA_SHOT_STORE)
+    if store is None:
+        raise HomeAssistantError("No Golf Dashboard device is set up.")
+    start, end = data.get("start"), data.get("end")
+    try:
+        query = ShotQuery(
+            device=data.get("entry_id"),
+            player=data.get("player"),
+            start_ts=dt_util.as_utc(start).timestamp() if start else None,
+            end_ts=dt_util.as_utc(end).timestamp() if end else None,
+            session_id=data.get("session_id"),
+            club=data.get("club"),
+            club_cluster=data.get("club_cluster"),
+            shot_rank=data.get("shot_rank") or (),
+            shot_name=data.get("shot_name") or (),
+            ranges={
+                metric: (bounds.get("min"), bounds.get("max"))
+                for metric, bounds in (data.get("ranges") or {}).items()
+            },
+            fields=data.get("fields") or (),
+            aggregate=data.get("aggregate") or (),
+            limit=data["limit"],
+            before=tuple(data["cursor"]) if data.get("cursor") else None,  # type: ignore[arg-type]
+        )
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+
+    # Include shots still waiting for their batch write.
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        await coordinator.async_flush_store()
+    try:
+        return await hass.async_add_executor_job(run_query, store, query)
+    except sqlite3.Error as err:
+        raise HomeAssistantError(f"Shot query failed: {err}") from err
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Golf Dashboard websocket commands."""
+    websocket_api.async_register_command(hass, ws_history)
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_distributions)
+    websocket_api.async_register_command(hass, ws_dispersion)
+    websocket_api.async_register_command(hass, ws_trends)
+    websocket_api.async_register_command(hass, ws_sessions)
+    websocket_api.async_register_command(hass, ws_query)
+    websocket_api.async_register_command(hass, ws_leaderboard)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> GolfDashboardCoordinator | None:
+    """Resolve the coordinator addressed by a message, sending an error if none."""
+    coordinators: dict[str, GolfDashboardCoordinator] = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id")
+    if entry_id is None and len(coordinators) == 1:
+        return next(iter(coordinators.values()))
+    if entry_id in coordinators:
+        return coordinators[entry_id]
+    connection.send_error(
+        msg["id"],
+        websocket_api.ERR_NOT_FOUND,
+        "Unknown entry_id" if entry_id else "entry_id is required with multiple devices",
+    )
+    return None
+
+
+def _select_coordinators(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> list[GolfDashboardCoordinator] | None:
+    """Return the addressed coordinator, or every coordinator when no entry_id is given."""
+    if "entry_id" not in msg:
+        return list(hass.data.get(DOMAIN, {}).values())
+    coordinator = _get_coordinator(hass, connection, msg)
+    return [coordinator] if coordinator is not None else None
+
+
+def _club_segments(
+    selected: list[PlayerAnalytics], msg: dict[str, Any]
+) -> list[str] | None:
+    """Return the segments to merge for a per-club query.
+
+    Learned club ids are local to one device, so merging several devices only
+    combines their ``all`` segments.
+    """
+    if len(selected) > 1:
+        return [ALL_CLUBS]
+    return msg.get("clubs")
+
+
+def _club_clusters(selected: list[PlayerAnalytics]) -> list[dict[str, Any]]:
+    """Describe the learned clubs when a single device is addressed."""
+    return selected[0].clusters.describe() if len(selected) == 1 else []
+
+
+async def _player_analytics(
+    coordinators: list[GolfDashboardCoordinator], msg: dict[str, Any]
+) -> list[PlayerAnalytics]:
+    """Return the analytics of the requested player (default: the active one) per device.
+
+    Devices that have never seen the player are skipped; an evicted player's
+    state is loaded from storage.
+    """
+    player = msg.get("player")
+    if player is None:
+        return [coordinator.analytics for coordinator in coordinators]
+    return [
+        await coordinator.async_player_analytics(player)
+        for coordinator in coordinators
+        if player in coordinator.players
+    ]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/history",
+        vol.Optional("entry_id"): str,
+        vol.Optional("fields"): [str],
+        # A shot seq within the ring buffer, or a [ts, id] shot store cursor
+        vol.Optional("before"): vol.Any(
+            int, vol.All([vol.Coerce(float)], vol.Length(min=2, max=2))
+        ),
+        vol.Optional("limit", default=100): vol.All(int, vol.Range(min=1, max=HISTORY_PAGE_MAX)),
+        vol.Optional("columnar", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a page of shots, newest page first.
+
+    Pages come from the in-memory ring buffer; once the cursor reaches its
+    oldest shot, paging continues from the shot store with a ``[ts, id]``
+    cursor.
+    """
+    coordinator = _get_coordinator(hass, connection, msg)
+    if coordinator is None:
+        return
+
+    before, limit = msg.get("before"), msg["limit"]
+    history, store = coordinator.history, coordinator.shot_store
+    records: list[dict[str, Any]] = []
+    next_cursor: Any = None
+    store_before: tuple[float, int] | None = None
+    if isinstance(before, list):
+        store_before = (before[0], int(before[1]))
+    else:
+        records, next_cursor = page(history, before, limit)
+        if next_cursor is None and store is not None and history:
+            # Continue with stored shots older than the buffer's oldest one
+            store_before = (history[0]["ts"], 0)
+            if len(records) == limit:
+                next_cursor = list(store_before)
+    if store is not None and next_cursor is None and len(records) < limit:
+        try:
+            older, next_cursor = await hass.async_add_executor_job(
+                store.page_before, coordinator.device_id, store_before, limit - len(records)
+            )
+        except sqlite3.Error as err:
+            connection.send_error(msg["id"], websocket_api.ERR_HOME_ASSISTANT_ERROR, str(err))
+            return
+        records = older + records
+    fields = msg.get("fields")
+    result: dict[str, Any] = {"next_cursor": next_cursor}
+
+    if msg["columnar"]:
+        if fields:
+            columns = [*KEY_FIELDS, *(field for field in fields if field not in KEY_FIELDS)]
+        else:
+            columns = sorted({key for record in records for key in record})
+        result["columns"] = encode_columnar(records, columns)
+    else:
+        result["shots"] = [project(record, fields) for record in records]
+
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/subscribe",
+        vol.Optional("entry_id"): str,
+        vol.Optional("fields"): [str],
+        vol.Optional("maxsize", default=SUBSCRIBE_QUEUE_SIZE): vol.All(
+            int, vol.Range(min=1, max=SUBSCRIBE_QUEUE_MAX)
+        ),
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Push each new shot to the client as one event message.
+
+    Every subscriber gets its own bounded queue; when a client falls behind the
+    oldest queued shots are dropped and the running count is reported. When the
+    device is unloaded the client gets a final ``{"end": true}`` event and the
+    subscription is removed.
+    """
+    coordinator = _get_coordinator(hass, connection, msg)
+    if coordinator is None:
+        return
+
+    queue, unsubscribe = coordinator.async_subscribe_shots(msg.get("fields"), msg["maxsize"])
+
+    async def _forward() -> None:
+        async for record in queue:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"shot": record, "dropped": queue.dropped}
+                )
+            )
+        # The coordinator closed the queue on shutdown
+        connection.subscriptions.pop(msg["id"], None)
+        unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"end": True, "dropped": queue.dropped})
+        )
+
+    task = hass.async_create_background_task(
+        _forward(), f"{DOMAIN} shot subscription {msg['id']}"
+    )
+
+    @callback
+    def _unsubscribe() -> None:
+        unsubscribe()
+        task.cancel()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/distributions",
+        vol.Optional("entry_id"): str,
+        vol.Optional("player"): str,
+        vol.Optional("scope", default="all"): vol.In(("all", "session")),
+        vol.Optional("clubs"): [str],
+        vol.Optional("metrics"): [str],
+        vol.Optional("quantiles", default=list(DEFAULT_QUANTILES)): [
+            vol.All(vol.Coerce(float), vol.Range(min=0, max=1))
+        ],
+    }
+)
+@websocket_api.async_response
+async def ws_distributions(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return percentiles per learned club from one player's quantile sketches.
+
+    Without ``entry_id`` the sketches of every configured device are merged,
+    giving an aggregate view across bays without reading stored shots.
+    """
+    coordinators = _select_coordinators(hass, connection, msg)
+    if coordinators is None:
+        return
+
+    selected = await _player_analytics(coordinators, msg)
+    merged = ClubDistributions.merged(
+        (analytics.distribution_view(msg["scope"]) for analytics in selected),
+        segments=_club_segments(selected, msg),
+    )
+    connection.send_result(
+        msg["id"],
+        {
+            "devices": len(selected),
+            "clubs": _club_clusters(selected),
+            "segments": {
+                segment: merged.summary(segment, msg.get("metrics"), msg["quantiles"])
+                for segment in sorted(merged.segments)
+            },
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/dispersion",
+        vol.Optional("entry_id"): str,
+        vol.Optional("player"): str,
+        vol.Optional("clubs"): [str],
+        vol.Optional("grid", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_dispersion(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return dispersion ellipses and landing heat map grids per learned club.
+
+    Grid cells are sparse ``[row, col, count]`` triples; without ``entry_id``
+    every device's aggregates are merged.
+    """
+    coordinators = _select_coordinators(hass, connection, msg)
+    if coordinators is None:
+        return
+
+    selected = await _player_analytics(coordinators, msg)
+    merged = ClubDispersion()
+    for analytics in selected:
+        merged.merge(analytics.dispersion, _club_segments(selected, msg))
+    connection.send_result(
+        msg["id"],
+        {
+            "devices": len(selected),
+            "clubs": _club_clusters(selected),
+            "segments": {
+                segment: merged.summary(segment, include_grid=msg["grid"])
+                for segment in sorted(merged.segments)
+            },
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/trends",
+        vol.Optional("entry_id"): str,
+        vol.Optional("player"): str,
+        vol.Optional("club", default=ALL_CLUBS): str,
+        vol.Optional("granularity", default="day"): vol.In(tuple(GRANULARITIES)),
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("metrics"): [str],
+    }
+)
+@websocket_api.async_response
+async def ws_trends(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return hourly or daily statistics per metric from the shot store rollups.
+
+    Buckets are UTC-aligned. Filters on device, player, and club class select
+    pre-aggregated rows, so the cost does not grow with stored history.
+    """
+    store: ShotStore | None = hass.data.get(DATA_SHOT_STORE)
+    if store is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No shot store")
+        return
+
+    # Include shots still waiting for their batch write.
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        await coordinator.async_flush_store()
+
+    start, end = msg.get("start"), msg.get("end")
+    buckets = await hass.async_add_executor_job(
+        partial(
+            store.rollups,
+            msg["granularity"],
+            start_ts=dt_util.as_utc(start).timestamp() if start else None,
+            end_ts=dt_util.as_utc(end).timestamp() if end else None,
+            device=msg.get("entry_id"),
+            player=msg.get("player"),
+            club=msg["club"],
+            metrics=msg.get("metrics"),
+        )
+    )
+    connection.send_result(msg["id"], {"granularity": msg["granularity"], "buckets": buckets})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/sessions",
+        vol.Optional("entry_id"): str,
+        vol.Optional("fields"): [str],
+        vol.Optional("limit", default=20): vol.All(int, vol.Range(min=1, max=HISTORY_PAGE_MAX)),
+        vol.Optional("columns", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_sessions(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return recent closed sessions with per-metric statistics, newest first.
+
+    Sessions are read from memory-mapped columnar files, so no rows are parsed;
+    ``columns: true`` adds the per-shot columns for charting.
+    """
+    coordinator = _get_coordinator(hass, connection, msg)
+    if coordinator is None:
+        return
+
+    sessions = await hass.async_add_executor_job(
+        partial(
+            session_overviews,
+            coordinator.session_files_dir,
+            msg.get("fields"),
+            msg["limit"],
+            msg["columns"],
+        )
+    )
+    connection.send_result(msg["id"], {"sessions": sessions})
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "golf_dashboard/query", **QUERY_FIELDS}
+)
+@websocket_api.async_response
+async def ws_query(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return stored shots or aggregates matching indexed filters and metric ranges.
+
+    Aggregate-only queries on rollup dimensions are answered from the rollups;
+    the result names the plan used.
+    """
+    data = {key: value for key, value in msg.items() if key not in ("id", "type")}
+    try:
+        result = await async_query_shots(hass, data)
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_HOME_ASSISTANT_ERROR, str(err))
+        return
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "golf_dashboard/leaderboard",
+        vol.Optional("windows"): [vol.In(WINDOWS)],
+    }
+)
+@callback
+def ws_leaderboard(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the facility top-K boards across every bay, best shot first.
+
+    Boards are kept incrementally per shot, so this never reads history.
+    """
+    supervisor: ConnectionSupervisor | None = hass.data.get(DATA_SUPERVISOR)
+    if supervisor is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No device is set up")
+        return
+    boards = supervisor.leaderboard.summary(supervisor.leaderboard_periods())
+    windows = msg.get("windows") or WINDOWS
+    connection.send_result(
+        msg["id"], {"boards": {window: boards[window] for window in windows}}
+    )
@@ -0,0 +1,189 @@
+"""Tests for the streaming analytics helpers."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+ANALYTICS_PATH = ROOT / "custom_components" / "golf_dashboard" / "analytics.py"
+
+spec = importlib.util.spec_from_file_location("golf_dashboard_analytics", ANALYTICS_PATH)
+analytics = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = analytics
+spec.loader.exec_module(analytics)  # type: ignore[attr-defined]
+
+HOUR = analytics.SECONDS_PER_HOUR
+
+
+def test_hourly_statistics_buckets_and_pops_completed_hours():
+    stats = analytics.HourlyStatistics(["carry_distance_yards", "ball_speed_meters_per_second"])
+    stats.add(10 * HOUR + 5, {"carry_distance_yards": 150.0, "ball_speed_meters_per_second": 50.0})
+    stats.add(10 * HOUR + 900, {"carry_distance_yards": 170.0})
+    stats.add(11 * HOUR + 1, {"carry_distance_yards": 200.0, "shot_rank": "A"})
+
+    completed = stats.pop_completed(11 * HOUR + 300)
+
+    assert len(completed) == 1
+    hour, shot_count, summaries = completed[0]
+    assert hour == 10 * HOUR
+    assert shot_count == 2
+    carry = summaries["carry_distance_yards"]
+    assert (carry.count, carry.minimum, carry.maximum) == (2, 150.0, 170.0)
+    assert carry.mean == pytest.approx(160.0)
+    assert summaries["ball_speed_meters_per_second"].count == 1
+    # The current hour stays pending until it is over.
+    assert len(stats) == 1
+
+
+def test_hourly_statistics_round_trips_through_dict():
+    stats = analytics.HourlyStatistics(["carry_distance_yards"])
+    stats.add(3 * HOUR, {"carry_distance_yards": 120.0})
+    stats.add(3 * HOUR + 60, {"carry_distance_yards": 140.0})
+
+    restored = analytics.HourlyStatistics(["carry_distance_yards"])
+    restored.load(stats.as_dict())
+    restored.add(3 * HOUR + 120, {"carry_distance_yards": 100.0})
+
+    (_, shot_count, summaries), = restored.pop_completed(4 * HOUR)
+    assert shot_count == 3
+    carry = summaries["carry_distance_yards"]
+    assert (carry.count, carry.minimum, carry.maximum) == (3, 100.0, 140.0)
+    assert carry.mean == pytest.approx(120.0)
+
+
+def test_session_tracker_splits_on_idle_gap_and_counter_reset():
+    tracker = analytics.SessionTracker(1800, ["carry_distance_yards"])
+    assert tracker.add_shot(1000.0, {"shot_number": 1, "carry_distance_yards": 150.0, "shot_rank": "A"}) is None
+    assert tracker.add_shot(1100.0, {"shot_number": 2, "carry_distance_yards": 170.0, "shot_rank": "B"}) is None
+
+    # Counter reset starts a new session even without an idle gap.
+    closed = tracker.add_shot(1200.0, {"shot_number": 1, "carry_distance_yards": 90.0})
+    assert closed is not None
+    summary = closed.summary()
+    assert summary["session_id"] == "1000"
+    assert summary["shot_count"] == 2
+    assert summary["avg_carry_distance_yards"] == pytest.approx(160.0)
+    assert summary["best_carry_yards"] == 170.0
+    assert summary["rank_distribution"] == {"A": 1, "B": 1}
+    assert summary["duration_seconds"] == 100.0
+
+    # A long pause also starts a new session.
+    closed = tracker.add_shot(1200.0 + 1801, {"shot_number": 2})
+    assert closed is not None and closed.id == "1200"
+    assert tracker.current.id == "3001"
+
+
+def test_session_tracker_closes_idle_session_and_round_trips():
+    tracker = analytics.SessionTracker(1800, ["carry_distance_yards"])
+    tracker.add_shot(0.0, {"shot_number": 1, "carry_distance_yards": 100.0})
+
+    restored = analytics.SessionTracker(1800, ["carry_distance_yards"])
+    restored.load(tracker.as_dict())
+    restored.add_shot(60.0, {"shot_number": 2, "carry_distance_yards": 120.0})
+
+    assert restored.close_if_idle(1000.0) is None
+    closed = restored.close_if_idle(1860.0)
+    assert closed is not None
+    assert closed.summary()["avg_carry_distance_yards"] == pytest.approx(110.0)
+    assert restored.current is None
+
+
+def test_running_stats_match_batch_statistics_and_merge():
+    values = [150.0, 162.5, 171.0, 148.0, 158.5]
+    stats = analytics.RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stddev == pytest.approx(statistics.stdev(values))
+    assert (stats.minimum, stats.maximum) == (148.0, 171.0)
+
+    left, right = analytics.RunningStats(), analytics.RunningStats()
+    for value in values[:2]:
+        left.add(value)
+    for value in values[2:]:
+        right.add(value)
+    left.merge(right)
+    assert left.count == 5
+    assert left.stddev == pytest.approx(stats.stddev)
+
+    restored = analytics.RunningStats.from_dict(stats.as_dict())
+    assert restored.summary() == stats.summary()
+
+
+def test_window_stats_track_only_the_last_values():
+    values = [5.0, 1.0, 9.0, 3.0, 7.0, 2.0, 8.0, 8.0, 4.0]
+    window = analytics.WindowStats(4)
+    for index, value in enumerate(values):
+        window.add(value)
+        expected = values[max(0, index - 3): index + 1]
+        summary = window.summary()
+        assert summary["count"] == len(expected)
+        assert summary["mean"] == pytest.approx(statistics.mean(expected))
+        assert summary["min"] == min(expected)
+        assert summary["max"] == max(expected)
+        if len(expected) > 1:
+            assert summary["stddev"] == pytest.approx(statistics.stdev(expected))
+
+
+def test_rolling_statistics_round_trip():
+    rolling = analytics.RollingStatistics(["carry_distance_yards"], 3)
+    for carry in (100.0, 110.0, 120.0, 130.0):
+        rolling.add({"carry_distance_yards": carry, "shot_name": "Draw"})
+
+    restored = analytics.RollingStatistics(["carry_distance_yards"], 3)
+    restored.load(rolling.as_dict())
+    assert restored.summary() == rolling.summary()
+    assert restored.summary()["carry_distance_yards"]["mean"] == pytest.approx(120.0)
+
+
+def test_shot_windows_match_brute_force_means():
+    rng = random.Random(7)
+    ranks = ["S+", "S", "A", "B", "C", "D", "E"]
+    shots = [
+        {
+            "carry_distance_yards": rng.uniform(80.0, 260.0),
+            "offline_distance_yards": rng.uniform(-30.0, 30.0),
+            "smash_factor": rng.uniform(1.2, 1.5) if index % 7 else None,
+            "shot_rank": rng.choice(ranks),
+        }
+        for index in range(60)
+    ]
+    windows = analytics.ShotWindows([10, 5, 10])
+    assert windows.sizes == (5, 10)
+    for index, shot in enumerate(shots):
+        windows.add(shot)
+        summary = windows.summary()
+        for size in windows.sizes:
+            recent = shots[max(0, index + 1 - size): index + 1]
+            window = summary[f"last_{size}"]
+            assert window["shot_count"] == len(recent)
+            assert window["avg_carry"] == pytest.approx(
+                statistics.mean(shot["carry_distance_yards"] for shot in recent)
+            )
+            smash = [shot["smash_factor"] for shot in recent if shot["smash_factor"] is not None]
+            assert window["avg_smash"] == pytest.approx(statistics.mean(smash) if smash else None)
+            good = sum(shot["shot_rank"] in ("S+", "S", "A") for shot in recent)
+            assert window["a_or_better_rate"] == pytest.approx(100.0 * good / len(recent))
+
+
+def test_shot_windows_skip_missing_values_and_reload():
+    windows = analytics.ShotWindows([3])
+    assert windows.summary()["last_3"] == {
+        "shot_count": 0,
+        "avg_carry": None,
+        "avg_offline": None,
+        "a_or_better_rate": None,
+        "avg_smash": None,
+    }
+    shots = [{"carry_distance_yards": carry, "shot_rank": "B"} for carry in (100.0, 110.0, 120.0, 130.0)]
+    windows.load(shots)
+    summary = windows.summary()["last_3"]
+    assert summary["avg_carry"] == pytest.approx(120.0)
+    assert summary["a_or_better_rate"] == 0.0
+    assert summary["avg_offline"] is None
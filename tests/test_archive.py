@@ -0,0 +1,97 @@
+"""Tests for the quantized shot archive and re-derivation on read."""
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+archive = importlib.import_module("golf_dashboard_pure.archive")
+derived = importlib.import_module("golf_dashboard_pure.derived")
+shot_import = importlib.import_module("golf_dashboard_pure.shot_import")
+shot_store = importlib.import_module("golf_dashboard_pure.shot_store")
+
+DAY = 1767225600.0
+
+
+def _records(count: int, start: float) -> list:
+    rows = [
+        {
+            "ts": start + index * 60,
+            "ball_speed_meters_per_second": 60.0 + index * 0.137,
+            "vertical_launch_angle_degrees": 14.23,
+            "horizontal_launch_angle_degrees": -1.27,
+            "total_spin_rpm": 5123.4,
+            "spin_axis_degrees": 3.41,
+            "shot_number": index + 1,
+            "session_id": "s1",
+            "player": "Alex",
+        }
+        for index in range(count)
+    ]
+    return shot_import.derive_records(rows)
+
+
+def test_encoding_is_quantized_and_flags_missing_fields():
+    blob = shot_store.encode_archived(
+        {"ball_speed_meters_per_second": 61.237, "total_spin_rpm": 99999.0, "spin_axis_degrees": -4.26}
+    )
+    assert len(blob) == 16
+    assert shot_store.decode_archived(blob) == {
+        "ball_speed_meters_per_second": 61.24,
+        "total_spin_rpm": 0xFFFF,  # clamped
+        "spin_axis_degrees": -4.3,
+    }
+
+
+def test_archived_shots_are_rederived_and_much_smaller(tmp_path):
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+    originals = _records(20, DAY)
+    store.insert_many("bay1", originals)
+    store.insert_many("bay1", _records(2, DAY + 86400))
+    json_bytes = sum(len(json.dumps(record, separators=(",", ":"))) for record in originals)
+
+    assert store.archive("bay1", DAY + 86400) == 20
+    blob_bytes = store.conn.execute("SELECT SUM(LENGTH(data)) FROM archive").fetchone()[0]
+    assert blob_bytes * 20 < json_bytes
+
+    history = list(archive.iter_history(store, chunk_size=7, device="bay1"))
+    assert len(history) == 22
+    restored = history[:20]
+    assert [record["shot_number"] for record in restored] == list(range(1, 21))
+    for original, record in zip(originals, restored):
+        assert record["ts"] == original["ts"]
+        assert record["session_id"] == "s1" and record["player"] == "Alex"
+        assert record["model_version"] == derived.DERIVED_MODEL_VERSION
+        assert record["carry_distance_yards"] == pytest.approx(original["carry_distance_yards"], abs=0.5)
+
+    assert len(list(archive.iter_history(store, include_archive=False))) == 2
+    assert len(list(archive.iter_history(store, player="Alex", start_ts=DAY + 600))) == 12
+    store.close()
+
+
+def test_archived_shots_keep_learned_club_and_outlier_flags(tmp_path):
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+    records = _records(3, DAY)
+    records[0].update(club_cluster="c1", outlier_reason=None, outlier_excluded=False)
+    records[1].update(club_cluster="c2", outlier_reason="carry_distance_yards", outlier_excluded=True)
+    store.insert_many("bay1", records)
+
+    assert store.archive("bay1", DAY + 86400) == 3
+    store.rename_cluster("bay1", "Alex", "c2", "c1")
+    restored = list(archive.iter_history(store, device="bay1"))
+    assert [record["club_cluster"] for record in restored] == ["c1", "c1", None]
+    assert [record["outlier_reason"] for record in restored] == [None, "carry_distance_yards", None]
+    assert [record["outlier_excluded"] for record in restored] == [False, True, False]
+    assert len(list(archive.iter_history(store, player="Alex", club_cluster="c1"))) == 2
+    store.close()
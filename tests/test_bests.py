@@ -0,0 +1,155 @@
+"""Tests for per-device personal bests and their seeding from rollups."""
+from __future__ import annotations
+
+import importlib
+import random
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+bests = importlib.import_module("golf_dashboard_pure.bests")
+shot_import = importlib.import_module("golf_dashboard_pure.shot_import")
+shot_store = importlib.import_module("golf_dashboard_pure.shot_store")
+
+DAY = 1767225600.0
+
+
+def _records(count: int, start: float, seed: int, session: str = "s1") -> list:
+    rng = random.Random(seed)
+    rows = [
+        {
+            "ts": start + index * 900,
+            "ball_speed_meters_per_second": rng.uniform(40.0, 75.0),
+            "vertical_launch_angle_degrees": rng.uniform(8.0, 20.0),
+            "horizontal_launch_angle_degrees": rng.uniform(-6.0, 6.0),
+            "total_spin_rpm": rng.uniform(2500.0, 8000.0),
+            "spin_axis_degrees": rng.uniform(-15.0, 15.0),
+            "shot_number": index + 1,
+            "session_id": session,
+            "player": "Alex",
+        }
+        for index in range(count)
+    ]
+    return shot_import.derive_records(rows)
+
+
+def _brute_force(records, metric):
+    scored = [(metric.value(record), record) for record in records]
+    scored = [(value, record) for value, record in scored if value is not None]
+    pick = max if metric.higher_is_better else min
+    return pick(scored, key=lambda item: item[0])[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+    yield store
+    store.close()
+
+
+def test_bests_update_incrementally_and_reset_per_window():
+    tracker = bests.BestShots()
+    assert tracker.add({"carry_distance_yards": 150.0, "offline_distance_yards": -6.0}, "s1", "d1")
+    assert tracker.add({"carry_distance_yards": 170.0, "offline_distance_yards": 2.0}, "s1", "d1")
+    assert not tracker.add({"carry_distance_yards": 120.0, "offline_distance_yards": 9.0}, "s1", "d1")
+    assert tracker.best("session", "straightest")["offline_distance_yards"] == 2.0
+
+    tracker.add({"carry_distance_yards": 140.0, "offline_distance_yards": -1.0}, "s2", "d1")
+    assert tracker.best("session", "longest_carry")["value"] == 140.0
+    assert tracker.best("day", "longest_carry")["value"] == 170.0
+    assert tracker.best("day", "straightest")["value"] == 1.0
+
+    assert tracker.roll_day("d2")
+    assert not tracker.roll_day("d2")
+    summary = tracker.summary()
+    assert summary["day"] == {}
+    assert summary["all_time"]["longest_carry"]["value"] == 170.0
+    assert summary["session"]["longest_carry"]["value"] == 140.0
+
+
+def test_seeding_matches_a_full_scan_and_reads_few_rows(store):
+    days = [_records(40, DAY + day * 86400, seed=day, session=f"s{day}") for day in range(5)]
+    for records in days:
+        store.insert_many("bay1", records)
+    store.insert_many("bay2", [{**record, "carry_distance_yards": 999.0} for record in days[0]])
+    everything = [record for records in days for record in records]
+
+    selects = []
+    original_select = store.select
+
+    def _counting_select(sql, params=()):
+        selects.append(sql)
+        return original_select(sql, params)
+
+    store.select = _counting_select
+    seeded = bests.seed_best_shots(store, "bay1", "s4", DAY + 4 * 86400)
+    for metric in bests.BEST_METRICS:
+        assert metric.value(seeded["all_time"][metric.key]) == pytest.approx(
+            _brute_force(everything, metric), abs=bests.SEED_TOLERANCE
+        )
+        assert metric.value(seeded["day"][metric.key]) == pytest.approx(
+            _brute_force(days[4], metric), abs=bests.SEED_TOLERANCE
+        )
+        assert metric.value(seeded["session"][metric.key]) == pytest.approx(
+            _brute_force(days[4], metric)
+        )
+    # One bucket read per window for metrics whose rollup bound is exact;
+    # |offline| reads at most one per candidate bucket (5 days, 10 hours, 1 session).
+    exact = [sql for sql in selects if "offline_distance_yards" not in sql]
+    assert len(exact) == 3 * 3
+    assert len(selects) - len(exact) <= 16
+
+    tracker = bests.BestShots()
+    tracker.load(seeded, "s4", "d4")
+    assert tracker.best("all_time", "longest_carry")["session_id"] in {f"s{day}" for day in range(5)}
+    assert tracker.best("all_time", "longest_carry")["value"] < 999.0
+
+
+def test_seeding_rederives_archived_bests(store):
+    old = _records(30, DAY, seed=11)
+    new = _records(5, DAY + 86400, seed=12, session="s2")
+    best_old = max(record["carry_distance_yards"] for record in old)
+    for record in new:
+        record["carry_distance_yards"] = min(record["carry_distance_yards"], best_old - 20.0)
+    store.insert_many("bay1", old + new)
+    assert store.archive("bay1", DAY + 86400) == 30
+
+    seeded = bests.seed_best_shots(store, "bay1", None, DAY + 86400)
+    assert seeded["all_time"]["longest_carry"]["carry_distance_yards"] == pytest.approx(best_old, abs=0.5)
+    assert seeded["session"] == {}
+    assert seeded["day"]["longest_carry"]["session_id"] == "s2"
+
+
+def test_seeding_skips_mishits_and_excluded_outliers(store):
+    records = _records(20, DAY, seed=21)
+    best = max(records, key=lambda record: record["carry_distance_yards"])
+    worm = {**best, "ts": best["ts"] + 1, "carry_distance_yards": 400.0, "shot_name": "Worm Burner"}
+    flagged = {**best, "ts": best["ts"] + 2, "carry_distance_yards": 390.0, "outlier_excluded": True}
+    store.insert_many("bay1", records + [worm, flagged])
+
+    seeded = bests.seed_best_shots(store, "bay1", "s1", DAY)
+    for window in bests.BEST_WINDOWS:
+        assert seeded[window]["longest_carry"]["carry_distance_yards"] == best["carry_distance_yards"]
+
+
+def test_archived_excluded_outliers_are_not_seeded(store):
+    records = _records(10, DAY, seed=31)
+    best = max(records, key=lambda record: record["carry_distance_yards"])
+    flagged = shot_import.derive_records(
+        [{**best, "ts": best["ts"] + 1, "ball_speed_meters_per_second": 80.0}]
+    )[0]
+    flagged["outlier_excluded"] = True
+    store.insert_many("bay1", records + [flagged])
+    assert store.archive("bay1", DAY + 86400) == 11
+
+    seeded = bests.seed_best_shots(store, "bay1", None, DAY + 86400)
+    assert seeded["all_time"]["longest_carry"]["ts"] == best["ts"]
@@ -0,0 +1,94 @@
+"""Tests for the online club clustering."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CLUSTERS_PATH = ROOT / "custom_components" / "golf_dashboard" / "clusters.py"
+
+spec = importlib.util.spec_from_file_location("golf_dashboard_clusters", CLUSTERS_PATH)
+clusters = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = clusters
+spec.loader.exec_module(clusters)  # type: ignore[attr-defined]
+
+MPH = clusters.MPS_TO_MPH
+
+# (ball speed mph, launch degrees, spin rpm) for a small bag
+BAG = {
+    "driver": (150.0, 12.0, 2600.0),
+    "seven_iron": (118.0, 17.0, 6500.0),
+    "wedge": (90.0, 28.0, 9000.0),
+}
+
+
+def _shot(rng, speed, launch, spin):
+    return {
+        "ball_speed_meters_per_second": rng.gauss(speed, 2.0) / MPH,
+        "vertical_launch_angle_degrees": rng.gauss(launch, 1.0),
+        "total_spin_rpm": rng.gauss(spin, 300.0),
+    }
+
+
+def test_learns_one_cluster_per_club():
+    rng = random.Random(5)
+    clusterer = clusters.ClubClusterer()
+    assigned = {club: set() for club in BAG}
+    for _ in range(60):
+        for club, centre in BAG.items():
+            cluster_id, merged = clusterer.assign(_shot(rng, *centre))
+            assert merged is None
+            assigned[club].add(cluster_id)
+
+    assert all(len(ids) == 1 for ids in assigned.values())
+    assert len(set.union(*assigned.values())) == 3
+    fastest = clusterer.describe()[0]
+    assert abs(fastest["ball_speed_mph"] - 150.0) < 2.0
+    assert fastest["shots"] == 60
+
+
+def test_memory_is_bounded_by_merging_closest_clusters():
+    clusterer = clusters.ClubClusterer(max_clusters=2, min_shots=1)
+    first, _ = clusterer.assign({"ball_speed_meters_per_second": 60.0, "vertical_launch_angle_degrees": 12.0, "total_spin_rpm": 2500.0})
+    clusterer.assign({"ball_speed_meters_per_second": 60.5, "vertical_launch_angle_degrees": 12.0, "total_spin_rpm": 2500.0})
+    second, _ = clusterer.assign({"ball_speed_meters_per_second": 50.0, "vertical_launch_angle_degrees": 18.0, "total_spin_rpm": 6000.0})
+    third, merged = clusterer.assign({"ball_speed_meters_per_second": 40.0, "vertical_launch_angle_degrees": 28.0, "total_spin_rpm": 9000.0})
+
+    assert len(clusterer.clusters) == 2
+    assert merged == (second, first)
+    assert set(clusterer.clusters) == {first, third}
+
+
+def test_stray_shots_are_pruned_before_established_clubs_merge():
+    rng = random.Random(8)
+    clusterer = clusters.ClubClusterer(max_clusters=3, min_shots=5)
+    ids = {}
+    for _ in range(10):
+        for club in ("seven_iron", "wedge"):
+            ids[club], _ = clusterer.assign(_shot(rng, *BAG[club]))
+    centre = clusterer.clusters[ids["wedge"]].center
+
+    # Two strays far from both clubs: the first fills the bag, the second
+    # makes room by folding the first into its nearest club.
+    stray, merged = clusterer.assign({"ball_speed_meters_per_second": 20.0, "vertical_launch_angle_degrees": 45.0, "total_spin_rpm": 1000.0})
+    assert merged is None
+    other, merged = clusterer.assign({"ball_speed_meters_per_second": 80.0, "vertical_launch_angle_degrees": 2.0, "total_spin_rpm": 500.0})
+    assert merged == (stray, ids["wedge"])
+    assert set(clusterer.clusters) == {ids["seven_iron"], ids["wedge"], other}
+    assert clusterer.clusters[ids["wedge"]].center == centre
+    assert clusterer.clusters[ids["wedge"]].count == 11
+
+
+def test_missing_features_and_round_trip():
+    clusterer = clusters.ClubClusterer()
+    assert clusterer.assign({"ball_speed_meters_per_second": 60.0}) == (None, None)
+    cluster_id, _ = clusterer.assign({"ball_speed_meters_per_second": 60.0, "vertical_launch_angle_degrees": 12.0, "total_spin_rpm": 2500.0})
+
+    restored = clusters.ClubClusterer()
+    restored.load(clusterer.as_dict())
+    assert restored.describe() == clusterer.describe()
+    new_id, _ = restored.assign({"ball_speed_meters_per_second": 30.0, "vertical_launch_angle_degrees": 40.0, "total_spin_rpm": 10000.0})
+    assert new_id != cluster_id
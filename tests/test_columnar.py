@@ -0,0 +1,79 @@
+"""Tests for memory-mapped columnar session files."""
+from __future__ import annotations
+
+import importlib
+import math
+import statistics
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+columnar = importlib.import_module("golf_dashboard_pure.columnar")
+derived = importlib.import_module("golf_dashboard_pure.derived")
+
+
+def _records() -> list:
+    records = []
+    for index in range(5):
+        shot = {
+            "ts": 1000.0 + index,
+            "ball_speed_meters_per_second": 60.0 + index,
+            "vertical_launch_angle_degrees": 14.0,
+            "horizontal_launch_angle_degrees": 1.0,
+            "total_spin_rpm": 5000.0,
+            "spin_axis_degrees": 2.0,
+        }
+        shot.update(derived.compute_derived_from_shot(60.0 + index, 14.0, 1.0, 5000.0, 2.0))
+        records.append(shot)
+    records.append({"ts": 1010.0, "carry_distance_yards": 99.0})  # no raw inputs
+    return records
+
+
+def test_round_trip_is_zero_copy_and_aligned(tmp_path):
+    path = tmp_path / "sessions" / "1000.gdc"
+    records = _records()
+    assert columnar.write_columnar(path, records, meta={"session_id": "1000"}) == 6
+    assert not list(path.parent.glob("*.partial"))
+
+    with columnar.ColumnarFile(path) as session:
+        assert session.rows == 6 and session.meta == {"session_id": "1000"}
+        carry = session.column("carry_distance_yards")
+        assert isinstance(carry, memoryview) and carry.format == "d"
+        assert carry.tolist() == [record["carry_distance_yards"] for record in records]
+        speeds = session.column("ball_speed_meters_per_second")
+        assert math.isnan(speeds[5])
+        assert session._offset % columnar.ITEM_SIZE == 0
+
+        stats = session.statistics(["ball_speed_meters_per_second"])["ball_speed_meters_per_second"]
+        assert stats["count"] == 5 and stats["mean"] == 62.0
+        assert stats["stddev"] == pytest.approx(statistics.stdev([60, 61, 62, 63, 64]))
+
+
+def test_session_files_are_listed_in_session_order(tmp_path):
+    for name in ("99", "1000", "200"):
+        columnar.write_columnar(tmp_path / f"{name}.gdc", [])
+    assert [path.stem for path in columnar.iter_session_files(tmp_path)] == ["99", "200", "1000"]
+    assert list(columnar.iter_session_files(tmp_path / "missing")) == []
+    (tmp_path / "bad.gdc").write_bytes(b"not a session file")
+    with pytest.raises(ValueError):
+        columnar.ColumnarFile(tmp_path / "bad.gdc")
+
+
+def test_overviews_skip_unreadable_files(tmp_path):
+    columnar.write_columnar(tmp_path / "1000.gdc", _records(), meta={"session_id": "1000"})
+    columnar.write_columnar(tmp_path / "2000.gdc", _records(), meta={"session_id": "2000"})
+    truncated = (tmp_path / "2000.gdc").read_bytes()[:-8]
+    (tmp_path / "2000.gdc").write_bytes(truncated)
+    (tmp_path / "3000.gdc").write_bytes(b"")
+
+    overviews = columnar.session_overviews(tmp_path, ["carry_distance_yards"], limit=1)
+    assert [overview["session"]["session_id"] for overview in overviews] == ["1000"]
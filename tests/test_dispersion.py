@@ -0,0 +1,73 @@
+"""Tests for the dispersion ellipse and landing grid aggregates."""
+from __future__ import annotations
+
+import importlib.util
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+DISPERSION_PATH = ROOT / "custom_components" / "golf_dashboard" / "dispersion.py"
+
+spec = importlib.util.spec_from_file_location("golf_dashboard_dispersion", DISPERSION_PATH)
+dispersion = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = dispersion
+spec.loader.exec_module(dispersion)  # type: ignore[attr-defined]
+
+
+def test_covariance_matches_batch_and_merges():
+    rng = random.Random(11)
+    points = [(rng.gauss(150, 8), rng.gauss(0, 5)) for _ in range(300)]
+    whole = dispersion.Dispersion()
+    left, right = dispersion.Dispersion(), dispersion.Dispersion()
+    for index, (carry, offline) in enumerate(points):
+        whole.add(carry, offline)
+        (left if index < 100 else right).add(carry, offline)
+    left.merge(right)
+
+    carries = [carry for carry, _ in points]
+    offlines = [offline for _, offline in points]
+    var_carry, var_offline, cov = whole.covariance()
+    assert var_carry == pytest.approx(statistics.variance(carries))
+    assert var_offline == pytest.approx(statistics.variance(offlines))
+    assert cov == pytest.approx(statistics.covariance(carries, offlines))
+    assert left.covariance() == pytest.approx(whole.covariance())
+    restored = dispersion.Dispersion.from_dict(whole.as_dict())
+    assert restored.covariance() == pytest.approx(whole.covariance())
+
+
+def test_ellipse_axes_follow_the_covariance():
+    spread = dispersion.Dispersion()
+    # Perfectly correlated points along a 45° line.
+    for step in range(-5, 6):
+        spread.add(150.0 + step, float(step))
+    ellipse = spread.ellipse(1.0)
+    assert ellipse["angle_degrees"] == pytest.approx(45.0)
+    assert ellipse["semi_minor_yards"] == pytest.approx(0.0, abs=1e-6)
+    assert ellipse["semi_major_yards"] == pytest.approx(math.sqrt(2 * 11.0))
+    assert spread.ellipse(2.0)["semi_major_yards"] == pytest.approx(2 * ellipse["semi_major_yards"])
+    assert dispersion.Dispersion().ellipse() is None
+
+
+def test_club_dispersion_grid_and_segments():
+    clubs = dispersion.ClubDispersion()
+    clubs.add({"club_class": "wedge", "carry_distance_yards": 102.0, "offline_distance_yards": -3.0})
+    clubs.add({"club_class": "wedge", "carry_distance_yards": 103.0, "offline_distance_yards": -2.0})
+    clubs.add({"club_class": "driver", "carry_distance_yards": 400.0, "offline_distance_yards": 90.0})
+    clubs.add({"club_class": "driver", "carry_distance_yards": None})
+
+    wedge = clubs.summary("wedge")
+    assert wedge["count"] == 2
+    assert wedge["grid"]["cells"] == [[20, 14, 2]]
+    # Out-of-range landings are clamped into the edge cells.
+    assert clubs.summary("driver")["grid"]["cells"] == [[69, 29, 1]]
+    assert clubs.summary(dispersion.ALL_CLUBS, include_grid=False)["count"] == 3
+
+    restored = dispersion.ClubDispersion()
+    restored.load(clubs.as_dict())
+    assert restored.summary("wedge") == wedge
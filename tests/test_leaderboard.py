@@ -0,0 +1,134 @@
+"""Tests for the facility top-K leaderboards."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"golf_dashboard_{name}", PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+leaderboard = _load("leaderboard")
+
+MONDAY = {"day": "2026-10-19", "week": "2026-W43"}
+TUESDAY = {"day": "2026-10-20", "week": "2026-W43"}
+
+
+def _shot(carry, offline=0.0, speed=60.0, quality=50):
+    return {
+        "carry_distance_yards": carry,
+        "offline_distance_yards": offline,
+        "ball_speed_meters_per_second": speed,
+        "shot_quality_score": quality,
+    }
+
+
+def test_top_k_keeps_best_values_in_order():
+    board = leaderboard.TopK(size=5)
+    rng = random.Random(3)
+    values = [rng.uniform(0, 300) for _ in range(200)]
+    for index, value in enumerate(values):
+        board.add(value, {"index": index})
+    assert [entry["value"] for entry in board.entries()] == sorted(values, reverse=True)[:5]
+    assert board.best()["value"] == max(values)
+
+
+def test_top_k_lower_is_better_and_ties_keep_earliest():
+    board = leaderboard.TopK(size=2, higher_is_better=False)
+    assert board.add(5.0, {"name": "a"})
+    assert board.add(3.0, {"name": "b"})
+    assert not board.add(5.0, {"name": "c"})  # tie with the worst kept entry
+    assert board.add(1.0, {"name": "d"})
+    assert [entry["name"] for entry in board.entries()] == ["d", "b"]
+
+    tied = leaderboard.TopK(size=3)
+    for name in "xyz":
+        tied.add(1.0, {"name": name})
+    assert [entry["name"] for entry in tied.entries()] == ["x", "y", "z"]
+    restored = leaderboard.TopK(size=3)
+    restored.load(tied.as_dict())
+    assert [entry["name"] for entry in restored.entries()] == ["x", "y", "z"]
+
+
+def test_closest_to_target_ranks_by_landing_distance():
+    metric = next(m for m in leaderboard.LEADERBOARD_METRICS if m.key == "closest_to_target")
+    assert metric.value(_shot(153.0, offline=-4.0)) == pytest.approx(5.0)
+    assert metric.value({"carry_distance_yards": 150.0}) is None
+
+
+def test_boards_cover_all_bays_and_roll_over_by_day():
+    board = leaderboard.Leaderboard(size=3)
+    assert board.add(_shot(200.0), "bay1", "s1", MONDAY, {"bay": "Bay 1"})
+    assert board.add(_shot(250.0), "bay2", "s2", MONDAY, {"bay": "Bay 2"})
+    day = board.board("day", "longest_carry", MONDAY)
+    assert [(entry["bay"], entry["value"]) for entry in day] == [("Bay 2", 250.0), ("Bay 1", 200.0)]
+
+    # A shot that makes no board reports no change
+    for carry in (240.0, 230.0):
+        board.add(_shot(carry, speed=90.0, quality=99), "bay1", "s1", MONDAY)
+    assert not board.add(_shot(10.0, offline=80.0, speed=1.0, quality=0), "bay1", "s1", MONDAY)
+
+    assert board.board("day", "longest_carry", TUESDAY) == []
+    board.add(_shot(120.0), "bay1", "s1", TUESDAY)
+    assert [entry["value"] for entry in board.board("day", "longest_carry", TUESDAY)] == [120.0]
+    assert board.board("week", "longest_carry", TUESDAY)[0]["value"] == 250.0
+
+
+def test_session_boards_merge_open_sessions_and_drop_closed_ones():
+    board = leaderboard.Leaderboard(size=2)
+    board.add(_shot(200.0), "bay1", "s1", MONDAY)
+    board.add(_shot(180.0), "bay1", "s1", MONDAY)
+    board.add(_shot(190.0), "bay2", "s2", MONDAY)
+    assert [e["value"] for e in board.board("session", "longest_carry")] == [200.0, 190.0]
+
+    assert board.end_session("bay1")
+    assert [e["value"] for e in board.board("session", "longest_carry")] == [190.0]
+    board.add(_shot(100.0), "bay2", "s3", MONDAY)  # bay2 started a new session
+    assert [e["value"] for e in board.board("session", "longest_carry")] == [100.0]
+
+
+def test_round_trip():
+    board = leaderboard.Leaderboard()
+    board.add(_shot(210.0, offline=3.0), "bay1", "s1", MONDAY, {"player": "Ana"})
+    restored = leaderboard.Leaderboard()
+    restored.load(board.as_dict())
+    assert restored.summary(MONDAY) == board.summary(MONDAY)
+    assert restored.board("session", "best_quality")[0]["player"] == "Ana"
+
+
+def test_new_target_clears_only_the_closest_to_target_boards():
+    board = leaderboard.Leaderboard()
+    board.add(_shot(148.0), "bay1", "s1", MONDAY)
+    assert not board.set_target(leaderboard.DEFAULT_TARGET_YARDS)
+    assert board.set_target(100.0)
+    assert board.metrics["closest_to_target"].target == 100.0
+    assert board.board("day", "closest_to_target", MONDAY) == []
+    assert board.board("session", "closest_to_target") == []
+    assert board.board("day", "longest_carry", MONDAY)[0]["value"] == 148.0
+
+    # Restored boards keep the target they were ranked against
+    board.add(_shot(103.0, offline=4.0), "bay1", "s1", MONDAY)
+    restored = leaderboard.Leaderboard()
+    restored.load(board.as_dict())
+    assert restored.metrics["closest_to_target"].target == 100.0
+    assert not restored.set_target(100.0)
+    assert restored.board("day", "closest_to_target", MONDAY)[0]["value"] == pytest.approx(5.0)
+
+
+def test_period_keys_use_iso_weeks():
+    assert leaderboard.period_keys(datetime(2026, 1, 1, 12)) == {"day": "2026-01-01", "week": "2026-W01"}
+    assert leaderboard.period_keys(datetime(2027, 1, 1, 12))["week"] == "2026-W53"
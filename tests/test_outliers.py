@@ -0,0 +1,70 @@
+"""Tests for streaming mishit and outlier detection."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"golf_dashboard_{name}", PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+outliers = _load("outliers")
+
+
+def test_robust_window_matches_batch_median_and_mad():
+    rng = random.Random(5)
+    values = [rng.gauss(150.0, 8.0) for _ in range(80)] + [150.0] * 5
+    window = outliers.RobustWindow(size=11)
+    for index, value in enumerate(values):
+        window.add(value)
+        recent = values[max(0, index - 10): index + 1]
+        median = statistics.median(recent)
+        assert window.median() == pytest.approx(median)
+        assert window.mad() == pytest.approx(statistics.median(abs(v - median) for v in recent))
+    assert window.values() == values[-11:]
+
+
+def test_detector_flags_mishits_and_outliers_per_club():
+    rng = random.Random(9)
+    detector = outliers.OutlierDetector(min_shots=10)
+    for _ in range(20):
+        detector.check("club_1", {"carry_distance_yards": rng.gauss(150.0, 5.0), "ball_speed_meters_per_second": 55.0 + rng.random()})
+        detector.check("club_2", {"carry_distance_yards": rng.gauss(240.0, 8.0), "ball_speed_meters_per_second": 70.0 + rng.random()})
+
+    assert detector.check("club_1", {"carry_distance_yards": 151.0, "ball_speed_meters_per_second": 55.5}) is None
+    # Normal for the driver, far out for the 7-iron
+    assert detector.check("club_2", {"carry_distance_yards": 235.0, "ball_speed_meters_per_second": 70.2}) is None
+    assert detector.check("club_1", {"carry_distance_yards": 235.0, "ball_speed_meters_per_second": 55.2}) == "carry_distance_yards"
+    assert detector.check("club_1", {"shot_name": "Chunk", "carry_distance_yards": 150.0}) == "mishit"
+    assert detector.check(None, {"shot_name": "Right Shank"}) == "mishit"
+    assert detector.check(None, {"carry_distance_yards": 999.0}) is None
+
+    fresh = outliers.OutlierDetector()
+    assert fresh.check("club_1", {"carry_distance_yards": 999.0}) is None  # no baseline yet
+
+
+def test_round_trip_and_merge():
+    detector = outliers.OutlierDetector(min_shots=3)
+    for carry in (148.0, 150.0, 152.0, 151.0):
+        detector.check("club_1", {"carry_distance_yards": carry})
+    restored = outliers.OutlierDetector(min_shots=3)
+    restored.load(detector.as_dict())
+    assert restored.as_dict() == detector.as_dict()
+    assert restored.check("club_1", {"carry_distance_yards": 190.0}) == "carry_distance_yards"
+
+    restored.absorb("club_1", "club_2")
+    assert restored.as_dict() == {}
@@ -0,0 +1,120 @@
+"""Tests for per-player analytics state and its LRU cache."""
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+players = importlib.import_module("golf_dashboard_pure.players")
+
+CONSISTENCY = ("carry_distance_yards", "ball_speed_meters_per_second")
+DISTRIBUTION = ("carry_distance_yards", "offline_distance_yards")
+
+
+def _analytics():
+    return players.PlayerAnalytics(CONSISTENCY, 5, DISTRIBUTION)
+
+
+def _shot(speed: float, carry: float, offline: float = 0.0) -> dict:
+    return {
+        "ball_speed_meters_per_second": speed,
+        "vertical_launch_angle_degrees": 14.0,
+        "total_spin_rpm": 5000.0,
+        "carry_distance_yards": carry,
+        "offline_distance_yards": offline,
+    }
+
+
+def test_shots_are_clustered_and_session_state_rolls_over():
+    analytics = _analytics()
+    for index in range(4):
+        shot = _shot(50.0, 150.0 + index, offline=index - 1.5)
+        analytics.add_shot(shot, "s1")
+        assert shot["club_cluster"] == "club_1"
+
+    assert analytics.session_statistics()["carry_distance_yards"]["count"] == 4
+    assert analytics.club_dispersion("club_1")["count"] == 4
+
+    analytics.add_shot(_shot(50.0, 160.0), "s2")
+    assert analytics.session_statistics()["carry_distance_yards"]["count"] == 1
+    session = analytics.distribution_view("session").summary("club_1")
+    lifetime = analytics.distribution_view("all").summary("club_1")
+    assert session["carry_distance_yards"]["count"] == 1
+    assert lifetime["carry_distance_yards"]["count"] == 5
+    assert analytics.club_distribution("club_1", ["carry_distance_yards"])["club_cluster"] == "club_1"
+    assert analytics.club_distribution(None, ["carry_distance_yards"]) == {}
+
+
+def test_excluded_shots_are_tagged_but_not_aggregated():
+    analytics = _analytics()
+    for index in range(12):
+        shot = _shot(50.0, 150.0 + index % 3)
+        assert analytics.check_outlier(shot) is None
+        analytics.add_shot(shot, "s1")
+    wild = _shot(50.0, 260.0)
+    assert analytics.check_outlier(wild) == "carry_distance_yards"
+    analytics.add_shot(wild, "s1", aggregate=False)
+    assert wild["club_cluster"] == "club_1"
+    assert analytics.session_statistics()["carry_distance_yards"]["count"] == 12
+    assert analytics.clusters.clusters["club_1"].count == 12
+    assert analytics.check_outlier({**_shot(50.0, 151.0), "shot_name": "Chunk"}) == "mishit"
+
+
+def test_last_n_windows_are_kept_per_player():
+    alex = players.PlayerAnalytics(CONSISTENCY, 5, DISTRIBUTION, shot_windows=[2])
+    sam = players.PlayerAnalytics(CONSISTENCY, 5, DISTRIBUTION, shot_windows=[2])
+    for carry in (150.0, 160.0, 170.0):
+        alex.add_shot(_shot(50.0, carry), "s1")
+    sam.add_shot(_shot(70.0, 230.0), "s1")
+    alex.add_shot(_shot(50.0, 400.0), "s1", aggregate=False)
+
+    assert alex.windows.summary()["last_2"]["avg_carry"] == pytest.approx(165.0)
+    assert alex.windows.summary()["last_2"]["shot_count"] == 2
+    assert sam.windows.summary()["last_2"]["shot_count"] == 1
+    assert sam.windows.summary()["last_2"]["avg_carry"] == pytest.approx(230.0)
+
+
+def test_round_trip_through_json():
+    analytics = _analytics()
+    for index in range(6):
+        analytics.add_shot(_shot(50.0 + index * 0.1, 150.0 + index), "s1")
+
+    restored = _analytics()
+    restored.load(json.loads(json.dumps(analytics.as_dict())))
+
+    assert restored.session_id == "s1"
+    assert restored.clusters.describe() == analytics.clusters.describe()
+    for metric, summary in analytics.recent.summary().items():
+        assert restored.recent.summary()[metric] == pytest.approx(summary)
+    assert restored.session_statistics() == analytics.session_statistics()
+    assert restored.club_dispersion("club_1") == analytics.club_dispersion("club_1")
+    restored.add_shot(_shot(50.0, 151.0), "s1")
+    assert restored.session_statistics()["carry_distance_yards"]["count"] == 7
+
+
+def test_cache_evicts_least_recently_used_but_never_the_pinned_player():
+    cache = players.PlayerCache(2)
+    alex, sam, kim = _analytics(), _analytics(), _analytics()
+    assert cache.put("Alex", alex) == []
+    assert cache.put("Sam", sam) == []
+    assert cache.get("Alex") is alex  # Sam is now least recently used
+
+    evicted = cache.put("Kim", kim, pinned="Alex")
+    assert [name for name, _ in evicted] == ["Sam"]
+    assert "Sam" not in cache and len(cache) == 2
+
+    evicted = cache.put("Sam", sam, pinned="Kim")
+    assert [name for name, _ in evicted] == ["Alex"]
+    assert [name for name, _ in cache.items()] == ["Kim", "Sam"]
+    assert cache.pop("Kim") is kim
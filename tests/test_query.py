@@ -0,0 +1,110 @@
+"""Tests for the shot store query planner and filters."""
+from __future__ import annotations
+
+import importlib
+import statistics
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+query = importlib.import_module("golf_dashboard_pure.query")
+shot_store = importlib.import_module("golf_dashboard_pure.shot_store")
+
+DAY = 1767225600.0
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+    records = []
+    for index in range(60):
+        records.append(
+            {
+                "ts": DAY + index * 3600,
+                "carry_distance_yards": 150.0 + index % 10,
+                "club_class": "mid_iron" if index % 2 else "driver",
+                "club_cluster": f"club_{index % 3}",
+                "shot_rank": "A" if index % 4 == 0 else "B",
+                "shot_name": "Draw",
+                "player": "Alex" if index < 40 else "Sam",
+            }
+        )
+    store.insert_many("bay1", records)
+    yield store
+    store.close()
+
+
+def test_row_queries_filter_and_page_newest_first(store):
+    q = query.ShotQuery(player="Alex", shot_rank=["A"], club_cluster="club_0", limit=2, fields=["carry_distance_yards"])
+    first = query.run_query(store, q)
+    assert first["plan"] == query.PLAN_ROWS
+    # index % 4 == 0 and index % 3 == 0 and index < 40 -> 0, 12, 24, 36
+    assert [shot["ts"] for shot in first["shots"]] == [DAY + 36 * 3600, DAY + 24 * 3600]
+    assert set(first["shots"][0]) == {"ts", "carry_distance_yards"}
+
+    q.before = tuple(first["next_cursor"])
+    second = query.run_query(store, q)
+    assert [shot["ts"] for shot in second["shots"]] == [DAY + 12 * 3600, DAY]
+    assert second["next_cursor"] is None
+
+    ranged = query.run_query(store, query.ShotQuery(ranges={"carry_distance_yards": (158.0, None)}))
+    assert len(ranged["shots"]) == 12
+
+
+def test_aggregates_prefer_rollups_when_filters_allow(store):
+    aligned = query.ShotQuery(club="driver", start_ts=DAY, end_ts=DAY + 86400, aggregate=["carry_distance_yards"])
+    assert query.plan(aligned) == (query.PLAN_ROLLUP, "day")
+    hourly = query.ShotQuery(start_ts=DAY + 3600, aggregate=["carry_distance_yards"])
+    assert query.plan(hourly) == (query.PLAN_ROLLUP, "hour")
+
+    from_rollups = query.run_query(store, aligned)
+    aligned.shot_name = ["Draw"]  # not a rollup dimension
+    from_rows = query.run_query(store, aligned)
+    assert from_rows["plan"] == query.PLAN_AGGREGATE
+    assert from_rows["shots"] == from_rollups["shots"] == 12
+    expected = statistics.stdev([150.0 + index % 10 for index in range(0, 24, 2)])
+    for result in (from_rollups, from_rows):
+        carry = result["statistics"]["carry_distance_yards"]
+        assert carry["mean"] == pytest.approx(153.5)
+        assert carry["stddev"] == pytest.approx(expected)
+
+
+def test_indexes_are_used_and_metric_names_are_validated(store):
+    where, params = query._shot_filters(query.ShotQuery(player="Alex", club_cluster="club_1"))
+    plan_rows = store.select(f"EXPLAIN QUERY PLAN SELECT id FROM shots{where}", params)
+    assert "shots_player_cluster_ts" in " ".join(row["detail"] for row in plan_rows)
+    with pytest.raises(ValueError):
+        query.ShotQuery(aggregate=["carry') OR 1=1 --"])
+
+
+def test_sql_plans_skip_excluded_outliers_and_report_archived_shots(store):
+    store.insert_many(
+        "bay1", [{"ts": DAY + 7200 + 1, "carry_distance_yards": 400.0, "club_class": "driver", "outlier_excluded": True}]
+    )
+    aligned = query.ShotQuery(start_ts=DAY, end_ts=DAY + 86400, aggregate=["carry_distance_yards"])
+    from_rollups = query.run_query(store, aligned)
+    unaligned = query.ShotQuery(start_ts=DAY, end_ts=DAY + 86400 - 1, aggregate=["carry_distance_yards"])
+    from_rows = query.run_query(store, unaligned)
+    assert from_rows["plan"] == query.PLAN_AGGREGATE
+    assert from_rows["shots"] == from_rollups["shots"] == 24
+    assert from_rows["statistics"] == from_rollups["statistics"]
+    assert len(query.run_query(store, query.ShotQuery(start_ts=DAY, end_ts=DAY + 86400))["shots"]) == 24
+
+    assert store.archive("bay1", DAY + 86400) == 25
+    archived = query.run_query(store, unaligned)
+    assert archived["shots"] == 0 and archived["archived_shots"] == 24
+    assert query.run_query(store, aligned)["shots"] == 24  # rollups outlive archiving
+
+
+def test_learned_club_filter_needs_a_player():
+    with pytest.raises(ValueError):
+        query.ShotQuery(club_cluster="club_0")
@@ -0,0 +1,53 @@
+"""Tests for recomputing stored shots after a derived-model change."""
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+derived = importlib.import_module("golf_dashboard_pure.derived")
+recompute = importlib.import_module("golf_dashboard_pure.recompute")
+shot_store = importlib.import_module("golf_dashboard_pure.shot_store")
+
+
+def test_recompute_updates_outdated_rows_in_resumable_chunks(tmp_path):
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+    stale = {
+        "ts": 1.0,
+        "ball_speed_meters_per_second": 70.0,
+        "vertical_launch_angle_degrees": 12.5,
+        "horizontal_launch_angle_degrees": 0.0,
+        "total_spin_rpm": 2800.0,
+        "spin_axis_degrees": 5.0,
+        "carry_distance_yards": 1.0,
+        "session_id": "s1",
+    }
+    store.insert_many("bay1", [dict(stale, ts=float(i)) for i in range(5)])
+    store.insert_many("bay1", [{"ts": 9.0, "shot_rank": "P"}])
+    assert store.count_outdated(derived.DERIVED_MODEL_VERSION) == 6
+
+    updated, last_id = recompute.recompute_chunk(store, 0, limit=4)
+    assert updated == 4
+    assert store.count_outdated(derived.DERIVED_MODEL_VERSION) == 2
+
+    # A restarted job starts from zero and only finds the remaining rows.
+    updated, _ = recompute.recompute_chunk(store, 0, limit=4)
+    assert updated == 2
+    assert recompute.recompute_chunk(store, 0)[0] == 0
+
+    expected = derived.compute_derived_from_shot(70.0, 12.5, 0.0, 2800.0, 5.0)
+    records = list(store.iter_shots())
+    assert records[0]["carry_distance_yards"] == pytest.approx(expected["carry_distance_yards"], abs=1e-3)
+    assert records[0]["session_id"] == "s1"
+    assert records[-1] == {"ts": 9.0, "shot_rank": "P", "model_version": derived.DERIVED_MODEL_VERSION}
+    store.close()
@@ -0,0 +1,90 @@
+"""Tests for the shared reconnect schedule."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"golf_dashboard_{name}", PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+reconnect = _load("reconnect")
+
+
+def _schedule(**kwargs):
+    return reconnect.ReconnectSchedule(rng=random.Random(7), **kwargs)
+
+
+def test_first_attempts_are_spread_over_the_stagger_window():
+    schedule = _schedule(stagger=5.0)
+    for index in range(40):
+        schedule.add(f"bay{index}", 100.0)
+    assert schedule.due(99.9) == []
+    first = schedule.next_due()
+    assert first is not None and 100.0 <= first <= 105.0
+    early = schedule.due(102.5)
+    assert 0 < len(early) < 40
+    assert len(early) + len(schedule.due(105.0)) == 40
+
+
+def test_due_is_limited_per_tick_and_earliest_first():
+    schedule = _schedule(stagger=0.0)
+    for index in range(10):
+        schedule.add(f"bay{index}", float(index))
+    assert schedule.due(100.0, limit=4) == ["bay0", "bay1", "bay2", "bay3"]
+    assert schedule.due(100.0, limit=4) == ["bay4", "bay5", "bay6", "bay7"]
+    assert schedule.due(100.0, limit=4) == ["bay8", "bay9"]
+    assert len(schedule) == 0
+
+
+def test_backoff_doubles_with_jitter_and_is_capped():
+    schedule = _schedule(base_delay=10.0, max_delay=80.0, stagger=0.0)
+    schedule.add("bay", 0.0)
+    assert schedule.due(0.0) == ["bay"]
+    for failures, ceiling in enumerate((10.0, 20.0, 40.0, 80.0, 80.0, 80.0), start=1):
+        delay = schedule.failed("bay", 0.0)
+        assert ceiling / 2 <= delay <= ceiling
+        assert schedule.failures("bay") == failures
+        assert schedule.due(0.0) == []
+        assert schedule.due(delay) == ["bay"]
+
+
+def test_success_resets_backoff_and_unschedules():
+    schedule = _schedule(base_delay=10.0, stagger=0.0)
+    schedule.add("bay", 0.0)
+    schedule.due(0.0)
+    for _ in range(5):
+        schedule.failed("bay", 0.0)
+    schedule.due(1000.0)
+    schedule.succeeded("bay")
+    assert "bay" not in schedule
+    assert schedule.failures("bay") == 0
+    assert schedule.failed("bay", 0.0) <= 10.0
+
+
+def test_simultaneous_drops_retry_apart():
+    schedule = _schedule(base_delay=10.0, stagger=0.0)
+    delays = {schedule.failed(f"bay{index}", 0.0) for index in range(40)}
+    assert len(delays) == 40
+    assert min(delays) >= 5.0 and max(delays) <= 10.0
+
+
+def test_remove_forgets_device():
+    schedule = _schedule(stagger=0.0)
+    schedule.add("bay", 0.0)
+    schedule.failed("bay", 0.0)
+    schedule.remove("bay")
+    assert "bay" not in schedule
+    assert schedule.failures("bay") == 0
+    assert schedule.next_due() is None
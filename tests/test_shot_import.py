@@ -0,0 +1,114 @@
+"""Tests for bulk shot import and batch recomputation."""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+# Register a bare package so the modules' relative imports resolve without
+# executing the Home Assistant-dependent package __init__.
+package = types.ModuleType("golf_dashboard_pure")
+package.__path__ = [str(PACKAGE_DIR)]  # type: ignore[attr-defined]
+sys.modules.setdefault("golf_dashboard_pure", package)
+
+derived = importlib.import_module("golf_dashboard_pure.derived")
+shot_import = importlib.import_module("golf_dashboard_pure.shot_import")
+shot_store = importlib.import_module("golf_dashboard_pure.shot_store")
+
+
+def test_batch_matches_single_shot_computation():
+    columns = ([70.0, 45.0], [12.5, 18.0], [0.0, 1.0], [2800.0, 6200.0], [5.0, -5.0])
+    batch = derived.compute_derived_batch(*columns)
+    for index, result in enumerate(batch):
+        single = derived.compute_derived_from_shot(*(column[index] for column in columns))
+        assert result == single
+
+    with pytest.raises(ValueError):
+        derived.compute_derived_batch([1.0], [], [], [], [])
+
+
+def test_import_foreign_csv_with_unit_and_direction_mapping(tmp_path):
+    source = tmp_path / "other_monitor.csv"
+    source.write_text(
+        "Date,Club Type,Ball Speed,Launch Angle,Launch Direction,Spin Rate,Spin Axis\n"
+        "2025-06-01 10:00:00,7 Iron,110.0,18.0,L2.0,6500,R3.0\n"
+        "2025-06-01 10:01:00,7 Iron,,18.0,R1.0,6400,0\n"
+        "2025-06-01 10:02:00,Driver,150.0,12.0,R1.5,2700,L4.0\n",
+        encoding="utf-8",
+    )
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+
+    result = shot_import.import_file(store, "bay1", source, chunk_size=1)
+
+    assert (result.imported, result.skipped) == (2, 1)
+    first, second = list(store.iter_shots(device="bay1"))
+    assert first["ball_speed_meters_per_second"] == pytest.approx(110.0 / derived.MPS_TO_MPH, abs=1e-3)
+    assert first["horizontal_launch_angle_degrees"] == -2.0
+    assert first["spin_axis_degrees"] == 3.0
+    assert first["source_club"] == "7 Iron"
+    assert first["session_id"] == "import-20250601"
+    assert "carry_distance_yards" in first and "shot_rank" in first
+    assert second["ts"] - first["ts"] == 120.0
+    store.close()
+
+
+def test_import_round_trips_own_jsonl_export(tmp_path):
+    source = tmp_path / "export.jsonl"
+    source.write_text(
+        '{"ts": 1767225600.0, "session_id": "s9", "ball_speed_meters_per_second": 50.0,'
+        ' "vertical_launch_angle_degrees": 17.0, "horizontal_launch_angle_degrees": 1.0,'
+        ' "total_spin_rpm": 5500.0, "spin_axis_degrees": -4.0}\n',
+        encoding="utf-8",
+    )
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+
+    assert shot_import.import_file(store, "bay1", source).imported == 1
+    (record,) = store.iter_shots(session_id="s9")
+    expected = derived.compute_derived_from_shot(50.0, 17.0, 1.0, 5500.0, -4.0)
+    assert record["carry_distance_yards"] == pytest.approx(expected["carry_distance_yards"], abs=1e-3)
+    assert record["ts"] == 1767225600.0
+    store.close()
+
+
+def test_unparseable_rows_are_reported_and_the_rest_imported(tmp_path):
+    good = (
+        '{"ts": 1767225600.0, "session_id": "s9", "ball_speed_meters_per_second": 50.0,'
+        ' "vertical_launch_angle_degrees": 17.0}\n'
+    )
+    source = tmp_path / "mixed.jsonl"
+    source.write_text(good + '{"ts": 1767225601.0, "ball_speed\n' + "[1, 2]\n" + good, encoding="utf-8")
+    store = shot_store.ShotStore(str(tmp_path / "shots.db"))
+
+    result = shot_import.import_file(store, "bay1", source, chunk_size=1)
+
+    assert (result.imported, result.skipped) == (2, 2)
+    assert result.errors[0].startswith("row 2: invalid JSON")
+    assert result.errors[1] == "row 3: not a JSON object"
+
+    # A CSV row the reader rejects is skipped; the rows after it still import
+    source = tmp_path / "mixed.csv"
+    source.write_text(
+        "Ball Speed,Launch Angle,Note\n"
+        "110.0,18.0,ok\n"
+        f'111.0,18.0,"{"x" * 200_000}"\n'
+        "112.0,18.0,ok\n",
+        encoding="utf-8",
+    )
+    result = shot_import.import_file(store, "bay2", source)
+    assert (result.imported, result.skipped) == (2, 1)
+    assert result.errors[0].startswith("row 2: invalid CSV")
+
+    # Undecodable text stops the read but keeps what was already imported
+    source = tmp_path / "latin1.csv"
+    source.write_bytes(b"Ball Speed,Launch Angle\n" + b"110.0,18.0\n" * 3000 + b"111.0,18.0\xe9\n")
+    result = shot_import.import_file(store, "bay3", source, chunk_size=100)
+    assert 0 < result.imported == len(list(store.iter_shots(device="bay3")))
+    assert result.skipped == 1 and "not UTF-8" in result.errors[-1]
+    store.close()
@@ -0,0 +1,223 @@
+"""Tests for the SQLite shot store and streaming export."""
+from __future__ import annotations
+
+import csv
+import gzip
+import importlib.util
+import json
+import sqlite3
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "golf_dashboard"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"golf_dashboard_{name}", PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+shot_store = _load("shot_store")
+export = _load("export")
+
+
+def _record(seq: int, ts: float, **extra) -> dict:
+    record = {"seq": seq, "ts": ts, "carry_distance_yards": 100.0 + seq, "club_class": "mid_iron"}
+    record.update(extra)
+    return record
+
+
+def _store(tmp_path: Path):
+    store = shot_store.ShotStore(str(tmp_path / "golf_dashboard" / "shots.db"))
+    store.open()
+    return store
+
+
+def test_insert_and_filtered_chunked_iteration(tmp_path):
+    store = _store(tmp_path)
+    store.insert_many("bay1", [_record(i, 1000.0 + i, session_id="s1") for i in range(10)])
+    store.insert_many("bay2", [_record(i, 1000.0 + i, club_class="driver") for i in range(3)])
+
+    assert store.count() == 13
+    assert store.count("bay1") == 10
+
+    in_range = list(store.iter_shots(device="bay1", start_ts=1002.0, end_ts=1005.0, chunk_size=2))
+    assert [r["seq"] for r in in_range] == [2, 3, 4]
+    assert [r["seq"] for r in store.iter_shots(club="driver")] == [0, 1, 2]
+    assert len(list(store.iter_shots(session_id="s1"))) == 10
+    store.close()
+
+
+def test_player_column_filters_rows(tmp_path):
+    store = _store(tmp_path)
+    store.insert_many("bay1", [_record(0, 1.0, player="Alex"), _record(1, 2.0, player="Sam")])
+    store.insert_many("bay1", [_record(2, 3.0)])
+
+    assert [r["seq"] for r in store.iter_shots(player="Alex")] == [0]
+    assert [r["seq"] for r in store.iter_shots(device="bay1", player="Sam")] == [1]
+    store.close()
+
+
+def test_rename_cluster_retags_one_players_rows(tmp_path):
+    store = _store(tmp_path)
+    store.insert_many(
+        "bay1",
+        [
+            _record(0, 1.0, player="Alex", club_cluster="c3"),
+            _record(1, 2.0, player="Alex", club_cluster="c1"),
+            _record(2, 3.0, player="Sam", club_cluster="c3"),
+        ],
+    )
+    store.insert_many("bay2", [_record(3, 4.0, player="Alex", club_cluster="c3")])
+
+    assert store.rename_cluster("bay1", "Alex", "c3", "c1") == 1
+    rows = store.select("SELECT device, player, club_cluster FROM shots ORDER BY ts")
+    assert [tuple(row) for row in rows] == [
+        ("bay1", "Alex", "c1"),
+        ("bay1", "Alex", "c1"),
+        ("bay1", "Sam", "c3"),
+        ("bay2", "Alex", "c3"),
+    ]
+    assert [r["club_cluster"] for r in store.iter_shots(device="bay1", player="Alex")] == ["c1", "c1"]
+    assert [r["seq"] for r in store.iter_shots(player="Sam", club_cluster="c3")] == [2]
+    store.close()
+
+
+def test_page_before_walks_a_devices_shots_backwards(tmp_path):
+    store = _store(tmp_path)
+    store.insert_many("bay1", [_record(i, 10.0 + i) for i in range(5)])
+    store.insert_many("bay2", [_record(9, 12.5)])
+
+    newest, cursor = store.page_before("bay1", limit=2)
+    assert [r["seq"] for r in newest] == [3, 4]
+    older, cursor = store.page_before("bay1", tuple(cursor), limit=2)
+    assert [r["seq"] for r in older] == [1, 2]
+    oldest, cursor = store.page_before("bay1", tuple(cursor), limit=2)
+    assert [r["seq"] for r in oldest] == [0] and cursor is None
+    # A buffer boundary cursor: everything strictly older than ts 13
+    assert [r["seq"] for r in store.page_before("bay1", (13.0, 0), limit=10)[0]] == [0, 1, 2]
+    store.close()
+
+
+def test_rollups_follow_inserts_and_recomputes(tmp_path):
+    store = _store(tmp_path)
+    day = 1767225600.0  # 2026-01-01T00:00:00Z
+    store.insert_many("bay1", [_record(0, day + 10, player="Alex"), _record(1, day + 3700, player="Alex")])
+    store.insert_many("bay1", [_record(2, day + 86400 + 5, player="Sam", club_class="driver")])
+
+    daily = store.rollups("day", metrics=["carry_distance_yards"])
+    assert [bucket["start"] for bucket in daily] == [day, day + 86400]
+    carry = daily[0]["carry_distance_yards"]
+    assert carry["count"] == 2 and carry["mean"] == 100.5
+    assert carry["min"] == 100.0 and carry["max"] == 101.0
+    assert carry["stddev"] == pytest.approx(statistics.stdev([100.0, 101.0]))
+
+    assert len(store.rollups("hour", start_ts=day, end_ts=day + 86400)) == 2
+    assert [b["start"] for b in store.rollups("day", player="Sam")] == [day + 86400]
+    assert [b["start"] for b in store.rollups("day", club="driver")] == [day + 86400]
+
+    row_id = store.conn.execute("SELECT id FROM shots WHERE ts = ?", (day + 10,)).fetchone()[0]
+    store.update_many([(row_id, _record(0, day + 10, player="Alex", carry_distance_yards=90.0))])
+    carry = store.rollups("day", end_ts=day + 1)[0]["carry_distance_yards"]
+    assert carry["count"] == 2 and carry["min"] == 90.0
+
+    # Excluded outliers are stored but never rolled up
+    store.insert_many("bay1", [_record(3, day + 20, carry_distance_yards=400.0, outlier_excluded=True)])
+    assert store.count("bay1") == 4
+    carry = store.rollups("day", end_ts=day + 1)[0]["carry_distance_yards"]
+    assert carry["count"] == 2 and carry["max"] == 101.0
+    store.close()
+
+
+def test_rollup_migration_backfills_existing_shots(tmp_path):
+    path = tmp_path / "shots.db"
+    conn = sqlite3.connect(path)
+    with conn:
+        for statements in shot_store._MIGRATIONS[: shot_store.ROLLUPS_MIGRATION - 1]:
+            for statement in statements:
+                conn.execute(statement)
+        conn.executemany(
+            "INSERT INTO shots (device, ts, data) VALUES ('bay1', ?, ?)",
+            [(record["ts"], json.dumps(record)) for record in (_record(i, 1000.0 + i) for i in range(3))],
+        )
+        conn.execute(f"PRAGMA user_version={shot_store.ROLLUPS_MIGRATION - 1}")
+    conn.close()
+
+    store = shot_store.ShotStore(str(path))
+    store.open()
+    assert store.rollups("day")[0]["carry_distance_yards"]["count"] == 3
+    store.close()
+
+
+def test_archiving_keeps_rollups_and_compaction_shrinks_the_file(tmp_path):
+    store = _store(tmp_path)
+    day = 1767225600.0
+    padding = "x" * 2000
+    store.insert_many("bay1", [_record(i, day + i * 60, note=padding) for i in range(300)])
+    store.insert_many("bay1", [_record(i, day + 86400 + i, note=padding) for i in range(5)])
+    store.insert_many("bay2", [_record(0, day)])
+    size = store.size()
+
+    # A cutoff inside day 2 only archives whole days before it.
+    assert store.archive("bay1", day + 86400 + 3600, limit=200) == 200
+    assert store.archive("bay1", day + 86400 + 3600, limit=200) == 100
+    assert store.archive("bay1", day + 86400 + 3600, limit=200) == 0
+    assert store.count("bay1") == 5 and store.count("bay2") == 1
+    assert store.count_archived() == 300
+    assert store.rollups("day", device="bay1")[0]["carry_distance_yards"]["count"] == 300
+
+    while store.compact(16):
+        pass
+    assert store.size() < size
+    store.close()
+
+
+def test_incremental_vacuum_is_enabled_without_rewriting_on_open(tmp_path):
+    store = _store(tmp_path)
+    assert store.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == shot_store.AUTO_VACUUM_INCREMENTAL
+    store.close()
+
+    # A store from before incremental vacuum is only converted on request
+    path = tmp_path / "old.db"
+    sqlite3.connect(str(path)).execute("CREATE TABLE legacy (a)").connection.close()
+    old = shot_store.ShotStore(str(path))
+    old.insert_many("bay1", [_record(0, 1767225600.0)])
+    assert old.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    assert old.enable_incremental_vacuum()
+    assert old.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == shot_store.AUTO_VACUUM_INCREMENTAL
+    assert old.count("bay1") == 1
+    old.close()
+
+
+def test_reopening_keeps_schema_version(tmp_path):
+    store = _store(tmp_path)
+    store.close()
+    store.open()
+    version = store.conn.execute("PRAGMA user_version").fetchone()[0]
+    assert version == shot_store.SCHEMA_VERSION
+    store.close()
+
+
+def test_export_csv_gzip_and_jsonl(tmp_path):
+    records = [_record(i, 1767225600.0 + i, shot_rank="A") for i in range(3)]
+
+    csv_path = tmp_path / "exports" / "shots.csv.gz"
+    rows = export.write_export(iter(records), csv_path, "csv", ["time", "carry_distance_yards"], compress=True)
+    assert rows == 3
+    with gzip.open(csv_path, "rt", encoding="utf-8") as handle:
+        parsed = list(csv.DictReader(handle))
+    assert parsed[0] == {"time": "2026-01-01T00:00:00+00:00", "carry_distance_yards": "100.0"}
+
+    jsonl_path = tmp_path / "exports" / "shots.jsonl"
+    assert export.write_export(iter(records), jsonl_path, "jsonl") == 3
+    lines = jsonl_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["seq"] == 2
+    assert not list((tmp_path / "exports").glob("*.partial"))
@@ -0,0 +1,116 @@
+"""Tests for shot record helpers used by the websocket API."""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SHOTS_PATH = ROOT / "custom_components" / "golf_dashboard" / "shots.py"
+
+spec = importlib.util.spec_from_file_location("golf_dashboard_shots", SHOTS_PATH)
+shots = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = shots
+spec.loader.exec_module(shots)  # type: ignore[attr-defined]
+
+
+def _records(count: int) -> list[dict]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        shots.shot_record(seq, start, {"carry_distance_yards": 150.0 + seq, "shot_rank": "A"})
+        for seq in range(1, count + 1)
+    ]
+
+
+def test_shot_record_drops_internal_fields_and_rounds():
+    record = shots.shot_record(
+        7,
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+        {
+            "type": "shot",
+            "_last_shot_timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "carry_distance_yards": 151.23456,
+            "launch_in_window": True,
+        },
+    )
+    assert record == {
+        "seq": 7,
+        "ts": 1767225600.0,
+        "carry_distance_yards": 151.235,
+        "launch_in_window": True,
+    }
+
+
+def test_page_walks_backwards_with_cursor():
+    records = _records(25)
+
+    first, cursor = shots.page(records, None, 10)
+    assert [r["seq"] for r in first] == list(range(16, 26))
+    assert cursor == 16
+
+    second, cursor = shots.page(records, cursor, 10)
+    assert [r["seq"] for r in second] == list(range(6, 16))
+
+    last, cursor = shots.page(records, cursor, 10)
+    assert [r["seq"] for r in last] == list(range(1, 6))
+    assert cursor is None
+
+
+def test_projection_and_columnar_encoding():
+    records = _records(3)
+    projected = shots.project(records[0], ["carry_distance_yards", "missing"])
+    assert projected == {"seq": 1, "ts": records[0]["ts"], "carry_distance_yards": 151.0, "missing": None}
+
+    columns = shots.encode_columnar(records, ["seq", "carry_distance_yards"])
+    assert columns == {"seq": [1, 2, 3], "carry_distance_yards": [151.0, 152.0, 153.0]}
+
+
+def test_shot_queue_drops_oldest_and_projects():
+    queue = shots.ShotQueue(2, ["carry_distance_yards"])
+    for record in _records(4):
+        queue.put_nowait(record)
+
+    assert len(queue) == 2
+    assert queue.dropped == 2
+
+    async def _drain():
+        return [await queue.get(), await queue.get()]
+
+    drained = asyncio.run(_drain())
+    assert [r["seq"] for r in drained] == [3, 4]
+    assert set(drained[0]) == {"seq", "ts", "carry_distance_yards"}
+
+
+def test_shot_queue_wakes_waiting_consumer():
+    async def _scenario():
+        queue = shots.ShotQueue(5)
+        consumer = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        assert not consumer.done()
+        queue.put_nowait(_records(1)[0])
+        return await asyncio.wait_for(consumer, 1)
+
+    assert asyncio.run(_scenario())["seq"] == 1
+
+
+def test_shot_queue_iteration_ends_after_close():
+    async def _scenario():
+        queue = shots.ShotQueue(5)
+        received = []
+
+        async def _consume():
+            async for record in queue:
+                received.append(record["seq"])
+
+        consumer = asyncio.ensure_future(_consume())
+        for record in _records(3):
+            queue.put_nowait(record)
+        await asyncio.sleep(0)
+        queue.close()
+        await asyncio.wait_for(consumer, 1)
+        return received
+
+    assert asyncio.run(_scenario()) == [1, 2, 3]
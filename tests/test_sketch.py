@@ -0,0 +1,80 @@
+"""Tests for the mergeable quantile sketches."""
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SKETCH_PATH = ROOT / "custom_components" / "golf_dashboard" / "sketch.py"
+
+spec = importlib.util.spec_from_file_location("golf_dashboard_sketch", SKETCH_PATH)
+sketch = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+sys.modules[spec.name] = sketch
+spec.loader.exec_module(sketch)  # type: ignore[attr-defined]
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_accurate_with_bounded_memory():
+    rng = random.Random(7)
+    values = [rng.gauss(150.0, 12.0) for _ in range(20000)]
+    digest = sketch.QuantileSketch()
+    for value in values:
+        digest.add(value)
+
+    assert len(digest) <= digest.compression
+    for q in (0.1, 0.5, 0.9):
+        assert digest.quantile(q) == pytest.approx(_exact(values, q), abs=0.5)
+    assert digest.quantiles()["count"] == 20000
+
+
+def test_merged_sketches_match_a_single_sketch():
+    rng = random.Random(3)
+    values = [rng.uniform(0.0, 100.0) for _ in range(5000)]
+    left, right = sketch.QuantileSketch(), sketch.QuantileSketch()
+    for value in values[:1200]:
+        left.add(value)
+    for value in values[1200:]:
+        right.add(value)
+    left.merge(right)
+
+    restored = sketch.QuantileSketch.from_dict(left.as_dict())
+    assert restored.count == 5000
+    for q in (0.1, 0.5, 0.9):
+        assert restored.quantile(q) == pytest.approx(_exact(values, q), abs=1.0)
+
+
+def test_small_sketch_and_labels():
+    digest = sketch.QuantileSketch()
+    assert digest.quantile(0.5) is None
+    for value in (1.0, 2.0, 3.0):
+        digest.add(value)
+    assert digest.quantiles() == {"count": 3, "p10": 1.0, "p50": 2.0, "p90": 3.0}
+    assert sketch.quantile_label(0.25) == "p25"
+
+
+def test_club_distributions_segment_and_merge():
+    first = sketch.ClubDistributions(["carry_distance_yards"])
+    second = sketch.ClubDistributions(["carry_distance_yards"])
+    for carry in (100.0, 105.0, 110.0):
+        first.add({"club_class": "wedge", "carry_distance_yards": carry})
+    for carry in (230.0, 240.0):
+        second.add({"club_class": "driver", "carry_distance_yards": carry})
+    second.add({"club_class": "wedge", "carry_distance_yards": 115.0})
+
+    combined = sketch.ClubDistributions.merged([first, second])
+    assert combined.summary("wedge")["carry_distance_yards"]["count"] == 4
+    assert combined.summary(sketch.ALL_CLUBS)["carry_distance_yards"]["count"] == 6
+
+    drivers = sketch.ClubDistributions.merged([first, second], segments=["driver"])
+    assert list(drivers.segments) == ["driver"]
+    # Merging copies: the sources are untouched.
+    assert first.summary("wedge")["carry_distance_yards"]["count"] == 3